@@ -14,12 +14,18 @@ from app.signalr_client import all_sonarr_signalr_connected, all_radarr_signalr_
 from app.announcements import get_all_announcements
 from utilities.health import get_health_issues
 
-from ..utils import authenticate
+from ..utils import authenticate, conditional_get
 
 api_ns_badges = Namespace('Badges', description='Get badges count to update the UI (episodes and movies wanted '
                                                 'subtitles, providers with issues, health issues and announcements.')
 
 
+def _live_state():
+    # Badge inputs that change without a database write.
+    return (len(get_throttled_providers()), all_sonarr_signalr_connected(), all_radarr_signalr_connected(),
+            len(get_all_announcements()))
+
+
 @api_ns_badges.route('badges')
 class Badges(Resource):
     get_model = api_ns_badges.model('BadgesGet', {
@@ -33,8 +39,12 @@ class Badges(Resource):
     })
 
     @authenticate
+    @api_ns_badges.response(304, 'Not Modified')
     @api_ns_badges.response(401, 'Not Authenticated')
     @api_ns_badges.doc(parser=None)
+    @conditional_get('table_episodes', 'table_shows', 'table_movies', 'table_shows_tags', 'table_movies_tags',
+                     'table_shows_rootfolder', 'table_movies_rootfolder', 'table_languages_profiles', 'settings',
+                     state=_live_state)
     def get(self):
         """Get badges count to update the UI"""
         episodes_conditions = [(TableEpisodes.missing_subtitles.is_not(None)),
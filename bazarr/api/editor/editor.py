@@ -12,6 +12,7 @@ import threading
 import time
 from urllib.parse import quote
 
+import numpy as np
 from flask import Response, request, send_file
 from flask_restx import Namespace, Resource
 
@@ -23,18 +24,31 @@ from api.subtitles.content import resolve_subtitle_path  # noqa: F401
 from subtitles.tools.subsync_engines import is_sync_engine_language_key
 
 from ..utils import authenticate
+from . import hls_segments
 
 logger = logging.getLogger(__name__)
 
 api_ns_editor = Namespace('Editor', description='Video editor streaming and metadata')
 
 PEAKS_CACHE_DIR = os.path.join(args.config_dir, 'cache', 'peaks')
+PEAKS_CACHE_MAGIC = b'BZPEAKS1'
+
+# ffmpeg decodes the audio to mono PCM at this rate for waveform peaks, which
+# are cached at each of these zoom levels (peaks per second, finest first).
+PEAKS_SAMPLE_RATE = 800
+PEAKS_LEVEL_RATES = (100, 10, 1)
+PEAKS_DEFAULT_RESOLUTION = 10
+# 256 KiB of float32 samples per read from ffmpeg.
+PEAKS_READ_BYTES = 256 * 1024
 HLS_CACHE_DIR = os.path.join(args.config_dir, 'cache', 'hls')
 
 # Bump this whenever the HLS encoding strategy changes in a way that makes
 # existing cache directories unsafe to reuse.
 HLS_CACHE_VERSION = 'hls-v2'
 
+# Same, for the shared segment caches of transcoded sessions (hls_segments).
+HLS_SEGMENT_CACHE_VERSION = 'segments-v1'
+
 # Idle TTL after which an HLS cache directory becomes eligible for eviction.
 # Each request to the playlist or any segment refreshes the directory's atime,
 # so this only fires for sessions the user has actually walked away from.
@@ -45,8 +59,12 @@ HLS_IDLE_TTL_SECONDS = 30 * 60
 # is empty or short.
 HLS_FIRST_SEGMENT_WAIT_SECONDS = 8.0
 
+# Cap on how long a request for a transcoded segment waits for it to be
+# encoded, including any wait for a free encoder slot.
+HLS_SEGMENT_WAIT_SECONDS = 20.0
+
 # Whitelist of files we'll serve from an HLS cache directory.
-HLS_FILENAME_RE = re.compile(r'^(playlist\.m3u8|init\.mp4|segment_\d{1,6}\.m4s)$')
+HLS_FILENAME_RE = re.compile(r'^(playlist\.m3u8|init\.mp4|segment_\d{1,6}\.m4s|lead\.m4s)$')
 
 # Tracks ffmpeg encoder threads keyed by cache directory so we don't
 # double-spawn for concurrent first requests on the same session.
@@ -66,6 +84,12 @@ _hls_encoder_processes_guard = threading.Lock()
 # elsewhere doesn't lose the original session.
 HLS_ENCODER_IDLE_TIMEOUT_SECONDS = 60
 
+# ffprobe results per (video path, mtime), so segment requests of transcoded
+# sessions don't each pay for a probe.
+_hls_probe_cache: dict[tuple, dict] = {}
+_hls_probe_cache_guard = threading.Lock()
+HLS_PROBE_CACHE_SIZE = 256
+
 
 def _optional_int(value, field_name):
     if value in (None, ''):
@@ -286,6 +310,46 @@ def _hls_cache_dir(media_type, media_id, arr_instance_id, audio_track_idx, start
     return os.path.join(HLS_CACHE_DIR, key)
 
 
+def _hls_segment_cache_dir(video_path, audio_track_idx, mtime):
+    """Shared segment cache dir per (file, audio track, file mtime).
+
+    Unlike _hls_cache_dir this leaves out the session start time and the
+    media ids: grid segments don't depend on where a session starts, so
+    every session on the same file shares them, whoever opened it.
+    """
+    raw = f"{HLS_SEGMENT_CACHE_VERSION}:{video_path}:{audio_track_idx}:{int(mtime)}"
+    key = hashlib.md5(raw.encode()).hexdigest()[:16]
+    return os.path.join(HLS_CACHE_DIR, key)
+
+
+def _hls_probe(video_path, mtime):
+    """_probe_video, cached per (path, mtime). Failures are not cached."""
+    key = (video_path, int(mtime))
+    with _hls_probe_cache_guard:
+        probe_data = _hls_probe_cache.get(key)
+    if probe_data is not None:
+        return probe_data
+    probe_data = _probe_video(video_path)
+    if probe_data:
+        with _hls_probe_cache_guard:
+            if len(_hls_probe_cache) >= HLS_PROBE_CACHE_SIZE:
+                _hls_probe_cache.clear()
+            _hls_probe_cache[key] = probe_data
+    return probe_data
+
+
+def _hls_uses_stream_copy(probe_data, start_time_sec):
+    """Sessions from t=0 of H.264/HEVC sources remux the video stream into a
+    per-session cache (_spawn_hls_encoder). Everything else is transcoded
+    into the shared segment cache (hls_segments)."""
+    if start_time_sec > 0 or not probe_data:
+        return False
+    for stream in probe_data.get('streams', []):
+        if stream.get('codec_type') == 'video':
+            return stream.get('codec_name', '').lower() in ('h264', 'avc', 'hevc', 'h265')
+    return False
+
+
 def _hls_encoder_lock(cache_dir):
     """Per-cache-dir lock so concurrent first requests don't race on ffmpeg spawn."""
     with _hls_encoder_locks_guard:
@@ -360,10 +424,11 @@ def _evict_stale_hls_dirs():
         if not os.path.isdir(path):
             continue
         # Skip dirs with an active encoding marker; ffmpeg might still be writing.
-        if os.path.isfile(os.path.join(path, '.encoding')):
+        if os.path.isfile(os.path.join(path, '.encoding')) or hls_segments.is_encoding(path):
             continue
         if stat.st_atime < cutoff:
             shutil.rmtree(path, ignore_errors=True)
+            hls_segments.forget(path)
             with _hls_encoder_locks_guard:
                 _hls_encoder_locks.pop(path, None)
             with _hls_encoder_processes_guard:
@@ -575,6 +640,108 @@ def _wait_for_first_segment(cache_dir, deadline):
     return False
 
 
+def _rewrite_manifest_apikey(manifest, apikey):
+    """Append ?apikey= to every segment line and #EXT-X-MAP URI of manifest.
+
+    Native HLS clients (Safari / iOS) can't inject custom request headers on
+    segment requests, so the apikey has to ride in the URL. The manifest's
+    segment lines and #EXT-X-MAP URI are relative paths that resolve without
+    the playlist URL's query string, so we rewrite them server-side to carry
+    the apikey when the request authenticated via query. Header-auth paths
+    (hls.js with xhrSetup) don't include apikey on the request and skip this,
+    keeping the manifest clean.
+    """
+    encoded = quote(apikey, safe='')
+    rewritten = []
+    for line in manifest.splitlines(keepends=True):
+        stripped = line.rstrip('\n').rstrip('\r')
+        if stripped.startswith('#EXT-X-MAP:'):
+            rewritten.append(
+                re.sub(
+                    r'URI="([^"?]+)"',
+                    f'URI="\\1?apikey={encoded}"',
+                    line,
+                )
+            )
+        elif stripped and not stripped.startswith('#'):
+            sep = '\n' if line.endswith('\n') else ''
+            rewritten.append(f'{stripped}?apikey={encoded}{sep}')
+        else:
+            rewritten.append(line)
+    return ''.join(rewritten)
+
+
+def _serve_hls_segments(video_path, audio_track_idx, start_time_sec, mtime, probe_data, filename):
+    """Serve a transcoded session from the file's shared segment cache.
+
+    The playlist is generated from the source duration, so it is complete
+    from the first request; segments are encoded when a player first asks
+    for them (or ahead of it) and block the request until they land.
+    """
+    if not probe_data:
+        return 'Could not probe video', 500
+    try:
+        duration = float(probe_data.get('format', {}).get('duration') or 0)
+    except (TypeError, ValueError):
+        duration = 0
+    if duration <= 0:
+        return 'Could not determine video duration', 500
+    if start_time_sec >= duration:
+        return 'startTime is beyond the end of the video', 400
+
+    cache_dir = _hls_segment_cache_dir(video_path, audio_track_idx, mtime)
+    real_cache_root = os.path.realpath(HLS_CACHE_DIR) + os.sep
+    if not os.path.realpath(cache_dir).startswith(real_cache_root):
+        return 'Invalid HLS path', 400
+
+    ffmpeg = _get_ffmpeg()
+    if not ffmpeg:
+        return 'ffmpeg not available', 500
+    audio_streams = [s for s in probe_data.get('streams', []) if s.get('codec_type') == 'audio']
+    cache = hls_segments.get_segment_cache(
+        cache_dir, video_path, audio_track_idx, duration, audio_track_idx < len(audio_streams), ffmpeg,
+    )
+
+    if filename == 'playlist.m3u8':
+        lead_end, first_index = cache.session_layout(start_time_sec)
+        # Get the session's first segments going before the player asks.
+        if lead_end is not None:
+            threading.Thread(
+                target=cache.request_lead,
+                args=(start_time_sec, time.time() + HLS_SEGMENT_WAIT_SECONDS),
+                daemon=True,
+            ).start()
+        cache.prefetch(first_index)
+
+        manifest = cache.playlist(start_time_sec)
+        apikey_query = request.args.get('apikey')
+        if apikey_query:
+            manifest = _rewrite_manifest_apikey(manifest, apikey_query)
+        response = Response(manifest, mimetype='application/vnd.apple.mpegurl')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    deadline = time.time() + HLS_SEGMENT_WAIT_SECONDS
+    if filename == 'init.mp4':
+        target = cache.request_init(start_time_sec, deadline)
+    elif filename == 'lead.m4s':
+        target = cache.request_lead(start_time_sec, deadline)
+    else:
+        target = cache.request_segment(int(filename[len('segment_'):-len('.m4s')]), deadline)
+    if target is None:
+        # 503 rather than 404 so hls.js retries the fragment.
+        return 'Segment not yet available', 503
+
+    mimetype = 'video/mp4' if filename.endswith('.mp4') else 'video/iso.segment'
+    response = _serve_file_with_ranges(target, mimetype)
+    # Touch the cache dir so eviction TTL tracks last access.
+    try:
+        os.utime(cache_dir, None)
+    except OSError:
+        pass
+    return response
+
+
 @api_ns_editor.route(
     'editor/hls/<string:media_type>/<int:media_id>/<int:audio_track>/<string:start_time>/<string:filename>'
 )
@@ -593,9 +760,13 @@ class EditorHls(Resource):
         precision (e.g., switching tracks at 30.567s passes through unrounded
         instead of snapping the user-facing clock to a whole second).
 
-        First request to playlist.m3u8 spawns ffmpeg; segments are served as
-        ffmpeg writes them. hls.js handles segment fetching, buffer management,
-        and seek-back within the cached portion.
+        Sessions from t=0 of H.264/HEVC sources remux into a per-session
+        cache: the first request to playlist.m3u8 spawns ffmpeg and segments
+        are served as ffmpeg writes them. All other sessions are transcoded
+        into the file's shared segment cache (see hls_segments), where each
+        segment is encoded once, on first request or as prefetch, and reused
+        by every later session on the file. hls.js handles segment fetching,
+        buffer management, and seek-back within the cached portion.
         """
         if media_type not in ('episode', 'movie'):
             return 'mediaType must be "episode" or "movie"', 400
@@ -626,6 +797,23 @@ class EditorHls(Resource):
         except OSError:
             return 'Video file not accessible', 404
 
+        if filename == 'playlist.m3u8':
+            # Lazy-sweep on every playlist request: kill any ffmpeg encoders
+            # whose sessions have gone idle (user switched tracks / sessions),
+            # then evict directories that have been cold long enough.
+            try:
+                _kill_idle_hls_encoders()
+            except Exception:
+                logger.exception('HLS encoder sweep error')
+            try:
+                _evict_stale_hls_dirs()
+            except OSError:
+                logger.exception('HLS cache eviction error')
+
+        probe_data = _hls_probe(video_path, mtime)
+        if not _hls_uses_stream_copy(probe_data, start_time_sec):
+            return _serve_hls_segments(video_path, audio_track, start_time_sec, mtime, probe_data, filename)
+
         cache_dir = _hls_cache_dir(media_type, media_id, arr_instance_id, audio_track, start_time_sec, mtime)
 
         # Defense-in-depth: the filename regex above already blocks path
@@ -642,18 +830,6 @@ class EditorHls(Resource):
             return 'Invalid HLS path', 400
 
         if filename == 'playlist.m3u8':
-            # Lazy-sweep on every playlist request: kill any ffmpeg encoders
-            # whose sessions have gone idle (user switched tracks / sessions),
-            # then evict directories that have been cold long enough.
-            try:
-                _kill_idle_hls_encoders()
-            except Exception:
-                logger.exception('HLS encoder sweep error')
-            try:
-                _evict_stale_hls_dirs()
-            except OSError:
-                logger.exception('HLS cache eviction error')
-
             try:
                 _spawn_hls_encoder(video_path, audio_track, start_time_sec, cache_dir)
             except Exception:
@@ -669,14 +845,6 @@ class EditorHls(Resource):
             if not os.path.isfile(target):
                 return 'Encoding starting, retry shortly', 503
 
-            # Native HLS clients (Safari / iOS) can't inject custom request
-            # headers on segment requests, so the apikey has to ride in the
-            # URL. The manifest's segment lines and #EXT-X-MAP URI are
-            # relative paths that resolve without the playlist URL's query
-            # string, so we rewrite them server-side to carry the apikey when
-            # the request authenticated via query. Header-auth paths (hls.js
-            # with xhrSetup) don't include apikey on the request and skip
-            # this branch, keeping the manifest clean.
             apikey_query = request.args.get('apikey')
             if apikey_query:
                 try:
@@ -684,25 +852,8 @@ class EditorHls(Resource):
                         manifest = f.read()
                 except OSError:
                     return 'Encoding starting, retry shortly', 503
-                encoded = quote(apikey_query, safe='')
-                rewritten = []
-                for line in manifest.splitlines(keepends=True):
-                    stripped = line.rstrip('\n').rstrip('\r')
-                    if stripped.startswith('#EXT-X-MAP:'):
-                        rewritten.append(
-                            re.sub(
-                                r'URI="([^"?]+)"',
-                                f'URI="\\1?apikey={encoded}"',
-                                line,
-                            )
-                        )
-                    elif stripped and not stripped.startswith('#'):
-                        sep = '\n' if line.endswith('\n') else ''
-                        rewritten.append(f'{stripped}?apikey={encoded}{sep}')
-                    else:
-                        rewritten.append(line)
                 response = Response(
-                    ''.join(rewritten),
+                    _rewrite_manifest_apikey(manifest, apikey_query),
                     mimetype='application/vnd.apple.mpegurl',
                 )
             else:
@@ -731,11 +882,135 @@ class EditorHls(Resource):
         return response
 
 
+def _extract_peak_levels(stdout):
+    """Min/max peak levels from a mono f32le PCM stream at PEAKS_SAMPLE_RATE.
+
+    Reads PEAKS_READ_BYTES at a time and reduces each read with NumPy into
+    PEAKS_LEVEL_RATES[0] min/max pairs per second; the coarser levels are
+    reduced from that one. Returns {rate: float32 array of shape (n, 2)}.
+    """
+    samples_per_peak = PEAKS_SAMPLE_RATE // PEAKS_LEVEL_RATES[0]
+    chunks = []
+    carry = np.empty(0, dtype='<f4')
+    while True:
+        data = stdout.read(PEAKS_READ_BYTES)
+        if not data:
+            break
+        samples = np.frombuffer(data[:len(data) - len(data) % 4], dtype='<f4')
+        if carry.size:
+            samples = np.concatenate((carry, samples))
+        usable = samples.size - samples.size % samples_per_peak
+        carry = samples[usable:].copy()
+        if usable:
+            frames = samples[:usable].reshape(-1, samples_per_peak)
+            chunks.append(np.stack((frames.min(axis=1), frames.max(axis=1)), axis=1))
+    if carry.size:
+        chunks.append(np.array([[carry.min(), carry.max()]], dtype='<f4'))
+    if not chunks:
+        return {}
+
+    base = np.concatenate(chunks)
+    levels = {PEAKS_LEVEL_RATES[0]: base}
+    for rate in PEAKS_LEVEL_RATES[1:]:
+        levels[rate] = _reduce_peaks(base, int(np.ceil(base.shape[0] * rate / PEAKS_LEVEL_RATES[0])))
+    return levels
+
+
+def _reduce_peaks(pairs, count):
+    """Merge consecutive min/max pairs into `count` pairs (min of mins, max of
+    maxes), splitting `pairs` as evenly as possible."""
+    if count >= pairs.shape[0]:
+        return pairs
+    bounds = np.linspace(0, pairs.shape[0], count + 1).astype(np.int64)[:-1]
+    return np.stack((np.minimum.reduceat(pairs[:, 0], bounds), np.maximum.reduceat(pairs[:, 1], bounds)), axis=1)
+
+
+def _write_peaks_cache(cache_file, levels, duration):
+    """Store the levels as int16 min/max pairs normalized to the loudest
+    sample, behind a small JSON header giving each level's rate, count and
+    byte offset. Written to a temp file and renamed into place."""
+    loudest = max(float(np.abs(pairs).max()) for pairs in levels.values())
+    scale = 32767.0 / loudest if loudest > 0 else 0.0
+    header = {'duration': duration, 'levels': []}
+    blobs = []
+    offset = 0
+    for rate in sorted(levels, reverse=True):
+        blob = np.round(levels[rate] * scale).astype('<i2').tobytes()
+        header['levels'].append({'rate': rate, 'count': int(levels[rate].shape[0]), 'offset': offset})
+        blobs.append(blob)
+        offset += len(blob)
+    header_bytes = json.dumps(header).encode()
+
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f'{cache_file}.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(PEAKS_CACHE_MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_file, cache_file)
+
+
+def _read_peaks_cache(cache_file):
+    """(header, {rate: memmapped int16 (n, 2) array}) of a peaks cache file,
+    or None if it's missing or not in the current format. Only the pages a
+    request actually slices are read from disk."""
+    try:
+        with open(cache_file, 'rb') as f:
+            if f.read(len(PEAKS_CACHE_MAGIC)) != PEAKS_CACHE_MAGIC:
+                return None
+            header_len = struct.unpack('<I', f.read(4))[0]
+            header = json.loads(f.read(header_len))
+        data_offset = len(PEAKS_CACHE_MAGIC) + 4 + header_len
+        levels = {}
+        for level in header['levels']:
+            if level['count']:
+                levels[level['rate']] = np.memmap(cache_file, dtype='<i2', mode='r',
+                                                  offset=data_offset + level['offset'],
+                                                  shape=(level['count'], 2))
+        return header, levels
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+def _select_peaks(levels, duration, resolution, start=None, end=None):
+    """Signed peaks (the larger-magnitude of each min/max pair, in [-1, 1])
+    for [start, end) seconds at `resolution` peaks per second, served from
+    the coarsest stored level at least that fine."""
+    rate = next((r for r in sorted(levels) if r >= resolution), max(levels))
+    pairs = levels[rate]
+    start = 0.0 if start is None else min(max(0.0, start), duration)
+    end = duration if end is None else min(max(start, end), duration)
+    first = min(int(start * rate), pairs.shape[0])
+    last = min(max(first + 1, int(np.ceil(end * rate))), pairs.shape[0])
+    window = np.asarray(pairs[first:last], dtype=np.float32)
+    if window.shape[0]:
+        window = _reduce_peaks(window, max(1, int(np.ceil((end - start) * resolution))))
+    signed = np.where(np.abs(window[:, 1]) >= np.abs(window[:, 0]), window[:, 1], window[:, 0])
+    return np.round(signed / 32767.0, 4).tolist(), min(resolution, rate), start, end
+
+
+def _float_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 @api_ns_editor.route('editor/peaks')
 class EditorPeaks(Resource):
     @authenticate
     def get(self):
-        """Return pre-generated waveform peaks as JSON for wavesurfer.js."""
+        """Return waveform peaks as JSON for wavesurfer.js.
+
+        Without parameters this is the whole file at 10 peaks per second.
+        `start`/`end` (seconds) limit it to a time range and `resolution`
+        (peaks per second, up to 100) picks the zoom level.
+        """
         resolved = _resolve_or_abort()
         if len(resolved) == 2:
             return resolved
@@ -748,23 +1023,46 @@ class EditorPeaks(Resource):
         except (ValueError, TypeError):
             audio_track_idx = 0
 
+        resolution = _float_arg('resolution') or PEAKS_DEFAULT_RESOLUTION
+        resolution = min(max(resolution, 0.01), PEAKS_LEVEL_RATES[0])
+        start = _float_arg('start')
+        end = _float_arg('end')
+
         # Build a cache key from the file path and modification time
         stat = os.stat(video_path)
         # Use a stable filename derived from the video path
-        import hashlib
         path_hash = hashlib.md5(video_path.encode()).hexdigest()
         track_suffix = f'_t{audio_track_idx}' if audio_track_idx > 0 else ''
-        cache_file = os.path.join(PEAKS_CACHE_DIR, f'{path_hash}_{int(stat.st_mtime)}{track_suffix}.json')
+        cache_file = os.path.join(PEAKS_CACHE_DIR, f'{path_hash}_{int(stat.st_mtime)}{track_suffix}.peaks')
 
         # Check cache
-        if os.path.isfile(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError):
-                # Corrupted cache, regenerate
-                pass
+        cached = _read_peaks_cache(cache_file) if os.path.isfile(cache_file) else None
+        if cached is None:
+            generated = self._generate(video_path, audio_track_idx, cache_file)
+            if isinstance(generated, tuple):
+                return generated
+            cached = generated
+
+        header, levels = cached
+        duration = float(header['duration'])
+        if not levels:
+            return 'No audio data found in file', 500
+
+        peaks, sample_rate, start_sec, end_sec = _select_peaks(levels, duration, resolution, start, end)
+        response_data = {
+            'peaks': peaks,
+            'duration': round(duration, 2),
+            'sampleRate': sample_rate,
+        }
+        if start is not None or end is not None:
+            response_data['start'] = round(start_sec, 3)
+            response_data['end'] = round(end_sec, 3)
+        return response_data
 
+    @staticmethod
+    def _generate(video_path, audio_track_idx, cache_file):
+        """Decode the track, build every zoom level and cache them. Returns
+        (header, levels) or a Flask error tuple."""
         # Get duration first
         probe_data = _probe_video(video_path)
         if not probe_data:
@@ -781,78 +1079,57 @@ class EditorPeaks(Resource):
         if duration is None:
             return 'Could not determine video duration', 500
 
-        # Generate peaks by having ffmpeg output low-rate PCM and processing in chunks.
-        # Use 800Hz sample rate (much less data than 8000Hz) and produce ~10 peaks/sec.
+        # Generate peaks by having ffmpeg output low-rate PCM (800Hz is plenty
+        # for a waveform) and reducing it with NumPy as it streams in.
         try:
             ffmpeg = _get_ffmpeg()
         except Exception:
             logger.exception('ffmpeg binary not available')
             return 'ffmpeg not found', 500
 
-        sample_rate = 800
-        target_rate = 10
-        samples_per_peak = max(1, sample_rate // target_rate)  # 80 samples per peak
-        chunk_bytes = samples_per_peak * 4  # 320 bytes per peak
-
         cmd = [
             ffmpeg,
             '-i', video_path,
             '-map', f'0:a:{audio_track_idx}',
             '-ac', '1',
-            '-ar', str(sample_rate),
+            '-ar', str(PEAKS_SAMPLE_RATE),
             '-f', 'f32le',
             '-v', 'error',
             'pipe:1',
         ]
 
-        peaks = []
+        levels = {}
         try:
             process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            while True:
-                data = process.stdout.read(chunk_bytes)
-                if not data:
-                    break
-                n = len(data) // 4
-                if n == 0:
-                    break
-                chunk = struct.unpack(f'<{n}f', data[:n * 4])
-                max_val = max(chunk, key=abs)
-                peaks.append(round(max_val, 4))
+            levels = _extract_peak_levels(process.stdout)
             process.wait(timeout=10)
             if process.returncode != 0:
                 stderr_out = process.stderr.read().decode(errors='replace')[:500]
                 logger.error('ffmpeg peaks generation failed: %s', stderr_out)
-                if not peaks:
+                if not levels:
                     return 'Failed to generate audio peaks', 500
         except subprocess.TimeoutExpired:
             if process.poll() is None:
                 process.kill()
-            if not peaks:
+            if not levels:
                 return 'Peak generation timed out', 500
 
-        if not peaks:
+        if not levels:
             return 'No audio data found in file', 500
 
-        # Normalize to [-1, 1]
-        max_abs = max(abs(p) for p in peaks)
-        if max_abs > 0:
-            peaks = [round(p / max_abs, 4) for p in peaks]
-
-        response_data = {
-            'peaks': peaks,
-            'duration': round(duration, 2),
-            'sampleRate': target_rate,
-        }
-
         # Cache the result
         try:
-            os.makedirs(PEAKS_CACHE_DIR, exist_ok=True)
-            with open(cache_file, 'w') as f:
-                json.dump(response_data, f)
+            _write_peaks_cache(cache_file, levels, duration)
         except OSError:
             logger.warning('Failed to cache peaks for %s', video_path)
+        else:
+            cached = _read_peaks_cache(cache_file)
+            if cached is not None:
+                return cached
 
-        return response_data
+        loudest = max(float(np.abs(pairs).max()) for pairs in levels.values())
+        scale = 32767.0 / loudest if loudest > 0 else 0.0
+        return {'duration': duration}, {rate: pairs * scale for rate, pairs in levels.items()}
 
 
 @api_ns_editor.route('editor/info')
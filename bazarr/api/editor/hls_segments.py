@@ -0,0 +1,471 @@
+# coding=utf-8
+
+import itertools
+import logging
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Transcoded editor playback is cut on a fixed grid: segment N always covers
+# [N * HLS_SEGMENT_SECONDS, (N + 1) * HLS_SEGMENT_SECONDS) of the source and
+# carries absolute timestamps. That makes a segment the same bytes no matter
+# which session, user or ffmpeg run produced it, so all sessions on a file
+# share one cache directory and only the gaps between cached segments are
+# ever encoded.
+HLS_SEGMENT_SECONDS = 4
+
+# Sessions starting off the grid get a lead-in segment from their start to
+# the next grid boundary at least this far ahead, so the lead-in is never
+# just a handful of frames.
+HLS_MIN_LEAD_SECONDS = 1.0
+
+# Encoders run this many segments ahead of the last one a player asked for,
+# then stop. The next request past that point starts a new run at the gap.
+HLS_PREFETCH_SEGMENTS = 5
+
+# Default cap on transcoding ffmpeg processes across all users
+# (general.editor_max_hls_encoders).
+HLS_DEFAULT_MAX_ENCODERS = 2
+
+HLS_POLL_SECONDS = 0.1
+
+_caches: dict[str, 'SegmentCache'] = {}
+_caches_guard = threading.Lock()
+
+# Running SegmentEncoders across every cache, guarded by _slots.
+_running: set = set()
+_slots = threading.Condition()
+_run_ids = itertools.count(1)
+
+
+def max_encoders():
+    try:
+        value = int(settings.general.editor_max_hls_encoders)
+    except (AttributeError, TypeError, ValueError):
+        value = HLS_DEFAULT_MAX_ENCODERS
+    return max(1, value)
+
+
+def _acquire_slot(owner, deadline, preempt):
+    """Register `owner` as a running encoder once fewer than max_encoders()
+    are running. With `preempt`, an encoder that is only prefetching (no
+    player is waiting on anything it has left to write) is stopped to make
+    room. Returns False if no slot freed up before `deadline`."""
+    with _slots:
+        while len(_running) >= max_encoders():
+            if preempt:
+                for encoder in list(_running):
+                    if isinstance(encoder, SegmentEncoder) and encoder.is_prefetching():
+                        encoder.stop()
+                        break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            _slots.wait(min(remaining, HLS_POLL_SECONDS))
+        _running.add(owner)
+        return True
+
+
+def _release_slot(owner):
+    with _slots:
+        _running.discard(owner)
+        _slots.notify_all()
+
+
+def build_segment_command(ffmpeg, video_path, audio_track_idx, has_audio, start_sec, duration_sec, out_dir,
+                          segment_pattern, start_number, hls_time):
+    """ffmpeg command writing grid-aligned fMP4 segments of the source from
+    `start_sec` (for `duration_sec`, or to the end when None) into out_dir,
+    numbered from `start_number`, plus init.mp4 and a throwaway playlist."""
+    if has_audio:
+        audio_args = ['-map', f'0:a:{audio_track_idx}', '-c:a', 'aac', '-ac', '2', '-b:a', '128k']
+    else:
+        audio_args = ['-an']
+    limit = ['-t', f'{duration_sec:.3f}'] if duration_sec else []
+    return [
+        ffmpeg,
+        '-ss', f'{start_sec:.3f}',
+        '-i', video_path,
+        '-map', '0:v:0',
+        *audio_args,
+        '-c:v', 'libx264',
+        '-preset', 'ultrafast',
+        '-crf', '28',
+        # Keyframes land on the grid and nowhere else (barring very long
+        # GOPs), so the muxer cuts every run at the same source times.
+        '-force_key_frames', f'expr:gte(t,n_forced*{HLS_SEGMENT_SECONDS})',
+        '-g', '1000',
+        '-sc_threshold', '0',
+        *limit,
+        # Absolute timestamps let segments from different runs sit in one
+        # timeline; without an edit list every run's init.mp4 is identical.
+        '-output_ts_offset', f'{start_sec:.3f}',
+        '-f', 'hls',
+        '-hls_time', str(hls_time),
+        '-hls_list_size', '0',
+        '-hls_segment_type', 'fmp4',
+        '-hls_segment_options', 'use_editlist=0',
+        '-hls_flags', 'temp_file',
+        '-start_number', str(start_number),
+        '-hls_fmp4_init_filename', 'init.mp4',
+        '-hls_segment_filename', os.path.join(out_dir, segment_pattern),
+        '-v', 'error',
+        '-y',
+        os.path.join(out_dir, 'run.m3u8'),
+    ]
+
+
+class SegmentEncoder:
+    """One ffmpeg run filling segments [first_index, end_index) of a cache.
+
+    ffmpeg writes into a work directory of its own; a monitor thread moves
+    each finished segment into the cache and stops the run once it is
+    HLS_PREFETCH_SEGMENTS past the last segment requested from its range, or
+    once it reaches end_index (which is lowered when a later run starts
+    inside its range).
+    """
+
+    def __init__(self, cache, first_index, end_index, demand):
+        self.cache = cache
+        self.first_index = first_index
+        self.end_index = end_index
+        self.next_index = first_index
+        self.demand = demand
+        self.run_id = next(_run_ids)
+        self.process = None
+        self._stopped = False
+
+    def covers(self, index):
+        return self.first_index <= index < self.end_index and index <= self.next_index + HLS_PREFETCH_SEGMENTS
+
+    def is_prefetching(self):
+        return not self._stopped and self.next_index > self.demand
+
+    def stop(self):
+        self._stopped = True
+
+    def command(self, ffmpeg):
+        cache = self.cache
+        start_sec = self.first_index * HLS_SEGMENT_SECONDS
+        duration = None
+        if self.end_index < cache.segment_count:
+            duration = (self.end_index - self.first_index) * HLS_SEGMENT_SECONDS
+        return build_segment_command(
+            ffmpeg, cache.video_path, cache.audio_track_idx, cache.has_audio, start_sec, duration, self.work_dir,
+            'segment_%d.m4s', self.first_index,
+            # Cut at the grid keyframe; stray x264 keyframes before it don't count.
+            HLS_SEGMENT_SECONDS - 0.5,
+        )
+
+    @property
+    def work_dir(self):
+        return os.path.join(self.cache.cache_dir, f'run_{self.run_id}')
+
+    def run(self, ffmpeg):
+        cache = self.cache
+        try:
+            os.makedirs(self.work_dir, exist_ok=True)
+            with tempfile.TemporaryFile() as stderr:
+                self.process = subprocess.Popen(self.command(ffmpeg), stdout=subprocess.DEVNULL, stderr=stderr)
+                while True:
+                    self._collect()
+                    if self.process.poll() is not None:
+                        break
+                    if self._stopped or self.next_index >= self.end_index or \
+                            self.next_index > self.demand + HLS_PREFETCH_SEGMENTS:
+                        self.process.terminate()
+                        self.process.wait()
+                        break
+                    time.sleep(HLS_POLL_SECONDS)
+                self._collect()
+                if self.process.returncode not in (0, -15) and not self._stopped:
+                    stderr.seek(0)
+                    logger.error('HLS segment encode failed for %s (rc=%d): %s', cache.video_path,
+                                 self.process.returncode, stderr.read().decode(errors='replace')[:500])
+        except Exception:
+            logger.exception('HLS segment encoding error for %s', cache.video_path)
+        finally:
+            self._cleanup()
+            cache.encoder_finished(self)
+            _release_slot(self)
+
+    def _collect(self):
+        cache = self.cache
+        advanced = False
+        while self.next_index < self.end_index:
+            # temp_file: ffmpeg renames a segment into place once it is complete.
+            finished = os.path.join(self.work_dir, f'segment_{self.next_index}.m4s')
+            if not os.path.isfile(finished):
+                break
+            cache.promote_init(os.path.join(self.work_dir, 'init.mp4'))
+            os.replace(finished, cache.segment_path(self.next_index))
+            self.next_index += 1
+            advanced = True
+        if advanced:
+            cache.notify()
+
+    def _cleanup(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class SegmentCache:
+    """Segment-addressed HLS cache for one (file, audio track) pair.
+
+    Holds segment_<N>.m4s for every grid segment encoded so far, the shared
+    init.mp4, and lead_<ms>.m4s lead-ins for sessions that start between
+    grid boundaries. Playlists are generated per session from the source
+    duration rather than written by ffmpeg.
+    """
+
+    def __init__(self, cache_dir, video_path, audio_track_idx, duration, has_audio, ffmpeg):
+        self.cache_dir = cache_dir
+        self.video_path = video_path
+        self.audio_track_idx = audio_track_idx
+        self.duration = duration
+        self.has_audio = has_audio
+        self.ffmpeg = ffmpeg
+        self.segment_count = max(1, math.ceil(duration / HLS_SEGMENT_SECONDS))
+        self._cond = threading.Condition()
+        self._encoders = []
+        self._lead_locks = {}
+
+    # -- layout ---------------------------------------------------------------
+
+    def segment_path(self, index):
+        return os.path.join(self.cache_dir, f'segment_{index}.m4s')
+
+    @property
+    def init_path(self):
+        return os.path.join(self.cache_dir, 'init.mp4')
+
+    def lead_path(self, start_sec):
+        return os.path.join(self.cache_dir, f'lead_{round(start_sec * 1000)}.m4s')
+
+    def session_layout(self, start_sec):
+        """(lead_end, first_index) for a session starting at start_sec.
+        lead_end is None when the session starts on a grid boundary."""
+        nearest = round(start_sec / HLS_SEGMENT_SECONDS)
+        if abs(nearest * HLS_SEGMENT_SECONDS - start_sec) < 0.001:
+            return None, nearest
+        first_index = math.ceil((start_sec + HLS_MIN_LEAD_SECONDS) / HLS_SEGMENT_SECONDS)
+        return min(first_index * HLS_SEGMENT_SECONDS, self.duration), first_index
+
+    def playlist(self, start_sec):
+        """VOD playlist for a session whose media time 0 is `start_sec` of the
+        source, or None when start_sec is at or past the end."""
+        if start_sec >= self.duration:
+            return None
+        lead_end, first_index = self.session_layout(start_sec)
+        entries = []
+        if lead_end is not None:
+            entries.append((lead_end - start_sec, 'lead.m4s'))
+        for index in range(first_index, self.segment_count):
+            length = min(HLS_SEGMENT_SECONDS, self.duration - index * HLS_SEGMENT_SECONDS)
+            entries.append((length, f'segment_{index}.m4s'))
+        lines = [
+            '#EXTM3U',
+            '#EXT-X-VERSION:7',
+            f'#EXT-X-TARGETDURATION:{max(math.ceil(length) for length, _ in entries)}',
+            '#EXT-X-PLAYLIST-TYPE:VOD',
+            '#EXT-X-MEDIA-SEQUENCE:0',
+            '#EXT-X-INDEPENDENT-SEGMENTS',
+            '#EXT-X-MAP:URI="init.mp4"',
+        ]
+        for length, name in entries:
+            lines.append(f'#EXTINF:{length:.6f},')
+            lines.append(name)
+        lines.append('#EXT-X-ENDLIST')
+        return '\n'.join(lines) + '\n'
+
+    def promote_init(self, run_init):
+        # Every run writes an identical init segment; the first one to finish
+        # a segment publishes it.
+        if os.path.isfile(self.init_path):
+            return
+        try:
+            os.replace(run_init, self.init_path)
+        except OSError:
+            pass
+
+    def notify(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def is_encoding(self):
+        with self._cond:
+            return bool(self._encoders)
+
+    # -- encoders -------------------------------------------------------------
+
+    def _next_cached_index(self, index):
+        for candidate in range(index, self.segment_count):
+            if os.path.isfile(self.segment_path(candidate)):
+                return candidate
+        return self.segment_count
+
+    def _covered(self, index):
+        return any(encoder.covers(index) for encoder in self._encoders)
+
+    def _note_demand(self, index):
+        with self._cond:
+            for encoder in self._encoders:
+                if encoder.covers(index):
+                    encoder.demand = max(encoder.demand, index)
+
+    def _start_encoder(self, index, deadline, preempt):
+        """Start a run at `index` unless one already covers it. Waits for an
+        encoder slot until `deadline`; returns False if none was free."""
+        with self._cond:
+            if self._covered(index):
+                return True
+        encoder = SegmentEncoder(self, index, index + 1, index)
+        if not _acquire_slot(encoder, deadline, preempt):
+            return False
+        with self._cond:
+            if self._covered(index) or os.path.isfile(self.segment_path(index)):
+                _release_slot(encoder)
+                return True
+            encoder.end_index = self._next_cached_index(index + 1)
+            # An earlier run heading into this range stops where this one starts.
+            for other in self._encoders:
+                if other.first_index < index < other.end_index:
+                    other.end_index = index
+            self._encoders.append(encoder)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            threading.Thread(target=encoder.run, args=(self.ffmpeg,), daemon=True).start()
+        except Exception:
+            self.encoder_finished(encoder)
+            _release_slot(encoder)
+            raise
+        logger.debug('BAZARR HLS encoding segments %d-%d of %s', index, encoder.end_index - 1, self.video_path)
+        return True
+
+    def encoder_finished(self, encoder):
+        with self._cond:
+            if encoder in self._encoders:
+                self._encoders.remove(encoder)
+            self._cond.notify_all()
+
+    def prefetch(self, index):
+        """Keep segments from `index` on coming: if none of the next
+        HLS_PREFETCH_SEGMENTS is being encoded, start a run at the first
+        missing one, but only when an encoder slot is free right now."""
+        for ahead in range(index, min(index + HLS_PREFETCH_SEGMENTS, self.segment_count)):
+            if os.path.isfile(self.segment_path(ahead)):
+                continue
+            with self._cond:
+                if self._covered(ahead):
+                    return
+            self._start_encoder(ahead, 0, preempt=False)
+            return
+
+    # -- requests -------------------------------------------------------------
+
+    def request_segment(self, index, deadline):
+        """Path of grid segment `index`, encoding it if needed; None if it is
+        out of range or not ready by `deadline`."""
+        if not 0 <= index < self.segment_count:
+            return None
+        path = self.segment_path(index)
+        self._note_demand(index)
+        while not os.path.isfile(path):
+            with self._cond:
+                covered = self._covered(index)
+            if not covered and not self._start_encoder(index, deadline, preempt=True):
+                return None
+            self._note_demand(index)
+            with self._cond:
+                if time.time() >= deadline:
+                    return None
+                self._cond.wait(HLS_POLL_SECONDS)
+        self.prefetch(index + 1)
+        return path
+
+    def request_init(self, start_sec, deadline):
+        _, first_index = self.session_layout(start_sec)
+        while not os.path.isfile(self.init_path):
+            if not self.is_encoding() and first_index < self.segment_count:
+                self._start_encoder(first_index, deadline, preempt=True)
+            with self._cond:
+                if time.time() >= deadline:
+                    return None
+                self._cond.wait(HLS_POLL_SECONDS)
+        return self.init_path
+
+    def request_lead(self, start_sec, deadline):
+        """Path of the lead-in segment of a session starting at start_sec,
+        encoding it on first use."""
+        lead_end, _ = self.session_layout(start_sec)
+        if lead_end is None or start_sec >= self.duration:
+            return None
+        path = self.lead_path(start_sec)
+        with self._cond:
+            lock = self._lead_locks.setdefault(path, threading.Lock())
+        if not lock.acquire(timeout=max(0.0, deadline - time.time())):
+            return None
+        try:
+            if os.path.isfile(path):
+                return path
+            return self._encode_lead(start_sec, lead_end, path, deadline)
+        finally:
+            lock.release()
+
+    def _encode_lead(self, start_sec, lead_end, path, deadline):
+        owner = object()
+        if not _acquire_slot(owner, deadline, preempt=True):
+            return None
+        work_dir = os.path.join(self.cache_dir, f'run_{next(_run_ids)}')
+        try:
+            os.makedirs(work_dir, exist_ok=True)
+            cmd = build_segment_command(
+                self.ffmpeg, self.video_path, self.audio_track_idx, self.has_audio, start_sec,
+                lead_end - start_sec, work_dir, 'lead_%d.m4s', 0, HLS_SEGMENT_SECONDS * 4,
+            )
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    timeout=max(1.0, deadline - time.time()))
+            if result.returncode != 0:
+                logger.error('HLS lead-in encode failed for %s (rc=%d): %s', self.video_path, result.returncode,
+                             result.stderr.decode(errors='replace')[:500])
+            finished = os.path.join(work_dir, 'lead_0.m4s')
+            if not os.path.isfile(finished):
+                return None
+            self.promote_init(os.path.join(work_dir, 'init.mp4'))
+            os.replace(finished, path)
+            return path
+        except subprocess.TimeoutExpired:
+            logger.warning('HLS lead-in encode timed out for %s at %.3f', self.video_path, start_sec)
+            return None
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            _release_slot(owner)
+            self.notify()
+
+
+def get_segment_cache(cache_dir, video_path, audio_track_idx, duration, has_audio, ffmpeg):
+    """Process-wide SegmentCache for cache_dir, shared by every session."""
+    with _caches_guard:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = SegmentCache(cache_dir, video_path, audio_track_idx, duration, has_audio, ffmpeg)
+            _caches[cache_dir] = cache
+        return cache
+
+
+def is_encoding(cache_dir):
+    with _caches_guard:
+        cache = _caches.get(cache_dir)
+    return cache is not None and cache.is_encoding()
+
+
+def forget(cache_dir):
+    with _caches_guard:
+        _caches.pop(cache_dir, None)
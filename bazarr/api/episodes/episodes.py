@@ -5,7 +5,7 @@ from flask_restx import Resource, Namespace, reqparse, fields, marshal
 from app.database import TableEpisodes, database, select
 from api.swaggerui import subtitles_model, subtitles_language_model, audio_language_model
 
-from ..utils import authenticate, postprocess
+from ..utils import authenticate, conditional_get, keyset_next, keyset_page, postprocess
 
 api_ns_episodes = Namespace('Episodes', description='List episodes metadata for specific series or episodes.')
 
@@ -21,6 +21,11 @@ class Episodes(Resource):
                                     help='Canonical local series IDs (#156; preferred)')
     get_request_parser.add_argument('id[]', type=int, action='append', required=False, default=[],
                                     help='Canonical local episode IDs (#156; preferred)')
+    get_request_parser.add_argument('length', type=int, required=False, default=-1,
+                                    help='Keyset paging length integer for a series listing')
+    get_request_parser.add_argument('cursor', type=str, required=False,
+                                    help='Keyset paging cursor for a series listing: empty for the first page, '
+                                         'then the previous response "next" value')
 
     get_subtitles_model = api_ns_episodes.model('subtitles_model', subtitles_model)
     get_subtitles_language_model = api_ns_episodes.model('subtitles_language_model', subtitles_language_model)
@@ -45,11 +50,16 @@ class Episodes(Resource):
         'sceneName': fields.String(),
     })
 
+    # Keyset page order of a series listing: newest episode first.
+    page_keys = [(TableEpisodes.season, True), (TableEpisodes.episode, True), (TableEpisodes.id, True)]
+
     @authenticate
     @api_ns_episodes.doc(parser=get_request_parser)
     @api_ns_episodes.response(200, 'Success')
     @api_ns_episodes.response(401, 'Not Authenticated')
+    @api_ns_episodes.response(304, 'Not Modified')
     @api_ns_episodes.response(404, 'Series or Episode ID not provided')
+    @conditional_get('table_episodes', 'arr_instances', 'settings')
     def get(self):
         """List episodes metadata for specific series or episodes"""
         args = self.get_request_parser.parse_args()
@@ -57,6 +67,8 @@ class Episodes(Resource):
         episodeId = args.get('episodeid[]')
         localSeriesId = args.get('series_id[]')
         localEpisodeId = args.get('id[]')
+        length = args.get('length')
+        cursor = args.get('cursor')
 
         stmt = select(
                 TableEpisodes.id,
@@ -77,31 +89,28 @@ class Episodes(Resource):
 
         # Prefer the canonical local ids (#156); fall back to upstream ids.
         if len(localEpisodeId) > 0:
-            stmt_query = database.execute(
-                stmt
-                .where(TableEpisodes.id.in_(localEpisodeId)))\
-                .all()
+            stmt = stmt.where(TableEpisodes.id.in_(localEpisodeId))
         elif len(localSeriesId) > 0:
-            stmt_query = database.execute(
-                stmt
-                .where(TableEpisodes.series_id.in_(localSeriesId))
-                .order_by(TableEpisodes.season.desc(), TableEpisodes.episode.desc()))\
-                .all()
+            stmt = stmt \
+                .where(TableEpisodes.series_id.in_(localSeriesId)) \
+                .order_by(TableEpisodes.season.desc(), TableEpisodes.episode.desc())
         elif len(episodeId) > 0:
-            stmt_query = database.execute(
-                stmt
-                .where(TableEpisodes.sonarrEpisodeId.in_(episodeId)))\
-                .all()
+            stmt = stmt.where(TableEpisodes.sonarrEpisodeId.in_(episodeId))
         elif len(seriesId) > 0:
-            stmt_query = database.execute(
-                stmt
-                .where(TableEpisodes.sonarrSeriesId.in_(seriesId))
-                .order_by(TableEpisodes.season.desc(), TableEpisodes.episode.desc()))\
-                .all()
+            stmt = stmt \
+                .where(TableEpisodes.sonarrSeriesId.in_(seriesId)) \
+                .order_by(TableEpisodes.season.desc(), TableEpisodes.episode.desc())
         else:
             return "Series or Episode ID not provided", 404
 
-        return marshal([postprocess({
+        keyset = length > 0 and cursor is not None and not localEpisodeId and not episodeId
+        if keyset:
+            stmt = keyset_page(stmt, self.page_keys, cursor, length)
+            if stmt is None:
+                return 'Invalid paging cursor', 400
+        stmt_query = database.execute(stmt).all()
+
+        result = marshal([postprocess({
                 'id': x.id,
                 'arr_instance_id': x.arr_instance_id,
                 'series_id': x.series_id,
@@ -117,3 +126,6 @@ class Episodes(Resource):
                 'title': x.title,
                 'sceneName': x.sceneName,
                 }) for x in stmt_query], self.get_response_model, envelope='data')
+        if keyset:
+            result['next'] = keyset_next(stmt_query, self.page_keys, length)
+        return result
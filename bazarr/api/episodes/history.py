@@ -10,7 +10,7 @@ from subtitles.upgrade import get_upgradable_episode_subtitles,  _language_still
 from utilities.pretty_date import pretty_date
 
 from flask_restx import Resource, Namespace, reqparse, fields, marshal
-from ..utils import authenticate, postprocess
+from ..utils import authenticate, keyset_next, keyset_page, postprocess
 
 api_ns_episodes_history = Namespace('Episodes History', description='List episodes history events')
 
@@ -20,6 +20,9 @@ class EpisodesHistory(Resource):
     get_request_parser = reqparse.RequestParser()
     get_request_parser.add_argument('start', type=int, required=False, default=0, help='Paging start integer')
     get_request_parser.add_argument('length', type=int, required=False, default=-1, help='Paging length integer')
+    get_request_parser.add_argument('cursor', type=str, required=False,
+                                    help='Keyset paging cursor used instead of start: empty for the first page, '
+                                         'then the previous response "next" value')
     get_request_parser.add_argument('id', type=int, required=False, help='Local episode ID')
     get_request_parser.add_argument('episodeid', type=int, required=False, help='Episode ID')
 
@@ -55,8 +58,12 @@ class EpisodesHistory(Resource):
     get_response_model = api_ns_episodes_history.model('EpisodeHistoryGetResponse', {
         'data': fields.Nested(data_model),
         'total': fields.Integer(),
+        'next': fields.String(),
     })
 
+    # Keyset page order: newest first, the id breaking timestamp ties.
+    page_keys = [(TableHistory.timestamp, True), (TableHistory.id, True)]
+
     @authenticate
     @api_ns_episodes_history.response(401, 'Not Authenticated')
     @api_ns_episodes_history.doc(parser=get_request_parser)
@@ -65,6 +72,7 @@ class EpisodesHistory(Resource):
         args = self.get_request_parser.parse_args()
         start = args.get('start')
         length = args.get('length')
+        cursor = args.get('cursor')
         local_episode_id = args.get('id')
         episodeid = args.get('episodeid')
 
@@ -119,8 +127,14 @@ class EpisodesHistory(Resource):
                   isouter=True) \
             .where(reduce(operator.and_, query_conditions)) \
             .order_by(TableHistory.timestamp.desc())
-        if length > 0:
+        keyset = length > 0 and cursor is not None
+        if keyset:
+            stmt = keyset_page(stmt, self.page_keys, cursor, length)
+            if stmt is None:
+                return 'Invalid paging cursor', 400
+        elif length > 0:
             stmt = stmt.limit(length).offset(start)
+        rows = database.execute(stmt).all()
         episode_history = [{
             'history_id': x.history_id,
             'id': x.id,
@@ -149,7 +163,7 @@ class EpisodesHistory(Resource):
             'dont_matches': x.not_matched,
             'external_subtitles': [y[1] for y in ast.literal_eval(x.external_subtitles) if y[1]],
             'blacklisted': bool(x.blacklisted),
-        } for x in database.execute(stmt).all()]
+        } for x in rows]
 
         upgradable_episodes_not_perfect = get_upgradable_episode_subtitles(history_id_list=[x['history_id'] for x in
                                                                                             episode_history])
@@ -202,4 +216,5 @@ class EpisodesHistory(Resource):
             .where(reduce(operator.and_, query_conditions))) \
             .scalar()
 
-        return marshal({'data': episode_history, 'total': count}, self.get_response_model)
+        next_cursor = keyset_next(rows, self.page_keys, length) if keyset else None
+        return marshal({'data': episode_history, 'total': count, 'next': next_cursor}, self.get_response_model)
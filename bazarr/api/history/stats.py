@@ -1,14 +1,12 @@
 # coding=utf-8
 
 import datetime
-import operator
-import itertools
 
-from dateutil import rrule
 from flask_restx import Resource, Namespace, reqparse, fields, marshal
-from functools import reduce
+from sqlalchemy import Text, and_, cast, func, literal, or_
 
-from app.database import TableHistory, TableHistoryMovie, database, select
+from app.config import settings
+from app.database import TableHistory, TableHistoryDaily, TableHistoryMovie, database, insert, select
 
 from ..utils import authenticate
 
@@ -64,60 +62,76 @@ class HistoryStats(Resource):
         now = datetime.datetime.now()
         past = now - datetime.timedelta(seconds=delay)
 
-        history_where_clauses = [(TableHistory.timestamp.between(past, now))]
-        history_where_clauses_movie = [(TableHistoryMovie.timestamp.between(past, now))]
-
-        if action != 'All':
-            history_where_clauses.append((TableHistory.action == action))
-            history_where_clauses_movie.append((TableHistoryMovie.action == action))
-        else:
-            history_where_clauses.append((TableHistory.action.in_([1, 2, 3])))
-            history_where_clauses_movie.append((TableHistoryMovie.action.in_([1, 2, 3])))
-
-        if provider != 'All':
-            history_where_clauses.append((TableHistory.provider == provider))
-            history_where_clauses_movie.append((TableHistoryMovie.provider == provider))
-
-        if language != 'All':
-            history_where_clauses.append((TableHistory.language == language))
-            history_where_clauses_movie.append((TableHistoryMovie.language == language))
-
-        history_where_clause = reduce(operator.and_, history_where_clauses)
-        history_where_clause_movie = reduce(operator.and_, history_where_clauses_movie)
-
-        data_series = [{
-            'timestamp': x.timestamp,
-            'id': x.id,
-        } for x in database.execute(
-            select(TableHistory.timestamp, TableHistory.id)
-            .where(history_where_clause))
-            .all()]
-        data_series = [{'date': date[0], 'count': sum(1 for item in date[1])} for date in
-                       itertools.groupby(list(data_series),
-                                         key=lambda x: x['timestamp'].strftime(
-                                             '%Y-%m-%d'))]
-
-        data_movies = [{
-            'timestamp': x.timestamp,
-            'id': x.id,
-        } for x in database.execute(
-            select(TableHistoryMovie.timestamp, TableHistoryMovie.id)
-            .where(history_where_clause_movie))
-            .all()]
-        data_movies = [{'date': date[0], 'count': sum(1 for item in date[1])} for date in
-                       itertools.groupby(list(data_movies),
-                                         key=lambda x: x['timestamp'].strftime(
-                                             '%Y-%m-%d'))]
-
-        for dt in rrule.rrule(rrule.DAILY,
-                              dtstart=datetime.datetime.now() - datetime.timedelta(seconds=delay),
-                              until=datetime.datetime.now()):
-            if not any(d['date'] == dt.strftime('%Y-%m-%d') for d in data_series):
-                data_series.append({'date': dt.strftime('%Y-%m-%d'), 'count': 0})
-            if not any(d['date'] == dt.strftime('%Y-%m-%d') for d in data_movies):
-                data_movies.append({'date': dt.strftime('%Y-%m-%d'), 'count': 0})
-
-        sorted_data_series = sorted(data_series, key=lambda i: i['date'])
-        sorted_data_movies = sorted(data_movies, key=lambda i: i['date'])
-
-        return marshal({'series': sorted_data_series, 'movies': sorted_data_movies}, self.get_response_model)
+        counts = {media: _history_counts(media, table, past, now, action, provider, language)
+                  for media, table in (('series', TableHistory), ('movies', TableHistoryMovie))}
+
+        days = [(past.date() + datetime.timedelta(days=offset)).isoformat()
+                for offset in range((now.date() - past.date()).days + 1)]
+        return marshal({media: [{'date': day, 'count': counts[media].get(day, 0)} for day in days]
+                        for media in counts}, self.get_response_model)
+
+
+def _day(timestamp):
+    # YYYY-MM-DD on both SQLite and PostgreSQL.
+    return cast(func.date(timestamp), Text)
+
+
+def _filters(table, action, provider, language):
+    clauses = [table.action == action if action != 'All' else table.action.in_([1, 2, 3])]
+    if provider != 'All':
+        clauses.append(table.provider == provider)
+    if language != 'All':
+        clauses.append(table.language == language)
+    return clauses
+
+
+def _counts_by_day(day, count, *where):
+    return dict(database.execute(select(day, count).where(*where).group_by(day)).all())
+
+
+def _history_counts(media, table, past, now, action, provider, language):
+    """Number of history rows of ``table`` per day between ``past`` and
+    ``now``, keyed by YYYY-MM-DD (days without any are left out)."""
+    filters = _filters(table, action, provider, language)
+    first_day, today = past.date(), now.date()
+    if not settings.general.history_stats_rollup or (today - first_day).days < 2:
+        return _counts_by_day(_day(table.timestamp), func.count(), table.timestamp.between(past, now), *filters)
+
+    # Whole days in between come from the rollup; the partial first day and
+    # today are still counted from the history table.
+    _roll_up(media, table, today)
+    counts = _counts_by_day(
+        _day(table.timestamp), func.count(), *filters,
+        or_(and_(table.timestamp >= past, table.timestamp < _midnight(first_day + datetime.timedelta(days=1))),
+            table.timestamp.between(_midnight(today), now)))
+    counts.update(_counts_by_day(
+        TableHistoryDaily.day, func.sum(TableHistoryDaily.count), TableHistoryDaily.media == media,
+        TableHistoryDaily.day > first_day.isoformat(), TableHistoryDaily.day < today.isoformat(),
+        *_filters(TableHistoryDaily, action, provider, language)))
+    return counts
+
+
+def _midnight(day):
+    return datetime.datetime.combine(day, datetime.time.min)
+
+
+def _roll_up(media, table, today):
+    """Add the closed days of ``table`` that aren't in TableHistoryDaily yet."""
+    last = database.execute(
+        select(func.max(TableHistoryDaily.day))
+        .where(TableHistoryDaily.media == media)).scalar()
+    where = [table.timestamp < _midnight(today)]
+    if last:
+        where.append(table.timestamp >= _midnight(datetime.date.fromisoformat(last) + datetime.timedelta(days=1)))
+
+    day = _day(table.timestamp)
+    provider = func.coalesce(table.provider, '')
+    language = func.coalesce(table.language, '')
+    database.execute(
+        insert(TableHistoryDaily)
+        .from_select(['media', 'day', 'action', 'provider', 'language', 'count'],
+                     select(literal(media), day, table.action, provider, language, func.count())
+                     .where(*where)
+                     .group_by(day, table.action, provider, language))
+        # a concurrent request rolled up the same days
+        .on_conflict_do_nothing())
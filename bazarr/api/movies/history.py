@@ -11,7 +11,7 @@ from subtitles.upgrade import get_upgradable_movies_subtitles, _language_still_d
 from api.swaggerui import subtitles_language_model
 from utilities.pretty_date import pretty_date
 
-from api.utils import authenticate, postprocess
+from api.utils import authenticate, keyset_next, keyset_page, postprocess
 
 api_ns_movies_history = Namespace('Movies History', description='List movies history events')
 
@@ -21,6 +21,9 @@ class MoviesHistory(Resource):
     get_request_parser = reqparse.RequestParser()
     get_request_parser.add_argument('start', type=int, required=False, default=0, help='Paging start integer')
     get_request_parser.add_argument('length', type=int, required=False, default=-1, help='Paging length integer')
+    get_request_parser.add_argument('cursor', type=str, required=False,
+                                    help='Keyset paging cursor used instead of start: empty for the first page, '
+                                         'then the previous response "next" value')
     get_request_parser.add_argument('id', type=int, required=False, help='Local movie ID')
     get_request_parser.add_argument('radarrid', type=int, required=False, help='Movie ID')
 
@@ -53,8 +56,12 @@ class MoviesHistory(Resource):
     get_response_model = api_ns_movies_history.model('MovieHistoryGetResponse', {
         'data': fields.Nested(data_model),
         'total': fields.Integer(),
+        'next': fields.String(),
     })
 
+    # Keyset page order: newest first, the id breaking timestamp ties.
+    page_keys = [(TableHistoryMovie.timestamp, True), (TableHistoryMovie.id, True)]
+
     @authenticate
     @api_ns_movies_history.response(401, 'Not Authenticated')
     @api_ns_movies_history.doc(parser=get_request_parser)
@@ -63,6 +70,7 @@ class MoviesHistory(Resource):
         args = self.get_request_parser.parse_args()
         start = args.get('start')
         length = args.get('length')
+        cursor = args.get('cursor')
         movie_id = args.get('id')
         radarrid = args.get('radarrid')
 
@@ -111,8 +119,14 @@ class MoviesHistory(Resource):
                   isouter=True) \
             .where(reduce(operator.and_, query_conditions)) \
             .order_by(TableHistoryMovie.timestamp.desc())
-        if length > 0:
+        keyset = length > 0 and cursor is not None
+        if keyset:
+            stmt = keyset_page(stmt, self.page_keys, cursor, length)
+            if stmt is None:
+                return 'Invalid paging cursor', 400
+        elif length > 0:
             stmt = stmt.limit(length).offset(start)
+        rows = database.execute(stmt).all()
         movie_history = [{
             'history_id': x.history_id,
             'id': x.id,
@@ -137,7 +151,7 @@ class MoviesHistory(Resource):
             'dont_matches': x.not_matched,
             'external_subtitles': [y[1] for y in ast.literal_eval(x.external_subtitles) if y[1]],
             'blacklisted': bool(x.blacklisted),
-        } for x in database.execute(stmt).all()]
+        } for x in rows]
 
         upgradable_movies_not_perfect = get_upgradable_movies_subtitles(history_id_list=[x['history_id'] for x in
                                                                                          movie_history])
@@ -190,4 +204,5 @@ class MoviesHistory(Resource):
             .where(reduce(operator.and_, query_conditions))) \
             .scalar()
 
-        return marshal({'data': movie_history, 'total': count}, self.get_response_model)
+        next_cursor = keyset_next(rows, self.page_keys, length) if keyset else None
+        return marshal({'data': movie_history, 'total': count, 'next': next_cursor}, self.get_response_model)
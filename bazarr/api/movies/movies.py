@@ -3,7 +3,7 @@
 from flask_restx import Resource, Namespace, reqparse, fields, marshal
 
 from arr_instances.resolution import scoped
-from app.database import TableMovies, database, update, select, func
+from app.database import TableMovies, database, sort_title_key, update, select, func
 from radarr.sync.movies import update_one_movie, update_one_movie_for_instance
 from subtitles.indexer.movies import list_missing_subtitles_movies, movies_scan_subtitles
 from app.event_handler import event_stream
@@ -11,7 +11,7 @@ from subtitles.wanted import wanted_search_missing_subtitles_movies, wanted_scan
 from subtitles.mass_download import movies_download_subtitles
 from api.swaggerui import subtitles_model, subtitles_language_model, audio_language_model
 
-from api.utils import authenticate, None_Keys, postprocess
+from api.utils import authenticate, conditional_get, keyset_next, keyset_page, None_Keys, postprocess
 
 api_ns_movies = Namespace('Movies', description='List movies metadata, update movie languages profile or run actions '
                                                 'for specific movies.')
@@ -22,6 +22,9 @@ class Movies(Resource):
     get_request_parser = reqparse.RequestParser()
     get_request_parser.add_argument('start', type=int, required=False, default=0, help='Paging start integer')
     get_request_parser.add_argument('length', type=int, required=False, default=-1, help='Paging length integer')
+    get_request_parser.add_argument('cursor', type=str, required=False,
+                                    help='Keyset paging cursor used instead of start: empty for the first page, '
+                                         'then the previous response "next" value')
     get_request_parser.add_argument('radarrid[]', type=int, action='append', required=False, default=[],
                                     help='Upstream Radarr movie IDs (legacy; not unique across instances)')
     get_request_parser.add_argument('id[]', type=int, action='append', required=False, default=[],
@@ -57,17 +60,24 @@ class Movies(Resource):
     get_response_model = api_ns_movies.model('MoviesGetResponse', {
         'data': fields.Nested(data_model),
         'total': fields.Integer(),
+        'next': fields.String(),
     })
 
+    # Keyset page order: the sort title, then the id for a unique position.
+    page_keys = [(sort_title_key(TableMovies.sortTitle), False), (TableMovies.id, False)]
+
     @authenticate
     @api_ns_movies.doc(parser=get_request_parser)
     @api_ns_movies.response(200, 'Success')
+    @api_ns_movies.response(304, 'Not Modified')
     @api_ns_movies.response(401, 'Not Authenticated')
+    @conditional_get('table_movies', 'arr_instances', 'settings')
     def get(self):
         """List movies metadata for specific movies"""
         args = self.get_request_parser.parse_args()
         start = args.get('start')
         length = args.get('length')
+        cursor = args.get('cursor')
         radarrId = args.get('radarrid[]')
         localId = args.get('id[]')
 
@@ -90,7 +100,7 @@ class Movies(Resource):
                       TableMovies.title,
                       TableMovies.year,
                       )\
-            .order_by(TableMovies.sortTitle)
+            .order_by(sort_title_key(TableMovies.sortTitle), TableMovies.id)
 
         # Prefer the canonical local id (#156); fall back to the upstream id for
         # back-compat (old bookmarks, the not-yet-migrated action layer).
@@ -99,9 +109,15 @@ class Movies(Resource):
         elif len(radarrId) != 0:
             stmt = stmt.where(TableMovies.radarrId.in_(radarrId))
 
-        if length > 0:
+        keyset = length > 0 and cursor is not None
+        if keyset:
+            stmt = keyset_page(stmt, self.page_keys, cursor, length)
+            if stmt is None:
+                return 'Invalid paging cursor', 400
+        elif length > 0:
             stmt = stmt.limit(length).offset(start)
 
+        rows = database.execute(stmt).all()
         results = [postprocess({
             'id': x.id,
             'arr_instance_id': x.arr_instance_id,
@@ -121,14 +137,15 @@ class Movies(Resource):
             'tags': x.tags,
             'title': x.title,
             'year': x.year,
-        }) for x in database.execute(stmt).all()]
+        }) for x in rows]
 
         count = database.execute(
             select(func.count())
             .select_from(TableMovies)) \
             .scalar()
 
-        return marshal({'data': results, 'total': count}, self.get_response_model)
+        next_cursor = keyset_next(rows, self.page_keys, length) if keyset else None
+        return marshal({'data': results, 'total': count, 'next': next_cursor}, self.get_response_model)
 
     post_request_parser = reqparse.RequestParser()
     post_request_parser.add_argument('radarrid', type=int, action='append', required=False, default=[],
@@ -7,7 +7,7 @@ from flask_restx import Resource, Namespace, reqparse, fields, marshal
 from functools import reduce
 from sqlalchemy import case
 
-from app.database import get_exclusion_clause, TableEpisodes, TableShows, database, select, update, func
+from app.database import get_exclusion_clause, TableEpisodes, TableShows, database, select, sort_title_key, update, func
 from arr_instances.resolution import scoped
 from sonarr.sync.series import update_one_series, update_one_series_for_instance
 from subtitles.indexer.series import list_missing_subtitles, series_scan_subtitles
@@ -18,7 +18,7 @@ from app.event_handler import event_stream
 from api.swaggerui import subtitles_model, subtitles_language_model, audio_language_model
 from utilities.path_mappings import path_mappings
 
-from api.utils import authenticate, None_Keys, postprocess
+from api.utils import authenticate, conditional_get, keyset_next, keyset_page, None_Keys, postprocess
 
 api_ns_series = Namespace('Series', description='List series metadata, update series languages profile or run actions '
                                                 'for specific series.')
@@ -29,6 +29,9 @@ class Series(Resource):
     get_request_parser = reqparse.RequestParser()
     get_request_parser.add_argument('start', type=int, required=False, default=0, help='Paging start integer')
     get_request_parser.add_argument('length', type=int, required=False, default=-1, help='Paging length integer')
+    get_request_parser.add_argument('cursor', type=str, required=False,
+                                    help='Keyset paging cursor used instead of start: empty for the first page, '
+                                         'then the previous response "next" value')
     get_request_parser.add_argument('seriesid[]', type=int, action='append', required=False, default=[],
                                     help='Upstream Sonarr series IDs (legacy; not unique across instances)')
     get_request_parser.add_argument('id[]', type=int, action='append', required=False, default=[],
@@ -67,17 +70,24 @@ class Series(Resource):
     get_response_model = api_ns_series.model('SeriesGetResponse', {
         'data': fields.Nested(data_model),
         'total': fields.Integer(),
+        'next': fields.String(),
     })
 
+    # Keyset page order: the sort title, then the id for a unique position.
+    page_keys = [(sort_title_key(TableShows.sortTitle), False), (TableShows.id, False)]
+
     @authenticate
     @api_ns_series.doc(parser=get_request_parser)
     @api_ns_series.response(200, 'Success')
+    @api_ns_series.response(304, 'Not Modified')
     @api_ns_series.response(401, 'Not Authenticated')
+    @conditional_get('table_shows', 'table_episodes', 'table_shows_tags', 'arr_instances', 'settings')
     def get(self):
         """List series metadata for specific series"""
         args = self.get_request_parser.parse_args()
         start = args.get('start')
         length = args.get('length')
+        cursor = args.get('cursor')
         seriesId = args.get('seriesid[]')
         localId = args.get('id[]')
 
@@ -139,16 +149,23 @@ class Series(Resource):
             .select_from(TableShows) \
             .join(episodeFileCount, TableShows.id == episodeFileCount.c.series_id, isouter=True) \
             .join(episodeMissingCount, TableShows.id == episodeMissingCount.c.series_id, isouter=True)\
-            .order_by(TableShows.sortTitle)
+            .order_by(sort_title_key(TableShows.sortTitle), TableShows.id)
 
         # Prefer the canonical local id (#156); fall back to the upstream id.
+        keyset = False
         if len(localId) != 0:
             stmt = stmt.where(TableShows.id.in_(localId))
         elif len(seriesId) != 0:
             stmt = stmt.where(TableShows.sonarrSeriesId.in_(seriesId))
+        elif length > 0 and cursor is not None:
+            stmt = keyset_page(stmt, self.page_keys, cursor, length)
+            if stmt is None:
+                return 'Invalid paging cursor', 400
+            keyset = True
         elif length > 0:
             stmt = stmt.limit(length).offset(start)
 
+        rows = database.execute(stmt).all()
         results = [postprocess({
             'id': x.id,
             'arr_instance_id': x.arr_instance_id,
@@ -171,14 +188,15 @@ class Series(Resource):
             'lastAired': x.lastAired,
             'episodeFileCount': x.episodeFileCount,
             'episodeMissingCount': x.episodeMissingCount,
-        }) for x in database.execute(stmt).all()]
+        }) for x in rows]
 
         count = database.execute(
             select(func.count())
             .select_from(TableShows)) \
             .scalar()
 
-        return marshal({'data': results, 'total': count}, self.get_response_model)
+        next_cursor = keyset_next(rows, self.page_keys, length) if keyset else None
+        return marshal({'data': results, 'total': count, 'next': next_cursor}, self.get_response_model)
 
     post_request_parser = reqparse.RequestParser()
     post_request_parser.add_argument('seriesid', type=int, action='append', required=False, default=[],
@@ -4,7 +4,7 @@ from flask_restx import Namespace, Resource
 from ..utils import authenticate
 from app.config import settings, write_config
 from compat.cache import compat_region
-from compat import service as compat_service
+from compat import rate_limiter, service as compat_service
 
 api_ns_compat_admin = Namespace("compat_admin", description="Compat endpoint admin")
 
@@ -86,7 +86,7 @@ class CompatClearCache(Resource):
 class CompatStats(Resource):
     @authenticate
     def get(self):
-        return dict(_stats), 200
+        return {**_stats, "rate_limiter": rate_limiter.stats()}, 200
 
 
 @api_ns_compat_admin.route("/system/compat/health")
@@ -13,16 +13,24 @@ from sonarr.info import get_sonarr_info
 from app.get_args import args
 from init import startTime
 
-from ..utils import authenticate
+from ..utils import authenticate, conditional_get
 
 api_ns_system_status = Namespace('System Status', description='List environment information and versions')
 
 
+def _versions():
+    # Status inputs that change without a settings write.
+    return (get_sonarr_info.version(), get_radarr_info.version(),
+            os.environ.get('BAZARR_DB_MIGRATION_VERSION'))
+
+
 @api_ns_system_status.route('system/status')
 class SystemStatus(Resource):
     @authenticate
     @api_ns_system_status.response(200, "Success")
+    @api_ns_system_status.response(304, 'Not Modified')
     @api_ns_system_status.response(401, 'Not Authenticated')
+    @conditional_get('settings', state=_versions)
     def get(self):
         """Return environment information and versions"""
         package_version = ''
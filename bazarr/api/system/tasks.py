@@ -54,6 +54,7 @@ class SystemTasks(Resource):
         args = self.post_request_parser.parse_args()
         taskid = args.get('taskid')
 
-        scheduler.execute_job_now(taskid)
+        # A sync started by hand is a full one, not a delta.
+        scheduler.execute_job_now(taskid, force_full=True)
 
         return '', 204
@@ -1,18 +1,24 @@
 # coding=utf-8
 
 import ast
+import base64
+import hashlib
 import hmac
+import json
 import logging
 
+from datetime import datetime
 from functools import wraps
-from flask import request, abort
+from flask import Response, abort, after_this_request, request
 from operator import itemgetter
+from sqlalchemy import DateTime, and_, or_
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from app.config import settings, base_url
 from languages.get_languages import language_from_alpha2, alpha3_from_alpha2
 from app.database import get_audio_profile_languages, get_desired_languages
 from utilities.path_mappings import path_mappings
+from utilities.table_generations import BOOT_TOKEN, generation
 
 None_Keys = ['null', 'undefined', '', None]
 
@@ -87,6 +93,37 @@ def authenticate(actual_method):
     return wrapper
 
 
+def conditional_get(*tables, state=None):
+    """Answer a polled GET with 304 while nothing it reads has changed.
+
+    The ETag is derived from the write generations of ``tables`` (see
+    utilities.table_generations), the request path and query, and ``state()``
+    for whatever else the payload depends on that isn't a table write. A
+    matching If-None-Match returns before the handler runs any query.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            key = (BOOT_TOKEN, request.full_path, generation(*tables), state() if state else None)
+            etag = hashlib.sha1(repr(key).encode()).hexdigest()
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            @after_this_request
+            def _set_etag(response):
+                if response.status_code == 200:
+                    response.set_etag(etag)
+                    response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def postprocess(item):
     # Remove ffprobe_cache
     if item.get('radarrId'):
@@ -219,3 +256,51 @@ def postprocess(item):
         item['fanart'] = _proxy_image(item['fanart'])
 
     return item
+
+
+def keyset_page(stmt, keys, cursor, length):
+    """Opt-in keyset ("cursor") paging for a list endpoint.
+
+    ``keys`` is the page order as ``(column, descending)`` pairs ending with the
+    primary key, so every row has a unique position. ``cursor`` is "" for the
+    first page, then the ``next`` value of the previous response. Unlike
+    start/length, which makes the database walk and discard every earlier row,
+    the page starts with an index seek to the cursor, so deep pages cost the
+    same as the first one.
+
+    Returns ``stmt`` ordered, filtered and limited to the page, with the key
+    values added as ``keyset_<n>`` columns for keyset_next, or None when the
+    cursor can't be decoded.
+    """
+    stmt = stmt.order_by(None) \
+        .order_by(*[column.desc() if descending else column for column, descending in keys]) \
+        .add_columns(*[column.label(f'keyset_{i}') for i, (column, _) in enumerate(keys)])
+    if cursor:
+        values = _decode_cursor(cursor, keys)
+        if values is None:
+            return None
+        stmt = stmt.where(or_(*[
+            and_(*[keys[j][0] == values[j] for j in range(i)],
+                 column < values[i] if descending else column > values[i])
+            for i, (column, descending) in enumerate(keys)]))
+    return stmt.limit(length)
+
+
+def keyset_next(rows, keys, length):
+    """The cursor of the page after ``rows``, or None on the last page."""
+    if len(rows) < length:
+        return None
+    values = [getattr(rows[-1], f'keyset_{i}') for i in range(len(keys))]
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor, keys):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            return None
+        return [datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+                for value, (column, _) in zip(values, keys)]
+    except (ValueError, TypeError):
+        return None
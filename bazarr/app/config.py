@@ -20,6 +20,7 @@ from urllib.parse import quote_plus
 from utilities.binaries import BinaryNotFound, get_binary
 from literals import EXIT_VALIDATION_ERROR
 from utilities.central import stop_bazarr
+from utilities.table_generations import bump as bump_generation
 from subliminal.cache import region
 from dynaconf import Dynaconf, Validator as OriginalValidator
 from dynaconf.loaders.yaml_loader import write
@@ -190,6 +191,10 @@ validators = [
     Validator('general.language_equals', must_exist=True, default=[], is_type_of=list),
     Validator('general.concurrent_jobs', must_exist=True, default=4 if os.cpu_count() >= 4 else os.cpu_count(),
               is_type_of=int),
+    Validator('general.history_stats_rollup', must_exist=True, default=False, is_type_of=bool),
+    # Transcoding ffmpeg processes the subtitle editor's video preview may run
+    # at once, across all users.
+    Validator('general.editor_max_hls_encoders', must_exist=True, default=2, is_type_of=int, gte=1),
 
     # log section
     Validator('log.include_filter', must_exist=True, default='', is_type_of=str, cast=str),
@@ -222,6 +227,12 @@ validators = [
     Validator('translator.gemini_keys', must_exist=True, default=[], is_type_of=list),
     Validator('translator.gemini_model', must_exist=True, default='gemini-2.0-flash', is_type_of=str, cast=str),
     Validator('translator.gemini_batch_size', must_exist=True, default=300, is_type_of=int, gte=1),
+    # Per-key request quota; batches are spread over all configured keys.
+    Validator('translator.gemini_requests_per_minute', must_exist=True, default=10, is_type_of=int, gte=1),
+    # Google Translate: lines are packed into requests of at most this many
+    # characters and split back afterwards. 0 sends one request per line.
+    Validator('translator.google_batch_max_chars', must_exist=True, default=1500, is_type_of=int, gte=0,
+              lte=5000),
     Validator('translator.translator_info', must_exist=True, default=True, is_type_of=bool),
     Validator('translator.translator_type', must_exist=True, default='google_translate', is_type_of=str, cast=str),
     Validator('translator.lingarr_url', must_exist=True, default='http://lingarr:9876', is_type_of=str),
@@ -235,6 +246,10 @@ validators = [
     Validator('translator.openrouter_parallel_batches', must_exist=True, default=4, is_type_of=int, gte=1, lte=8),
     Validator('translator.openrouter_encryption_key', must_exist=True, default='', is_type_of=str, cast=str),
     Validator('translator.lingarr_token', must_exist=True, default='', is_type_of=str, cast=str),
+    # Translation memory: size budget (MB) of the cache of already translated
+    # lines shared by every translator (cache/translation_memory.db under the
+    # config dir). 0 disables it.
+    Validator('translator.memory_size_mb', must_exist=True, default=64, is_type_of=int, gte=0),
 
     # sonarr section
     Validator('sonarr.ip', must_exist=True, default='127.0.0.1', is_type_of=str),
@@ -252,6 +267,8 @@ validators = [
     Validator('sonarr.series_sync_on_live', must_exist=True, default=True, is_type_of=bool),
     Validator('sonarr.series_sync', must_exist=True, default=60, is_type_of=int,
               is_in=[15, 60, 180, 360, 720, 1440, 10080, ONE_HUNDRED_YEARS_IN_MINUTES]),
+    Validator('sonarr.delta_sync', must_exist=True, default=True, is_type_of=bool),
+    Validator('sonarr.full_sync_hours', must_exist=True, default=24, is_type_of=int, gte=1),
     Validator('sonarr.excluded_tags', must_exist=True, default=[], is_type_of=list, condition=validate_tags),
     Validator('sonarr.excluded_series_types', must_exist=True, default=[], is_type_of=list),
     Validator('sonarr.use_ffprobe_cache', must_exist=True, default=True, is_type_of=bool),
@@ -277,6 +294,8 @@ validators = [
     Validator('radarr.movies_sync_on_live', must_exist=True, default=True, is_type_of=bool),
     Validator('radarr.movies_sync', must_exist=True, default=60, is_type_of=int,
               is_in=[15, 60, 180, 360, 720, 1440, 10080, ONE_HUNDRED_YEARS_IN_MINUTES]),
+    Validator('radarr.delta_sync', must_exist=True, default=True, is_type_of=bool),
+    Validator('radarr.full_sync_hours', must_exist=True, default=24, is_type_of=int, gte=1),
     Validator('radarr.excluded_tags', must_exist=True, default=[], is_type_of=list, condition=validate_tags),
     Validator('radarr.use_ffprobe_cache', must_exist=True, default=True, is_type_of=bool),
     Validator('radarr.defer_search_signalr', must_exist=True, default=False, is_type_of=bool),
@@ -503,6 +522,14 @@ validators = [
               is_type_of=list),
     Validator('subsync.output_mode', must_exist=True, default='overwrite', is_type_of=str,
               is_in=['overwrite', 'keep_all']),
+    # Keep-all mode only: how many sync engines may run at once. The worker
+    # process budget of one sync job: autosubsync forks up to this many for
+    # its feature extraction, split evenly across the engines running at once.
+    Validator('subsync.parallel_engines', must_exist=True, default=1, is_type_of=int, gte=1, lte=3),
+    Validator('subsync.autosubsync_parallelism', must_exist=True, default=1, is_type_of=int, gte=1, lte=16),
+    # Disk budget for decoded reference audio / speech shared by the sync
+    # engines (cache/subsync under the config dir). 0 disables the cache.
+    Validator('subsync.reference_cache_size_mb', must_exist=True, default=2048, is_type_of=int, gte=0),
 
     # postgresql section
     Validator('postgresql.enabled', must_exist=True, default=False, is_type_of=bool),
@@ -544,6 +571,14 @@ validators = [
               default=1800, cast=int, gte=60, lte=86400),
     Validator('compat_endpoint.cache_ttl_partial_seconds',
               default=300, cast=int, gte=30, lte=3600),
+    # Stale-while-revalidate: serve an expired search envelope immediately
+    # and refresh it in the background. cache_max_stale_seconds bounds how
+    # far past its TTL an envelope may be served; service.search also clamps
+    # it to the file_id TTL so stale envelopes never hand out dead file_ids.
+    Validator('compat_endpoint.stale_while_revalidate',
+              default=False, is_type_of=bool),
+    Validator('compat_endpoint.cache_max_stale_seconds',
+              default=1800, cast=int, gte=0, lte=86400),
     Validator('compat_endpoint.search_timeout_seconds',
               default=20, cast=int, gte=5, lte=120),
     # per_provider_timeout is not a user-facing knob: it's derived as
@@ -692,6 +727,9 @@ def write_config():
         logging.debug("Nothing changed when comparing to config file. Skipping write to file.")
         return
 
+    # Settings shape several polled API payloads; invalidate their ETags.
+    bump_generation('settings')
+
     forced_migration = _force_first_save_migration
     if forced_migration:
         logging.info("secret_store: forcing config rewrite to encrypt plaintext credentials on disk")
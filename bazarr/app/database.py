@@ -5,14 +5,14 @@ import json
 import logging
 import os
 import sqlite3
+import threading
 import flask_migrate
 
-from dogpile.cache import make_region
 from datetime import datetime
 
-from sqlalchemy import create_engine, inspect, CheckConstraint, DateTime, ForeignKey, Index, Integer, LargeBinary, Text, func, text, BigInteger
+from sqlalchemy import create_engine, inspect, CheckConstraint, DateTime, ForeignKey, Index, Integer, LargeBinary, Text, exists, func, literal_column, text, BigInteger
 # importing here to be indirectly imported in other modules later
-from sqlalchemy import update, delete, select, func  # noqa: F401, F811
+from sqlalchemy import update, delete, select, func  # noqa: F811
 from sqlalchemy.orm import scoped_session, sessionmaker, mapped_column, close_all_sessions, declarative_base
 from sqlalchemy.pool import NullPool
 from alembic.migration import MigrationContext
@@ -30,13 +30,15 @@ if POSTGRES_ENABLED_ENV:
 else:
     postgresql = settings.postgresql.enabled
 
-# Single-entry cache for update_profile_id_list(). No LRU bound is needed
-# (one key only). The 60s TTL is a safety net so a missed manual
-# invalidation does not pin stale profile data forever.
-region = make_region().configure(
-    'dogpile.cache.memory',
-    expiration_time=60,
-)
+# Parsed languages profiles, reloaded when invalidate_profiles() has bumped
+# the version since the last load. Every write to TableLanguagesProfiles must
+# call invalidate_profiles().
+_profiles_lock = threading.Lock()
+_profiles_version = 0
+_profiles = {'version': -1, 'profiles': []}
+# id -> (profile, desired languages), rebuilt whenever update_profile_id_list()
+# hands out a different list
+_profiles_index = {'profiles': None, 'by_id': {}}
 
 migrations_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'migrations')
 
@@ -172,6 +174,10 @@ else:
 from utilities.sql_profiler import install_slow_query_log  # noqa: E402
 install_slow_query_log(engine)
 
+# Per-table write generations behind the API's conditional GETs (ETag/304).
+from utilities.table_generations import install_write_tracking  # noqa: E402
+install_write_tracking(engine, autocommit=True)
+
 # sessionmaker defaults are wrong for this codebase's access pattern.
 # autoflush=False: bazarr writes through Core insert() / update() / delete()
 # constructs, never via session.add(); there is nothing for the session to
@@ -265,6 +271,10 @@ class TableArrInstances(Base):
     status = mapped_column(Text)
     last_error = mapped_column(Text)
     last_sync_at = mapped_column(DateTime)
+    # delta sync: JSON {"id", "date"} of the newest upstream history record
+    # synced, and when the library was last fully reconciled
+    sync_cursor = mapped_column(Text)
+    full_sync_at = mapped_column(DateTime)
     # timestamps
     created_at = mapped_column(DateTime, nullable=False, default=datetime.now)
     updated_at = mapped_column(DateTime, nullable=False, default=datetime.now)
@@ -408,6 +418,10 @@ class TableHistory(Base):
               'video_path', 'language', 'timestamp'),
         Index('ix_history_instance_upstream_series', 'arr_instance_id', 'sonarrSeriesId'),
         Index('ix_history_instance_upstream_episode', 'arr_instance_id', 'sonarrEpisodeId'),
+        # Keyset paging of the history API (newest first).
+        Index('ix_table_history_timestamp_id', 'timestamp', 'id'),
+        # Covers the history statistics GROUP BY (day range + filters).
+        Index('ix_table_history_stats', 'timestamp', 'action', 'provider', 'language'),
     )
 
     # multi-instance additive columns (#156): nullable owner + local refs.
@@ -441,6 +455,10 @@ class TableHistoryMovie(Base):
         Index('ix_table_history_movie_video_path_language_timestamp',
               'video_path', 'language', 'timestamp'),
         Index('ix_history_movie_instance_upstream', 'arr_instance_id', 'radarrId'),
+        # Keyset paging of the history API (newest first).
+        Index('ix_table_history_movie_timestamp_id', 'timestamp', 'id'),
+        # Covers the history statistics GROUP BY (day range + filters).
+        Index('ix_table_history_movie_stats', 'timestamp', 'action', 'provider', 'language'),
     )
 
     # multi-instance additive columns (#156): nullable owner + local ref.
@@ -464,6 +482,20 @@ class TableHistoryMovie(Base):
     upgradedFromId = mapped_column(Integer, ForeignKey('table_history_movie.id'))
 
 
+class TableHistoryDaily(Base):
+    __tablename__ = 'table_history_daily'
+    # Daily history counts per (media, action, provider, language) backing
+    # long-range history statistics when general.history_stats_rollup is on.
+    # Only closed days (before today) are rolled up, once each, from the
+    # history tables; NULL provider/language are stored as ''.
+    media = mapped_column(Text, primary_key=True)  # 'series' or 'movies'
+    day = mapped_column(Text, primary_key=True)  # YYYY-MM-DD
+    action = mapped_column(Integer, primary_key=True)
+    provider = mapped_column(Text, primary_key=True)
+    language = mapped_column(Text, primary_key=True)
+    count = mapped_column(Integer, nullable=False)
+
+
 class TableLanguagesProfiles(Base):
     __tablename__ = 'table_languages_profiles'
 
@@ -487,6 +519,8 @@ class TableMovies(Base):
         Index('ux_table_movies_instance_path', 'arr_instance_id', 'path', unique=True),
         Index('ux_table_movies_instance_upstream_id', 'arr_instance_id', 'radarrId', unique=True),
         Index('ux_table_movies_instance_tmdbid', 'arr_instance_id', 'tmdbId', unique=True),
+        # Keyset paging of the movies API, on sort_title_key().
+        Index('ix_table_movies_sorttitle_key_id', text('coalesce("sortTitle", \'\')'), 'id'),
     )
 
     id = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -525,6 +559,27 @@ class TableMovies(Base):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
 
 
+def sort_title_key(column):
+    """``sortTitle`` as a keyset paging key. The column is nullable, and NULL
+    neither compares with a cursor value nor sorts the same way on SQLite and
+    PostgreSQL, so it pages as ''. Matches the ix_*_sorttitle_key_id indexes."""
+    return func.coalesce(column, literal_column("''"))
+
+
+class TableMoviesTags(Base):
+    __tablename__ = 'table_movies_tags'
+    # One row per (movie, tag label): the indexed form of TableMovies.tags that
+    # get_exclusion_clause anti-joins on. Rebuilt from the tags column by
+    # index_tags whenever the Radarr sync writes a movie; rows go with their
+    # movie through the cascade.
+    __table_args__ = (
+        Index('ix_table_movies_tags_tag', 'tag', 'movie_id'),
+    )
+
+    movie_id = mapped_column(Integer, ForeignKey('table_movies.id', ondelete='CASCADE'), primary_key=True)
+    tag = mapped_column(Text, primary_key=True)
+
+
 class TableMoviesRootfolder(Base):
     __tablename__ = 'table_movies_rootfolder'
     # Phase 8 ORM PK flip (#156): local_rootfolder_id is the canonical PK; the
@@ -586,6 +641,8 @@ class TableShows(Base):
     __table_args__ = (
         Index('ux_table_shows_instance_path', 'arr_instance_id', 'path', unique=True),
         Index('ux_table_shows_instance_upstream_id', 'arr_instance_id', 'sonarrSeriesId', unique=True),
+        # Keyset paging of the series API, on sort_title_key().
+        Index('ix_table_shows_sorttitle_key_id', text('coalesce("sortTitle", \'\')'), 'id'),
     )
 
     id = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -616,6 +673,20 @@ class TableShows(Base):
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
 
 
+class TableShowsTags(Base):
+    __tablename__ = 'table_shows_tags'
+    # One row per (series, tag label): the indexed form of TableShows.tags that
+    # get_exclusion_clause anti-joins on. Rebuilt from the tags column by
+    # index_tags whenever the Sonarr sync writes a series; rows go with their
+    # series through the cascade.
+    __table_args__ = (
+        Index('ix_table_shows_tags_tag', 'tag', 'series_id'),
+    )
+
+    series_id = mapped_column(Integer, ForeignKey('table_shows.id', ondelete='CASCADE'), primary_key=True)
+    tag = mapped_column(Text, primary_key=True)
+
+
 class TableShowsRootfolder(Base):
     __tablename__ = 'table_shows_rootfolder'
     # Phase 8 ORM PK flip (#156): local_rootfolder_id is the canonical PK; the
@@ -839,14 +910,18 @@ def migrate_db(app):
 
 def get_exclusion_clause(exclusion_type):
     where_clause = []
+    # Excluded tags are one indexed NOT EXISTS against the normalized tag table
+    # instead of a LIKE per tag over every row's serialized tags.
     if exclusion_type == 'series':
         tagsList = settings.sonarr.excluded_tags
-        for tag in tagsList:
-            where_clause.append(~(TableShows.tags.contains(f"\'{tag}\'")))  # noqa: PERF401
+        if tagsList:
+            where_clause.append(~exists().where(TableShowsTags.series_id == TableShows.id,
+                                                TableShowsTags.tag.in_(tagsList)))
     else:
         tagsList = settings.radarr.excluded_tags
-        for tag in tagsList:
-            where_clause.append(~(TableMovies.tags.contains(f"\'{tag}\'")))  # noqa: PERF401
+        if tagsList:
+            where_clause.append(~exists().where(TableMoviesTags.movie_id == TableMovies.id,
+                                                TableMoviesTags.tag.in_(tagsList)))
 
     if exclusion_type == 'series':
         monitoredOnly = settings.sonarr.only_monitored
@@ -870,8 +945,42 @@ def get_exclusion_clause(exclusion_type):
     return where_clause
 
 
-@region.cache_on_arguments()
-def update_profile_id_list():
+def _parse_tags(tags):
+    try:
+        labels = ast.literal_eval(tags) if tags else []
+    except (ValueError, SyntaxError):
+        return set()
+    return {str(label) for label in labels} if isinstance(labels, (list, tuple, set)) else set()
+
+
+def index_tags(session, table, ids):
+    """Rebuild the normalized tag rows (TableShowsTags/TableMoviesTags) of the
+    ``table`` items whose local id is in ``ids``, a select of TableShows.id or
+    TableMovies.id, from their serialized ``tags`` column.
+
+    The sync code calls this after writing series/movies so get_exclusion_clause
+    can anti-join on the tag table instead of pattern-matching the tags column.
+    """
+    tags_table, item_column = (TableShowsTags, TableShowsTags.series_id) if table is TableShows \
+        else (TableMoviesTags, TableMoviesTags.movie_id)
+    rows = session.execute(select(table.id, table.tags).where(table.id.in_(ids))).all()
+    if not rows:
+        return
+    values = [{item_column.key: row.id, 'tag': tag} for row in rows for tag in _parse_tags(row.tags)]
+    with session.begin_nested():
+        session.execute(delete(tags_table).where(item_column.in_(ids)))
+        if values:
+            session.execute(tags_table.__table__.insert(), values)
+
+
+def invalidate_profiles():
+    """Drop the loaded languages profiles; the next lookup reloads them."""
+    global _profiles_version
+    with _profiles_lock:
+        _profiles_version += 1
+
+
+def _load_profiles():
     return [{
         'profileId': x.profileId,
         'name': x.name,
@@ -896,49 +1005,60 @@ def update_profile_id_list():
     ]
 
 
-def get_profiles_list(profile_id=None):
-    profile_id_list = update_profile_id_list()
+def update_profile_id_list():
+    with _profiles_lock:
+        if _profiles['version'] != _profiles_version:
+            _profiles['profiles'] = _load_profiles()
+            _profiles['version'] = _profiles_version
+        return _profiles['profiles']
+
 
+def _profiles_by_id():
+    profiles = update_profile_id_list()
+    with _profiles_lock:
+        if _profiles_index['profiles'] is not profiles:
+            _profiles_index['by_id'] = {
+                profile['profileId']: (profile, [x['language'] for x in profile['items']]) for profile in profiles
+            }
+            _profiles_index['profiles'] = profiles
+        return _profiles_index['by_id']
+
+
+def get_profiles_list(profile_id=None):
     if profile_id and profile_id != 'null':
-        for profile in profile_id_list:
-            if profile['profileId'] == profile_id:
-                return profile
+        entry = _profiles_by_id().get(profile_id)
+        return entry[0] if entry else None
     else:
-        return profile_id_list
+        return update_profile_id_list()
 
 
 def get_desired_languages(profile_id):
-    for profile in update_profile_id_list():
-        if profile['profileId'] == profile_id:
-            return [x['language'] for x in profile['items']]
+    entry = _profiles_by_id().get(profile_id)
+    if entry:
+        return list(entry[1])
 
 
 def get_profile_id_name(profile_id):
-    for profile in update_profile_id_list():
-        if profile['profileId'] == profile_id:
-            return profile['name']
+    entry = _profiles_by_id().get(profile_id)
+    if entry:
+        return entry[0]['name']
 
 
 def get_profile_cutoff(profile_id):
     cutoff_language = None
-    profile_id_list = update_profile_id_list()
 
     if profile_id and profile_id != 'null':
         cutoff_language = []
-        for profile in profile_id_list:
-            # Access by key, not positional .values() unpacking: the profile
-            # dict can grow new keys (e.g. 'combine') and a fixed-arity unpack
-            # would raise ValueError for every profile during indexing.
-            profileId = profile['profileId']
-            cutoff = profile['cutoff']
-            items = profile['items']
-            if cutoff:
-                if profileId == int(profile_id):
-                    for item in items:
-                        if item['id'] == cutoff:
-                            return [item]
-                        elif cutoff == 65535:
-                            cutoff_language.append(item)
+        entry = _profiles_by_id().get(int(profile_id))
+        # Access by key, not positional .values() unpacking: the profile dict
+        # can grow new keys (e.g. 'combine').
+        cutoff = entry[0]['cutoff'] if entry else None
+        if cutoff:
+            for item in entry[0]['items']:
+                if item['id'] == cutoff:
+                    return [item]
+                elif cutoff == 65535:
+                    cutoff_language.append(item)
 
         if not len(cutoff_language):
             cutoff_language = None
@@ -1045,6 +1165,7 @@ def upgrade_languages_profile_values():
             .values({"items": json.dumps(items)})
             .where(TableLanguagesProfiles.profileId == languages_profile.profileId)
         )
+    invalidate_profiles()
 
 
 def fix_languages_profiles_with_duplicate_ids():
@@ -1074,3 +1195,4 @@ def fix_languages_profiles_with_duplicate_ids():
                 .values({"items": json.dumps(languages_profile_items)})
                 .where(TableLanguagesProfiles.profileId == languages_profile.profileId)
             )
+    invalidate_profiles()
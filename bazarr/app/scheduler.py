@@ -123,6 +123,7 @@ class Scheduler:
                 event_stream(type='task')
 
         def task_listener_remove(event):
+            self.__clear_force_full(event.job_id)
             if event.job_id in self.__running_tasks:
                 self.__running_tasks.remove(event.job_id)
                 event_stream(type='task')
@@ -155,8 +156,23 @@ class Scheduler:
         if args.no_tasks:
             self.__no_task()
 
-    def execute_job_now(self, taskid):
-        self.aps_scheduler.modify_job(taskid, next_run_time=datetime.now())
+    def execute_job_now(self, taskid, force_full=False):
+        # force_full (a run by hand from System > Tasks): a Sonarr/Radarr
+        # instance sync skips the delta path for this one run. The listener
+        # drops the flag again once the run is over.
+        changes = {}
+        if force_full:
+            job = self.aps_scheduler.get_job(taskid)
+            if job is not None and 'arr_instance_id' in job.kwargs:
+                changes['kwargs'] = dict(job.kwargs, force_full=True)
+        self.aps_scheduler.modify_job(taskid, next_run_time=datetime.now(), **changes)
+
+    def __clear_force_full(self, taskid):
+        job = self.aps_scheduler.get_job(taskid)
+        if job is not None and job.kwargs.get('force_full'):
+            kwargs = dict(job.kwargs)
+            del kwargs['force_full']
+            self.aps_scheduler.modify_job(taskid, kwargs=kwargs)
 
     def get_running_tasks(self):
         return self.__running_tasks
@@ -4,6 +4,7 @@ import logging
 import time
 import threading
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from requests.exceptions import ConnectionError
 from app.signalrcore_compat import build_signalr_connection, patch_signalrcore_stop
 from collections import deque
@@ -35,6 +36,14 @@ patch_signalrcore_stop()
 sonarr_queue = deque()
 radarr_queue = deque()
 
+# consume_queue waits this long after the first queued event so a burst (e.g. a
+# bulk import) is drained and coalesced as one batch.
+SIGNALR_COALESCE_SECONDS = 0.5
+# Upper bound on one batch, so badges still refresh during a long backlog.
+SIGNALR_MAX_BATCH = 500
+# Series (or movies) dispatched in parallel; events of one series stay ordered.
+SIGNALR_DISPATCH_WORKERS = 4
+
 # Per-instance dedup caches keyed by arr_instance_id (None == the legacy
 # single-instance / scalar path). The same event from two instances is no longer
 # collapsed into one; identical repeats from one instance still are. (#156)
@@ -345,6 +354,13 @@ class RadarrSignalrClient:
 
 
 def dispatcher(data):
+    try:
+        _dispatch_event(data)
+    finally:
+        event_stream(type='badges')
+
+
+def _dispatch_event(data):
     # The owning instance tagged by feed_queue (None == legacy/default, unscoped).
     arr_instance_id = data.get('_arr_instance_id') if isinstance(data, dict) else None
     try:
@@ -428,9 +444,6 @@ def dispatcher(data):
                                  is_signalr=True)
     except Exception as e:
         logging.debug(f'BAZARR an exception occurred while parsing SignalR feed: {repr(e)}')  # noqa: G004
-    finally:
-        event_stream(type='badges')
-        return
 
 
 def filter_nested_dict(data: dict) -> dict:
@@ -508,18 +521,93 @@ def feed_queue(data, arr_instance_id=None):
             radarr_queue.append(tagged)
 
 
+def _coalesce_key(data):
+    """Events with the same key lead to the same work, so only the latest one
+    is dispatched. None for events the dispatcher would drop anyway."""
+    try:
+        resource = data['body']['resource']
+        return (data.get('_arr_instance_id'), data['name'], resource['id'], data['body']['action'],
+                bool(resource.get('episodesChanged')))
+    except (KeyError, TypeError, AttributeError):
+        return None
+
+
+def _ordering_key(data):
+    """Events sharing this key (same instance and series, or same movie) are
+    dispatched in order by one worker."""
+    try:
+        resource = data['body']['resource']
+        if data['name'] == 'episode':
+            series_id = resource.get('seriesId') or (resource.get('series') or {}).get('id')
+            if series_id is not None:
+                return data.get('_arr_instance_id'), 'series', series_id
+        elif data['name'] == 'series':
+            return data.get('_arr_instance_id'), 'series', resource['id']
+        return data.get('_arr_instance_id'), data['name'], resource['id']
+    except (KeyError, TypeError, AttributeError):
+        return None
+
+
+def coalesce_events(events):
+    """Drop events superseded by a later one with the same coalesce key,
+    keeping the survivors in arrival order."""
+    latest = {}
+    for position, data in enumerate(events):
+        key = _coalesce_key(data)
+        latest[key if key is not None else ('unparsed', position)] = position
+    return [events[position] for position in sorted(latest.values())]
+
+
+def _dispatch_in_order(events):
+    for data in events:
+        _dispatch_event(data)
+
+
+def dispatch_batch(events, executor=None):
+    """Coalesce a drained batch, dispatch each series/movie's events in order
+    (different ones concurrently on ``executor``) and refresh badges once."""
+    batch = coalesce_events(events)
+    groups = {}
+    for data in batch:
+        groups.setdefault(_ordering_key(data), []).append(data)
+    if len(batch) < len(events):
+        logging.debug('BAZARR SignalR dispatching %s events (%s coalesced away)', len(batch),
+                      len(events) - len(batch))
+    try:
+        if executor is None or len(groups) == 1:
+            for group in groups.values():
+                _dispatch_in_order(group)
+        else:
+            wait([executor.submit(_dispatch_in_order, group) for group in groups.values()])
+    finally:
+        event_stream(type='badges')
+
+
+def _drain(queue, limit):
+    events = []
+    while len(events) < limit:
+        try:
+            events.append(queue.popleft())
+        except IndexError:
+            break
+    return events
+
+
 def consume_queue(queue):
-    # get events data from queues one at a time and dispatch it
+    # wait for events, let a burst pile up for a moment, then dispatch what's
+    # queued as one coalesced batch
+    executor = ThreadPoolExecutor(max_workers=SIGNALR_DISPATCH_WORKERS, thread_name_prefix='signalr-dispatch')
     while True:
         try:
-            data = queue.popleft()
-        except IndexError:
-            pass
+            if not queue:
+                sleep(0.1)
+                continue
+            sleep(SIGNALR_COALESCE_SECONDS)
+            dispatch_batch(_drain(queue, SIGNALR_MAX_BATCH), executor)
         except (KeyboardInterrupt, SystemExit):
             break
-        else:
-            dispatcher(data)
-        sleep(0.1)
+        except Exception:
+            logging.exception('BAZARR SignalR event dispatch failed')
 
 
 # start both queues consuming threads
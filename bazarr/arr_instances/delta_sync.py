@@ -0,0 +1,141 @@
+# coding=utf-8
+"""Change cursors for the scheduled Sonarr/Radarr syncs.
+
+A scheduled sync used to fetch and diff an instance's whole library on every
+run. Each instance now keeps a cursor on its arr_instances row: the id and
+date of the newest upstream history record already synced. Between full
+reconciliations a run only asks the instance for the history recorded since
+that cursor and resyncs the series/movies it touches, so its cost follows the
+churn rather than the library size.
+
+History does not record everything (a series deleted from Sonarr takes its
+history with it; metadata edits write none), so a full sync still runs when
+delta sync is off, the cursor is missing or unreadable, the history can't be
+fetched, the configured full-sync interval has elapsed, or the sync task was
+run by hand.
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+from .repository import ArrInstanceRepository
+
+# History field naming the item each record belongs to.
+_ITEM_KEYS = {"sonarr": "seriesId", "radarr": "movieId"}
+
+# Cursor for an instance that has no history yet: every later record is newer.
+_EMPTY_CURSOR = {"id": 0, "date": "1970-01-01T00:00:00Z"}
+
+# Concurrent single-item GETs when fetching the changed series/movies.
+FETCH_WORKERS = 8
+
+
+class SyncPlan:
+    """What a scheduled sync should do: a full sync (``item_ids`` None) or a
+    delta over ``item_ids``. ``cursor`` is stored once the sync finishes."""
+
+    def __init__(self, cursor, item_ids=None):
+        self.cursor = cursor
+        self.item_ids = item_ids
+
+    @property
+    def full(self):
+        return self.item_ids is None
+
+
+def _history(arr_client, path):
+    try:
+        response = arr_client.get(path)
+        response.raise_for_status()
+        return response.json()
+    except Exception:
+        logging.exception('BAZARR cannot get history at %s', path)
+        return None
+
+
+def _record_cursor(record):
+    return {"id": record["id"], "date": record["date"]}
+
+
+def newest_history_cursor(arr_client):
+    """Cursor for the newest history record, taken before a full sync so
+    anything recorded while it runs is picked up by the next delta. None when
+    the history can't be read."""
+    page = _history(arr_client, "/api/v3/history?page=1&pageSize=1&sortKey=date&sortDirection=descending")
+    if not isinstance(page, dict):
+        return None
+    records = page.get("records") or []
+    return _record_cursor(records[0]) if records else dict(_EMPTY_CURSOR)
+
+
+def history_since(arr_client, cursor):
+    """History records newer than ``cursor``, oldest first, or None on error.
+
+    /history/since filters on date, inclusively; ids are monotonic, so they
+    drop the records the previous run already saw.
+    """
+    records = _history(arr_client, f"/api/v3/history/since?date={quote(cursor['date'])}")
+    if not isinstance(records, list):
+        return None
+    return sorted((record for record in records if record.get("id", 0) > cursor["id"]),
+                  key=lambda record: record["id"])
+
+
+def _load_cursor(row):
+    try:
+        cursor = json.loads(row.sync_cursor)
+        return {"id": int(cursor["id"]), "date": str(cursor["date"])}
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def plan_sync(session, instance_id, arr_client, *, enabled=True, full_sync_hours=24, force_full=False):
+    """Decide between a full and a delta sync for one instance. ``force_full``
+    skips the delta path (a sync task run by hand from System > Tasks)."""
+    row = ArrInstanceRepository(session).get(instance_id)
+    cursor = _load_cursor(row) if row is not None and row.sync_cursor else None
+    full_due = row is None or row.full_sync_at is None or \
+        datetime.now() - row.full_sync_at >= timedelta(hours=full_sync_hours)
+
+    if enabled and not force_full and cursor is not None and not full_due:
+        records = history_since(arr_client, cursor)
+        if records is not None:
+            item_key = _ITEM_KEYS[arr_client.kind]
+            item_ids = {record[item_key] for record in records if record.get(item_key)}
+            if records:
+                cursor = _record_cursor(records[-1])
+            logging.debug('BAZARR delta sync for %s instance %s: %d history records, %d items changed',
+                          arr_client.kind, instance_id, len(records), len(item_ids))
+            return SyncPlan(cursor, item_ids)
+
+    return SyncPlan(newest_history_cursor(arr_client) if enabled else None)
+
+
+def record_sync(session, instance_id, plan):
+    """Persist the cursor of a finished sync."""
+    cursor = json.dumps(plan.cursor) if plan.cursor is not None else None
+    ArrInstanceRepository(session).record_sync(instance_id, cursor, full=plan.full)
+
+
+def fetch_changed(arr_client, resource, item_ids):
+    """GET /api/v3/<resource>/<id> for every changed item.
+
+    Items the instance no longer has (404) are left out, so the sync removes
+    them. Any other failure raises: a delta sync must not mistake an outage
+    for deletions, and the cursor stays put for the next run to retry.
+    """
+    def fetch(item_id):
+        response = arr_client.get(f"/api/v3/{resource}/{item_id}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    if not item_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(item_ids)),
+                            thread_name_prefix=f'bazarr-{arr_client.kind}-delta') as executor:
+        payloads = list(executor.map(fetch, sorted(item_ids)))
+    return [payload for payload in payloads if payload]
@@ -158,6 +158,7 @@ class ArrInstanceRepository:
         if row is None:
             return None
 
+        connection = (row.ip, row.port, row.base_url, row.ssl)
         if name is not _UNSET:
             row.name = name
         if ip is not _UNSET:
@@ -179,6 +180,11 @@ class ArrInstanceRepository:
         if schedule is not _UNSET:
             row.schedule = schedule
 
+        # A different host may be a different *arr whose history ids mean
+        # nothing against the stored cursor; resync it in full.
+        if (row.ip, row.port, row.base_url, row.ssl) != connection:
+            row.sync_cursor = None
+
         # api-key policy
         if clear_api_key:
             row.api_key = ""
@@ -211,6 +217,20 @@ class ArrInstanceRepository:
         self._session.flush()
         return row
 
+    def record_sync(self, instance_id, cursor, *, full):
+        """Store the delta-sync cursor after a scheduled sync. A full sync also
+        restarts the interval until the next full reconciliation."""
+        row = self.get(instance_id)
+        if row is None:
+            return None
+        now = datetime.now()
+        row.sync_cursor = cursor
+        row.last_sync_at = now
+        if full:
+            row.full_sync_at = now
+        self._session.flush()
+        return row
+
     def _reconcile_default(self, kind, demoted_id=None):
         """Keep a kind with any enabled instance owning exactly one default.
 
@@ -60,8 +60,28 @@ def stamp_owner(row, instance_id):
     return row
 
 
+# --- Per-instance client cache -------------------------------------------
+# instance_id -> (enabled, ArrClient). Building a client reads the row and
+# decrypts its API key, which the per-item hot paths (subtitle downloads,
+# SignalR events, webhooks) used to pay on every call. The cached client holds
+# the decrypted key and routes through the kind's shared session pool, whose
+# urllib3 pools are keyed per (scheme, host, port), i.e. per instance. Cleared
+# by service.refresh_runtime on any instance create/update/delete, like the
+# subtitle settings cache below. Only existing rows are cached: a miss costs a
+# lookup and never pins a not-yet-created instance as missing.
+_client_cache = {}
+
+
+def clear_client_cache(arr_instance_id=None):
+    """Drop the cached client for one instance, or all of them."""
+    if arr_instance_id is None:
+        _client_cache.clear()
+    else:
+        _client_cache.pop(arr_instance_id, None)
+
+
 def client_for_instance(session, instance_id, http_get=None, enabled_only=True):
-    """Build an :class:`ArrClient` for a saved instance (key decrypted at the
+    """Return an :class:`ArrClient` for a saved instance (key decrypted at the
     repository boundary), or None when the instance no longer exists. The INC7
     fan-out + webhook/signalr entry points use this to route HTTP at one
     specific instance.
@@ -71,17 +91,25 @@ def client_for_instance(session, instance_id, http_get=None, enabled_only=True):
     syncing it. The pre-save connection test builds its client elsewhere
     (``from_params``) and is unaffected; pass ``enabled_only=False`` to reach a
     disabled instance deliberately.
+
+    Clients are cached per instance; an injected ``http_get`` bypasses the
+    cache and builds a fresh one.
     """
     from .client import ArrClientFactory
-    from .repository import ArrInstanceRepository
 
-    repo = ArrInstanceRepository(session)
-    row = repo.get(instance_id)
-    if row is None:
-        return None
-    if enabled_only and not row.enabled:
+    cached = _client_cache.get(instance_id) if http_get is None else None
+    if cached is None:
+        repo = ArrInstanceRepository(session)
+        row = repo.get(instance_id)
+        if row is None:
+            return None
+        cached = (bool(row.enabled), ArrClientFactory(repo).from_row(row, http_get=http_get))
+        if http_get is None:
+            _client_cache[instance_id] = cached
+    enabled, client = cached
+    if enabled_only and not enabled:
         return None
-    return ArrClientFactory(repo).from_row(row, http_get=http_get)
+    return client
 
 
 def sonarr_series_owner(session, sonarr_series_id, arr_instance_id=None):
@@ -1,10 +1,40 @@
 from __future__ import annotations
 import hashlib
 import json
+import logging
+import threading
+from concurrent.futures import Future
 from dogpile.cache import make_region
+from dogpile.cache.api import NO_VALUE
 
 from utilities.locked_lru import LockedLRU
 
+logger = logging.getLogger("bazarr.compat.cache")
+
+
+def _refresh_in_background(cache, key, creator, mutex):
+    """dogpile async_creation_runner for stale-while-revalidate.
+
+    dogpile only calls this for the one request that won the per-key
+    creation mutex while an expired value is present; that request (and
+    every concurrent one) is handed the stale envelope immediately. The
+    refresh runs on a daemon thread and MUST release the mutex when done,
+    otherwise the key could never be regenerated again. A failed refresh
+    leaves the stale envelope in place until get_or_create's max-stale
+    bound forces a synchronous rebuild.
+    """
+    def _refresh():
+        try:
+            cache.set(key, creator())
+        except Exception as e:
+            logger.warning("compat: background refresh failed for %s: %s", key, e)
+        finally:
+            mutex.release()
+
+    threading.Thread(target=_refresh, name="compat-swr-refresh",
+                     daemon=True).start()
+
+
 # Bound the in-memory region with a thread-safe LRU and a sane region default
 # TTL. Each cached envelope holds provider matches + scores and can be tens of
 # KB; without a bound, a 5000-episode library could hold 5000 envelopes for up
@@ -16,7 +46,13 @@ from utilities.locked_lru import LockedLRU
 # Waitress runs threads=100 request workers and dogpile's set()/delete()
 # bypass the per-key mutex, leaving the LRU's OrderedDict linked list open
 # to concurrent corruption otherwise.
-compat_region = make_region(key_mangler=lambda k: k).configure(
+# The async_creation_runner only ever sees envelopes that get_or_create below
+# has allowed to be served stale; anything past the stale bound is dropped
+# first so dogpile rebuilds it inline.
+compat_region = make_region(
+    key_mangler=lambda k: k,
+    async_creation_runner=_refresh_in_background,
+).configure(
     "dogpile.cache.memory",
     arguments={"cache_dict": LockedLRU(maxsize=2048)},
     expiration_time=1800,
@@ -85,6 +121,71 @@ def build_key(media_type: str, imdb_id: str, season: int | None,
     )
 
 
+def get_or_create(key: str, creator, expiration_time: float,
+                  max_stale: int = 0):
+    """Region get_or_create with an optional stale-while-revalidate window.
+
+    An envelope younger than expiration_time is a plain hit. One that is
+    expired but no older than expiration_time + max_stale is served as-is
+    while a single background refresh runs (de-duplicated by dogpile's
+    per-key mutex). Anything older, or every expired envelope when
+    max_stale is 0, is dropped so the caller rebuilds it synchronously and
+    concurrent callers for the same key wait on that one build.
+    """
+    cached = compat_region.get_value_metadata(key, ignore_expiration=True)
+    if cached is not None and cached.age > expiration_time + max(0, int(max_stale)):
+        compat_region.delete(key)
+    return compat_region.get_or_create(key, creator,
+                                       expiration_time=expiration_time)
+
+
+def get_fresh(key: str, expiration_time: float):
+    """The cached envelope for key if it is younger than expiration_time,
+    else None. Never creates or refreshes anything."""
+    value = compat_region.get(key, expiration_time=expiration_time)
+    return None if value is NO_VALUE else value
+
+
+_inflight_lock = threading.Lock()
+_inflight: dict[str, Future] = {}
+
+
+def coalesce(key: str, fn, timeout: float):
+    """Single-flight: concurrent callers with the same key share one fn() call.
+
+    The first caller (leader) runs fn() on its own thread; callers arriving
+    while it is in flight (followers) wait on the leader's result for at most
+    `timeout` seconds and then raise concurrent.futures.TimeoutError. A
+    leader exception is re-raised in every follower. The entry is dropped as
+    soon as the leader finishes, so this never serves a result after the fact
+    - caching is compat_region's job, this only de-duplicates the work.
+    """
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        leader = fut is None
+        if leader:
+            fut = _inflight[key] = Future()
+    if not leader:
+        return fut.result(timeout=timeout)
+    try:
+        result = fn()
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def inflight_count() -> int:
+    """Number of keys with a leader currently in flight. For tests/diagnostics."""
+    with _inflight_lock:
+        return len(_inflight)
+
+
 def invalidate_all() -> None:
     """Hard invalidation of the entire compat region. Called post secret rotation."""
     compat_region.invalidate(hard=True)
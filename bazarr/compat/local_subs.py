@@ -8,6 +8,8 @@ DB lookup and path-safety logic it needs inline.
 from __future__ import annotations
 
 import ast as _ast
+import codecs
+import hashlib
 import logging
 import os
 import struct
@@ -385,17 +387,150 @@ def _convert_to_srt(raw: bytes, fmt: str) -> bytes:
 
 
 _MAX_SUB_BYTES = 5 * 1024 * 1024
+_STREAM_CHUNK = 64 * 1024
 
 
-def serve_local(payload: dict) -> tuple[bytes, str]:
+class SubtitleBody:
+    """A subtitle response body with its ETag and Content-Length known up
+    front, iterated in `_STREAM_CHUNK` pieces.
+
+    Either streams a verified-clean file straight from disk (the file handle
+    is opened eagerly so a vanished file still surfaces as
+    FileNotFoundError before the response starts) or slices an in-memory
+    buffer. Pass the instance itself as a WSGI response body: the server
+    calls close() when done, which releases the file handle.
+    """
+
+    __slots__ = ("etag", "length", "_fh", "_data")
+
+    def __init__(self, etag: str, length: int, fh=None, data: bytes = b""):
+        self.etag = etag
+        self.length = length
+        self._fh = fh
+        self._data = data
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SubtitleBody":
+        return cls(hashlib.sha1(data).hexdigest(), len(data), data=data)
+
+    def __iter__(self):
+        if self._fh is None:
+            view = memoryview(self._data)
+            for i in range(0, len(view), _STREAM_CHUNK):
+                yield bytes(view[i:i + _STREAM_CHUNK])
+            return
+        try:
+            left = self.length
+            while left > 0:
+                chunk = self._fh.read(min(_STREAM_CHUNK, left))
+                if not chunk:
+                    break
+                left -= len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def read(self) -> bytes:
+        return b"".join(self)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+
+def _scan_clean_utf8(real: str) -> str | None:
+    """Stream the file once through an incremental UTF-8 decoder.
+
+    Returns the content sha1 when the file is BOM-less valid UTF-8 - i.e.
+    `_normalize_srt` would return it unchanged, so it can be served straight
+    from disk - else None.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    digest = hashlib.sha1()
+    with open(real, "rb") as f:
+        first = True
+        while True:
+            chunk = f.read(_STREAM_CHUNK)
+            if first and chunk.startswith((b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")):
+                return None
+            first = False
+            try:
+                decoder.decode(chunk, final=not chunk)
+            except UnicodeDecodeError:
+                return None
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+
+class _ConversionCache:
+    """In-memory LRU: (realpath, fmt, mtime_ns, size) -> served form.
+
+    The value is either ("disk", etag, length) for files that need no
+    normalization, or ("mem", etag, bytes) for converted/re-encoded output.
+    Bounded by the total bytes of cached output rather than entry count,
+    since a converted ASS file can be megabytes while a disk entry is a few
+    dozen bytes. Keyed on (mtime_ns, size) like `_HashCache`, so an edited
+    file is converted afresh.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 5000):
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._bytes = 0
+        self._store: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def get(self, key: tuple) -> tuple | None:
+        with self._lock:
+            cached = self._store.get(key)
+            if cached is not None:
+                self._store.move_to_end(key)
+            return cached
+
+    def put(self, key: tuple, value: tuple) -> None:
+        size = len(value[2]) if value[0] == "mem" else 0
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None and old[0] == "mem":
+                self._bytes -= len(old[2])
+            self._store[key] = value
+            self._bytes += size
+            while self._store and (self._bytes > self._max_bytes
+                                   or len(self._store) > self._max_entries):
+                _, evicted = self._store.popitem(last=False)
+                if evicted[0] == "mem":
+                    self._bytes -= len(evicted[2])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._store)
+
+
+_conversion_cache = _ConversionCache()
+
+
+def serve_local(payload: dict, stream: bool = False):
     """Validate, read, and (if needed) convert a local subtitle to SRT.
 
-    Returns (bytes, "application/x-subrip"). Empty bytes is a valid
-    response: it's the plugin signal for "broken sub, blocklist".
+    Returns (bytes, "application/x-subrip"), or (SubtitleBody, ...) when
+    `stream` is true. Empty bytes is a valid response: it's the plugin
+    signal for "broken sub, blocklist".
 
     Path-safety: the file must still live inside one of the
     `allowed_roots` recorded at mint time. Older payloads (pre-migration)
     only have `media_dir` — fall back to that single root.
+
+    Served forms are cached by (path, fmt, mtime, size): a clean UTF-8 SRT
+    is streamed from disk in chunks and never held in memory whole; other
+    inputs are decoded/converted once and replayed from the cache.
     """
     path = payload.get("path") or ""
     media_dir = payload.get("media_dir") or ""
@@ -422,18 +557,35 @@ def serve_local(payload: dict) -> tuple[bytes, str]:
         raise FileNotFoundError("subtitle missing on disk")
 
     try:
-        size = os.path.getsize(real)
+        st = os.stat(real)
     except OSError:
         raise FileNotFoundError("subtitle stat failed")
-    if size > _MAX_SUB_BYTES:
-        raise FileNotFoundError(f"subtitle file too large ({size} bytes)")
-
-    with open(real, "rb") as f:
-        raw = f.read()
+    if st.st_size > _MAX_SUB_BYTES:
+        raise FileNotFoundError(f"subtitle file too large ({st.st_size} bytes)")
+
+    key = (real, fmt, st.st_mtime_ns, st.st_size)
+    cached = _conversion_cache.get(key)
+    if cached is None:
+        etag = _scan_clean_utf8(real) if fmt == "srt" else None
+        if etag is not None:
+            cached = ("disk", etag, st.st_size)
+        else:
+            with open(real, "rb") as f:
+                raw = f.read()
+            out = _normalize_srt(raw) if fmt == "srt" else _convert_to_srt(raw, fmt)
+            cached = ("mem", hashlib.sha1(out).hexdigest(), out)
+        _conversion_cache.put(key, cached)
 
-    if fmt == "srt":
-        return _normalize_srt(raw), "application/x-subrip"
-    return _convert_to_srt(raw, fmt), "application/x-subrip"
+    if cached[0] == "disk":
+        try:
+            body = SubtitleBody(cached[1], cached[2], fh=open(real, "rb"))
+        except OSError:
+            raise FileNotFoundError("subtitle missing on disk")
+    else:
+        body = SubtitleBody(cached[1], len(cached[2]), data=cached[2])
+    if stream:
+        return body, "application/x-subrip"
+    return body.read(), "application/x-subrip"
 
 
 def _fetch_media_row(media_type: str, media_id: int):
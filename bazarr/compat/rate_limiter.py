@@ -1,69 +1,198 @@
-"""Per-key sliding-window counter for /download quota enforcement.
-
-Window is fixed-interval (not true rolling), so within a window a caller
-can consume up to `limit` downloads; at window boundary the count resets.
-In-memory only, single-node. Keyed by JWT jti for the compat flow.
-
-Stale entries are only pruned lazily: a jti that consumes once and never
-returns leaves its (window_start, count) tuple behind until the same jti
-calls again. At default config the map grows by at most one entry per
-logged-in JWT per day, so single-node memory usage is bounded well below
-concern even over weeks of churn. If that assumption changes (multi-node,
-or an abusive client rotating JWTs), add periodic pruning here."""
+"""Per-key token-bucket limiter for /download quota enforcement.
+
+Each key owns a bucket holding up to `limit` tokens that refills smoothly at
+`limit / window_seconds` tokens per second, so a caller that drains its quota
+gets tokens back continuously instead of all at once at a fixed window
+boundary (no 2x burst across the boundary). In-memory only, single-node.
+Keyed by JWT jti for the compat flow.
+
+Buckets are spread over `_SHARDS` independently locked shards so concurrent
+Waitress workers consuming for different keys rarely contend on the same
+lock. A bucket that has refilled to capacity is indistinguishable from a
+missing one, so a daemon sweeper drops those every `_SWEEP_INTERVAL` seconds;
+memory stays bounded by the keys active within roughly one window even when
+clients rotate JWTs. `stats()` exposes active keys, rejections and evictions
+for the compat admin stats endpoint."""
 from __future__ import annotations
+import logging
+import math
 import time
-from threading import Lock
+from threading import Lock, Thread
+
+logger = logging.getLogger("bazarr.compat.rate_limiter")
+
+_SHARDS = 16
+_SWEEP_INTERVAL = 300
+
+
+class _Bucket:
+    __slots__ = ("tokens", "capacity", "rate", "updated")
+
+    def __init__(self, capacity: int, rate: float, now: float) -> None:
+        self.tokens = float(capacity)
+        self.capacity = capacity
+        self.rate = rate
+        self.updated = now
+
+    def refill(self, capacity: int, rate: float, now: float) -> None:
+        # A config change between calls takes effect immediately: clamp to the
+        # new capacity and refill at the new rate from here on.
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(float(capacity), self.tokens + elapsed * self.rate)
+        self.capacity = capacity
+        self.rate = rate
+        self.updated = now
+
+    def is_full_at(self, now: float) -> bool:
+        return self.tokens + max(0.0, now - self.updated) * self.rate >= self.capacity
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.buckets: dict[str, _Bucket] = {}
+
+
+_shards = [_Shard() for _ in range(_SHARDS)]
+_counters_lock = Lock()
+_rejected_total = 0
+_evicted_total = 0
 
-_lock = Lock()
-# key -> (window_start_epoch, count)
-_counts: dict[str, tuple[int, int]] = {}
+_sweeper_lock = Lock()
+_sweeper: Thread | None = None
 
 
-def _window_key(now: int, window_seconds: int) -> int:
-    return (now // window_seconds) * window_seconds
+def _shard_for(key: str) -> _Shard:
+    return _shards[hash(key) % _SHARDS]
+
+
+def _rate(limit: int, window_seconds: int) -> float:
+    return float(limit) / float(max(1, int(window_seconds)))
+
+
+def _seconds_until(tokens: float, target: float, rate: float) -> int:
+    if rate <= 0:
+        return 0
+    return max(1, math.ceil((target - tokens) / rate))
 
 
 def try_consume(key: str, limit: int, window_seconds: int) -> tuple[bool, int, int]:
-    """Consume one unit against the caller's quota.
+    """Consume one token from the caller's bucket.
 
     Returns (allowed, remaining_after, reset_epoch). When allowed=False,
-    remaining_after is 0 and the caller should emit 406. reset_epoch is
-    always the end of the current window so the UI can display a useful
-    retry-after.
+    remaining_after is 0 and the caller should emit 406; reset_epoch is then
+    the moment the next token becomes available, i.e. a useful retry-after.
+    When allowed, reset_epoch is the moment the bucket is full again.
     """
+    global _rejected_total
     if not key:
         return True, limit, int(time.time()) + int(window_seconds)
-    now = int(time.time())
-    win = _window_key(now, window_seconds)
-    reset = win + window_seconds
-    with _lock:
-        entry = _counts.get(key)
-        if entry is None or entry[0] != win:
-            _counts[key] = (win, 1)
-            return True, max(0, limit - 1), reset
-        start, count = entry
-        if count >= limit:
-            return False, 0, reset
-        _counts[key] = (start, count + 1)
-        return True, max(0, limit - (count + 1)), reset
+    _ensure_sweeper()
+    now = time.time()
+    rate = _rate(limit, window_seconds)
+    shard = _shard_for(key)
+    with shard.lock:
+        bucket = shard.buckets.get(key)
+        if bucket is None:
+            bucket = shard.buckets[key] = _Bucket(limit, rate, now)
+        else:
+            bucket.refill(limit, rate, now)
+        if bucket.tokens < 1.0:
+            reset = int(now) + _seconds_until(bucket.tokens, 1.0, rate)
+            allowed = False
+        else:
+            bucket.tokens -= 1.0
+            reset = int(now) + _seconds_until(bucket.tokens, float(limit), rate)
+            remaining = max(0, int(bucket.tokens))
+            allowed = True
+    if not allowed:
+        with _counters_lock:
+            _rejected_total += 1
+        return False, 0, reset
+    return True, remaining, reset
 
 
 def inspect(key: str, limit: int, window_seconds: int) -> tuple[int, int]:
     """Return (remaining, reset_epoch) without consuming."""
-    now = int(time.time())
-    win = _window_key(now, window_seconds)
-    reset = win + window_seconds
+    now = time.time()
     if not key:
-        return limit, reset
-    with _lock:
-        entry = _counts.get(key)
-        if entry is None or entry[0] != win:
-            return limit, reset
-        _, count = entry
-        return max(0, limit - count), reset
+        return limit, int(now) + int(window_seconds)
+    rate = _rate(limit, window_seconds)
+    shard = _shard_for(key)
+    with shard.lock:
+        bucket = shard.buckets.get(key)
+        if bucket is None:
+            return limit, int(now) + int(window_seconds)
+        elapsed = max(0.0, now - bucket.updated)
+        tokens = min(float(limit), bucket.tokens + elapsed * bucket.rate)
+    return max(0, int(tokens)), int(now) + _seconds_until(tokens, float(limit), rate)
+
+
+def prune() -> int:
+    """Drop every bucket that has refilled to capacity. Returns the count.
+
+    Holds one shard lock at a time, so consumers on other shards are never
+    blocked by a sweep."""
+    global _evicted_total
+    now = time.time()
+    evicted = 0
+    for shard in _shards:
+        with shard.lock:
+            idle = [k for k, b in shard.buckets.items() if b.is_full_at(now)]
+            for k in idle:
+                del shard.buckets[k]
+        evicted += len(idle)
+    if evicted:
+        with _counters_lock:
+            _evicted_total += evicted
+    return evicted
+
+
+def _sweep_forever() -> None:
+    while True:
+        time.sleep(_SWEEP_INTERVAL)
+        try:
+            evicted = prune()
+            if evicted:
+                logger.debug("compat rate limiter: evicted %d idle bucket(s)", evicted)
+        except Exception:
+            logger.exception("compat rate limiter: sweep failed")
+
+
+def _ensure_sweeper() -> None:
+    """Lazily start the daemon sweeper on first real consume."""
+    global _sweeper
+    if _sweeper is not None:
+        return
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = Thread(target=_sweep_forever,
+                              name="compat-ratelimit-sweeper", daemon=True)
+            _sweeper.start()
+
+
+def stats() -> dict:
+    """Snapshot for the compat admin stats endpoint and tests."""
+    active = 0
+    for shard in _shards:
+        with shard.lock:
+            active += len(shard.buckets)
+    with _counters_lock:
+        return {
+            "active_keys": active,
+            "rejected_total": _rejected_total,
+            "evicted_total": _evicted_total,
+        }
 
 
 def reset() -> None:
     """Test helper."""
-    with _lock:
-        _counts.clear()
+    global _rejected_total, _evicted_total
+    for shard in _shards:
+        with shard.lock:
+            shard.buckets.clear()
+    with _counters_lock:
+        _rejected_total = 0
+        _evicted_total = 0
@@ -438,11 +438,14 @@ def download_stream(stream_token):
     missing, return 200 + empty body, not 404. The plugin uses this
     signal to blocklist the file_id and skip it on future scans. A 404
     is treated as transient and retried forever.
+
+    The body is streamed in chunks with ETag / Content-Length set up front;
+    a matching If-None-Match gets a 304 without reading the file.
     """
     import logging
     _log = logging.getLogger("bazarr.compat.routes")
     try:
-        blob, ctype = service.serve_subtitle_content(stream_token)
+        body, ctype = service.serve_subtitle_content(stream_token, stream=True)
     except UnsafeURLError:
         return compat_error("provider URL blocked by SSRF guard", 403, "auth")
     except ValueError:
@@ -452,7 +455,17 @@ def download_stream(stream_token):
     except Exception as e:
         _log.exception("compat stream: unexpected: %s", e)
         return compat_error("provider fetch failed", 503, "upstream")
-    return Response(blob, mimetype=ctype)
+    if isinstance(body, (bytes, bytearray)):
+        return Response(body, mimetype=ctype)
+    if request.if_none_match.contains(body.etag):
+        body.close()
+        resp = Response(status=304)
+        resp.set_etag(body.etag)
+        return resp
+    resp = Response(body, mimetype=ctype, direct_passthrough=True)
+    resp.set_etag(body.etag)
+    resp.content_length = body.length
+    return resp
 
 
 @compat_bp.route("/infos/user", methods=["GET"])
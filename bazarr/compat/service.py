@@ -2,6 +2,7 @@ from __future__ import annotations
 import logging
 import os
 import re
+from concurrent.futures import TimeoutError as FutureTimeout
 from threading import Lock
 from typing import Iterable
 from urllib.parse import quote
@@ -633,6 +634,14 @@ _SKIP_FOR_VIRTUAL_VIDEO = frozenset({"embeddedsubtitles"})
 LOCAL_PROVIDER = "local"
 
 
+def _wall_timeout(timeout_seconds=None) -> int:
+    """Per-request / per-key timeout override (req #2), clamped to the same
+    [5, 120] bounds the search_timeout_seconds validator enforces."""
+    if timeout_seconds:
+        return max(5, min(120, int(timeout_seconds)))
+    return int(settings.compat_endpoint.search_timeout_seconds)
+
+
 def _do_fanout(imdb_id, season, episode, languages, media_type,
                query=None, moviehash=None, moviebytesize=None,
                series_anidb_id=None, series_anidb_episode_id=None,
@@ -688,19 +697,24 @@ def _do_fanout(imdb_id, season, episode, languages, media_type,
         stats[name] = (outcome, latency_ms)
         health.record(name, outcome, latency_ms)
 
-    # Per-request / per-key timeout override (req #2), clamped to the same
-    # [5, 120] bounds the search_timeout_seconds validator enforces.
-    if timeout_seconds:
-        wall = max(5, min(120, int(timeout_seconds)))
-    else:
-        wall = int(settings.compat_endpoint.search_timeout_seconds)
+    wall = _wall_timeout(timeout_seconds)
     per_provider = max(3, int(wall * 0.6))
+    # Latency-aware budget: providers whose median latency alone exceeds the
+    # wall are skipped (they would mostly be abandoned, pinning a shared
+    # executor worker), and the rest get a deadline sized from their p95 so
+    # the fanout can return before the wall once only stragglers are left.
+    deadlines, too_slow = health.plan_fanout(
+        [p for p in pool.providers if p not in exclude], wall)
+    if too_slow:
+        logger.info("compat fanout: latency_skipped=%s (p50 > wall=%ds)",
+                    sorted(too_slow), wall)
     results = list_all_subtitles_parallel(
         [video], set(languages), pool,
         per_provider_timeout=per_provider,
         wall_timeout=wall,
-        exclude_providers=exclude,
+        exclude_providers=exclude | too_slow,
         on_result=_on_result,
+        provider_deadlines=deadlines,
     )
 
     if stats:
@@ -865,20 +879,50 @@ def search(imdb_id: str, season, episode, languages: Iterable[Language],
     cache_ttl = int(settings.compat_endpoint.cache_ttl_seconds)
     fid_ttl = int(settings.compat_endpoint.file_id_ttl_seconds)
     ttl = min(cache_ttl, fid_ttl)
-    return C.compat_region.get_or_create(
-        key,
-        creator=lambda: _do_fanout(imdb_id, season, episode, languages,
-                                    media_type, query=query, moviehash=moviehash,
-                                    moviebytesize=moviebytesize,
-                                    series_anidb_id=series_anidb_id,
-                                    series_anidb_episode_id=series_anidb_episode_id,
-                                    moviehash_match=moviehash_match,
-                                    requested_languages=requested_languages,
-                                    exclude_providers=exclude_providers,
-                                    timeout_seconds=timeout_seconds,
-                                    only_providers=only_providers),
-        expiration_time=ttl,
-    )
+    # Stale-while-revalidate: serve an expired envelope immediately and
+    # refresh it in the background, but stop early enough that the file_ids
+    # minted into a stale envelope still verify for a whole download (the
+    # stream token's lifetime) after it was served.
+    if bool(settings.compat_endpoint.stale_while_revalidate):
+        max_stale = max(0, min(int(settings.compat_endpoint.cache_max_stale_seconds),
+                               fid_ttl - ttl - int(settings.compat_endpoint.stream_token_ttl_seconds)))
+    else:
+        max_stale = 0
+
+    def _lookup():
+        return C.get_or_create(
+            key,
+            creator=lambda: _do_fanout(imdb_id, season, episode, languages,
+                                        media_type, query=query, moviehash=moviehash,
+                                        moviebytesize=moviebytesize,
+                                        series_anidb_id=series_anidb_id,
+                                        series_anidb_episode_id=series_anidb_episode_id,
+                                        moviehash_match=moviehash_match,
+                                        requested_languages=requested_languages,
+                                        exclude_providers=exclude_providers,
+                                        timeout_seconds=timeout_seconds,
+                                        only_providers=only_providers),
+            expiration_time=ttl,
+            max_stale=max_stale,
+        )
+
+    # A fresh hit is the common case and needs no coordination.
+    cached = C.get_fresh(key, ttl)
+    if cached is not None:
+        return cached
+
+    # Single-flight on the cache key: when several players start the same
+    # episode at once, only the first request runs the fanout (and takes a
+    # slot of the fanout concurrency cap); the rest wait for its envelope,
+    # each for at most its own wall timeout. A follower that runs out of time
+    # gets an empty envelope, the same degradation as a dropped fanout.
+    wall = _wall_timeout(timeout_seconds)
+    try:
+        return C.coalesce(key, _lookup, timeout=wall)
+    except FutureTimeout:
+        logger.warning("compat search: in-flight fanout for %s still running after "
+                       "%ds, returning empty result", imdb_id, wall)
+        return M.search_envelope([], per_page=50, page=1)
 
 
 def download(file_id, base_host: str = "",
@@ -965,9 +1009,13 @@ def _fetch_subtitle_bytes(sub) -> bytes:
     return content
 
 
-def serve_subtitle_content(stream_token: str) -> tuple[bytes, str]:
+def serve_subtitle_content(stream_token: str, stream: bool = False):
     """Validate the stream token and return the subtitle bytes + content-type.
 
+    With `stream=True` the body is a local_subs.SubtitleBody instead of
+    bytes: local files are then streamed from disk / the conversion cache
+    with their ETag and Content-Length precomputed.
+
     Raises:
         ValueError: stream token invalid or expired
         FileNotFoundError: subtitle not found
@@ -988,12 +1036,18 @@ def serve_subtitle_content(stream_token: str) -> tuple[bytes, str]:
     # provider fanout pool.
     if fpayload.get("kind") == "local":
         from .local_subs import serve_local
-        return serve_local(fpayload)
+        return serve_local(fpayload, stream=stream)
 
     sub = fpayload.get("sub")
     # Surface the guard symbol so tests can patch it.
     _ = assert_safe_outbound
     blob = _fetch_subtitle_bytes(sub)
+    if stream:
+        # Providers hand back the whole payload in sub.content, so there is
+        # nothing to stream from; still chunk it so the response path is
+        # uniform.
+        from .local_subs import SubtitleBody
+        return SubtitleBody.from_bytes(blob), "application/x-subrip"
     return blob, "application/x-subrip"
 
 
@@ -8,7 +8,8 @@ from datetime import datetime
 from functools import reduce
 
 from app.config import settings
-from app.database import TableMovies, TableLanguagesProfiles, database, insert, update, delete, select, get_exclusion_clause
+from app.database import (TableMovies, TableLanguagesProfiles, database, insert, update, delete, select,
+                          get_exclusion_clause, index_tags)
 from app.event_handler import event_stream
 from app.jobs_queue import jobs_queue
 from app.notifier import send_notifications_movie
@@ -18,6 +19,7 @@ from subtitles.indexer.movies import store_subtitles_movie
 from subtitles.mass_download import movies_download_subtitles  # noqa: F401
 from utilities.path_mappings import path_mappings
 from subtitles.adaptive_searching import is_search_active
+from arr_instances.delta_sync import fetch_changed, plan_sync, record_sync
 from arr_instances.resolution import client_for_instance, default_instance_id, scoped, stamp_owner
 
 from sqlalchemy.exc import IntegrityError
@@ -48,6 +50,12 @@ def get_movie_file_size_from_db(movie_path):
     return bazarr_file_size
 
 
+def _index_movie_tags(radarr_id, arr_instance_id=None):
+    index_tags(database, TableMovies,
+               scoped(select(TableMovies.id).where(TableMovies.radarrId == radarr_id),
+                      TableMovies.arr_instance_id, arr_instance_id))
+
+
 # Update movies in DB
 def update_movie(updated_movie, arr_instance_id=None):
     try:
@@ -69,6 +77,7 @@ def update_movie(updated_movie, arr_instance_id=None):
     except IntegrityError as e:
         logging.error(f"BAZARR cannot update movie {updated_movie['path']} because of {e}")  # noqa: G004
     else:
+        _index_movie_tags(updated_movie['radarrId'], arr_instance_id)
         if (previous_movie_file_id != updated_movie['movie_file_id'] or
                 previous_movie_path != updated_movie['path']):
             # Store subtitles for updated movie where path or movie_file_id changed
@@ -103,13 +112,18 @@ def add_movie(added_movie):
     except IntegrityError as e:
         logging.error(f"BAZARR cannot insert movie {added_movie['path']} because of {e}")  # noqa: G004
     else:
+        _index_movie_tags(added_movie['radarrId'], added_movie.get('arr_instance_id'))
         store_subtitles_movie(added_movie['path'], path_mappings.path_replace_movie(added_movie['path']))
         event_stream(type='movie', action='update', payload=int(added_movie['radarrId']))
 
 
-def update_movies(job_id=None, wait_for_completion=False, arr_instance_id=None, arr_client=None):
+def update_movies(job_id=None, wait_for_completion=False, arr_instance_id=None, arr_client=None,
+                  radarr_ids=None):
     # arr_instance_id/arr_client thread an instance identity through the sync;
     # both None = today's exact default-instance path (byte-identical).
+    # radarr_ids (delta sync, instance-scoped only) limits the sync to those
+    # movies: only they are fetched, updated or removed. Returns True once the
+    # movies were synced.
     if not job_id:
         jobs_queue.add_job_from_function("Syncing movies with Radarr", is_progress=True,
                                          wait_for_completion=wait_for_completion)
@@ -150,7 +164,14 @@ def update_movies(job_id=None, wait_for_completion=False, arr_instance_id=None,
             else default_instance_id(database, 'radarr')
 
         # Get movies data from radarr
-        movies = get_movies_from_radarr_api(apikey_radarr=apikey_radarr, arr_client=arr_client)
+        if radarr_ids is None:
+            movies = get_movies_from_radarr_api(apikey_radarr=apikey_radarr, arr_client=arr_client)
+        else:
+            try:
+                movies = fetch_changed(arr_client, 'movie', radarr_ids)
+            except Exception:
+                logging.exception('BAZARR Error trying to get changed movies from Radarr.')
+                return
         if not isinstance(movies, list):
             return
         else:
@@ -175,6 +196,7 @@ def update_movies(job_id=None, wait_for_completion=False, arr_instance_id=None,
             # 22 columns. If movieParser starts emitting a new key for
             # action='update', add it to BOTH lists. A mismatch silently
             # corrupts the equality check or raises AttributeError.
+            changed_movies = [TableMovies.radarrId.in_(radarr_ids)] if radarr_ids is not None else []
             current_movies_in_db_dict = {
                 row.radarrId: {
                     'radarrId': row.radarrId,
@@ -222,7 +244,8 @@ def update_movies(job_id=None, wait_for_completion=False, arr_instance_id=None,
                                   TableMovies.movie_file_id,
                                   TableMovies.tags,
                                   TableMovies.file_size,
-                                  TableMovies.profileId),
+                                  TableMovies.profileId)
+                           .where(*changed_movies),
                            TableMovies.arr_instance_id, arr_instance_id)).all()
             }
             current_movies_id_db = list(current_movies_in_db_dict.keys())
@@ -312,9 +335,10 @@ def update_movies(job_id=None, wait_for_completion=False, arr_instance_id=None,
 
             logging.debug('BAZARR All movies synced from Radarr into database.')
     jobs_queue.update_job_name(job_id=job_id, new_job_name="Synced movies with Radarr")
+    return True
 
 
-def update_movies_for_instance(arr_instance_id, job_id=None, wait_for_completion=False):
+def update_movies_for_instance(arr_instance_id, job_id=None, wait_for_completion=False, force_full=False):
     """Bulk-sync one Radarr instance (scheduler fan-out entry).
 
     Mirrors update_movies's enqueue-then-run so only the int arr_instance_id
@@ -329,7 +353,19 @@ def update_movies_for_instance(arr_instance_id, job_id=None, wait_for_completion
     if arr_client is None:
         logging.warning('BAZARR skipping Radarr sync for unknown/disabled instance %s', arr_instance_id)
         return
-    update_movies(job_id=job_id, arr_instance_id=arr_instance_id, arr_client=arr_client)
+    # Between full reconciliations only the movies with Radarr history since
+    # the instance's cursor are synced.
+    plan = plan_sync(database, arr_instance_id, arr_client, enabled=settings.radarr.delta_sync,
+                     full_sync_hours=settings.radarr.full_sync_hours, force_full=force_full)
+    if not plan.full and not plan.item_ids:
+        logging.debug('BAZARR no Radarr changes since the last sync of instance %s', arr_instance_id)
+        jobs_queue.update_job_name(job_id=job_id, new_job_name="Synced movies with Radarr")
+        synced = True
+    else:
+        synced = update_movies(job_id=job_id, arr_instance_id=arr_instance_id, arr_client=arr_client,
+                               radarr_ids=plan.item_ids)
+    if synced:
+        record_sync(database, arr_instance_id, plan)
 
 
 def update_one_movie_for_instance(arr_instance_id, movie_id, action, **kwargs):
@@ -441,6 +477,7 @@ def update_one_movie(movie_id, action, defer_search=False, is_signalr=False,
             logging.error(f"BAZARR cannot update movie {path_mappings.path_replace_movie(movie['path'])} because "  # noqa: G004
                           f"of {e}")
         else:
+            _index_movie_tags(movie['radarrId'], arr_instance_id)
             store_subtitles_movie(movie['path'], path_mappings.path_replace_movie(movie['path']))
             event_stream(type='movie', action='update', payload=int(movie_id))
             logging.debug(
@@ -458,6 +495,7 @@ def update_one_movie(movie_id, action, defer_search=False, is_signalr=False,
             logging.error(f"BAZARR cannot insert movie {path_mappings.path_replace_movie(movie['path'])} because "  # noqa: G004
                           f"of {e}")
         else:
+            _index_movie_tags(movie['radarrId'], movie.get('arr_instance_id'))
             store_subtitles_movie(movie['path'], path_mappings.path_replace_movie(movie['path']))
             event_stream(type='movie', action='update', payload=int(movie_id))
             logging.debug(
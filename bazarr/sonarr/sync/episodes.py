@@ -5,6 +5,7 @@ import logging
 import operator
 import semver
 
+from sqlalchemy import bindparam
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from functools import reduce
@@ -13,7 +14,7 @@ from constants import MINIMUM_VIDEO_SIZE
 from app.database import database, TableShows, TableEpisodes, delete, update, insert, select, get_exclusion_clause
 from app.config import settings
 from utilities.path_mappings import path_mappings
-from subtitles.indexer.series import store_subtitles, series_full_scan_subtitles  # noqa: F401
+from subtitles.indexer.series import list_missing_subtitles, store_subtitles, series_full_scan_subtitles  # noqa: F401
 from subtitles.mass_download import episode_download_subtitles  # noqa: F401
 from app.event_handler import event_stream
 from sonarr.info import get_sonarr_info
@@ -62,6 +63,41 @@ def check_actual_file_size(original_episode_path):
     return bazarr_file_size > MINIMUM_VIDEO_SIZE
 
 
+def _update_episodes(episodes_to_update, arr_instance_id=None):
+    """Write changed episode rows, one executemany UPDATE per set of columns.
+
+    Returns the episodes that were written. When a batch hits an
+    IntegrityError its rows are retried one by one so a single conflicting
+    row doesn't hold back the others.
+    """
+    table = TableEpisodes.__table__
+    batches = {}
+    for episode in episodes_to_update:
+        batches.setdefault(tuple(sorted(episode)), []).append(episode)
+
+    updated = []
+    for episodes in batches.values():
+        stmt = scoped(update(table).where(table.c.sonarrEpisodeId == bindparam('b_sonarrEpisodeId')),
+                      table.c.arr_instance_id, arr_instance_id)
+        params = [dict(episode, b_sonarrEpisodeId=episode['sonarrEpisodeId']) for episode in episodes]
+        try:
+            with database.begin_nested():
+                database.execute(stmt, params)
+        except IntegrityError as batch_err:
+            logging.debug('BAZARR batched episode update failed (%s); falling back to per-row update', batch_err)
+            for episode, episode_params in zip(episodes, params):
+                try:
+                    with database.begin_nested():
+                        database.execute(stmt, episode_params)
+                except IntegrityError as e:
+                    logging.error(f"BAZARR cannot update episodes because of {e}")  # noqa: G004
+                else:
+                    updated.append(episode)
+        else:
+            updated.extend(episodes)
+    return updated
+
+
 def sync_episodes(series_id, defer_search=False, is_signalr=False, episodes_data=None,
                   arr_instance_id=None, arr_client=None):
     """Sync one series' episodes between Sonarr and the local DB.
@@ -217,93 +253,107 @@ def sync_episodes(series_id, defer_search=False, is_signalr=False, episodes_data
     if arr_instance_id is not None:
         owner_instance_id = arr_instance_id
 
-    if len(episodes_to_delete):
-        try:
-            database.execute(scoped(delete(TableEpisodes).where(TableEpisodes.sonarrEpisodeId.in_(episodes_to_delete)),
-                                    TableEpisodes.arr_instance_id, arr_instance_id))
-        except IntegrityError as e:
-            logging.error(f"BAZARR cannot delete episodes because of {e}")  # noqa: G004
-        else:
-            # Per-row episode delete events used to fire one socketio
-            # packet per row here (5000 packets for an initial sync of a
-            # 5000-episode library). The frontend only needs to know that
-            # episodes for this series changed; we coalesce all per-row
-            # episode events into a single series.update emit at the end.
-            rows_changed = True
-
-    # Insert new episodes in DB. Batch inserts in fixed-size chunks to
-    # stay under bind-parameter limits (SQLite builds with the legacy
-    # 999-variable limit fail at ~52 rows since each episode row binds
-    # ~19 values, and the IntegrityError catch wouldn't recover from
-    # the resulting OperationalError). On IntegrityError fall back to
-    # per-row inserts for that chunk only - preserving the existing
-    # convert-to-update recovery for individual conflicting rows.
-    if len(episodes_to_add):
-        insertion_timestamp = datetime.now()
-        for added_episode in episodes_to_add:
-            added_episode['created_at_timestamp'] = insertion_timestamp
-            stamp_owner(added_episode, owner_instance_id)
-            if parent_local_id is not None:
-                added_episode['series_id'] = parent_local_id
-
-        for chunk_start in range(0, len(episodes_to_add), EPISODE_INSERT_CHUNK_SIZE):
-            chunk = episodes_to_add[chunk_start:chunk_start + EPISODE_INSERT_CHUNK_SIZE]
+    # All writes for the series share one transaction (a SAVEPOINT, as the
+    # engine runs in AUTOCOMMIT): a full-season sync used to commit every
+    # changed row on its own. Subtitle indexing is deferred until the writes
+    # are done so the transaction stays short.
+    paths_to_index = {}
+    with database.begin_nested():
+        if len(episodes_to_delete):
             try:
-                database.execute(insert(TableEpisodes).values(chunk))
-            except IntegrityError as batch_err:
-                logging.debug('BAZARR batched episode insert failed (%s); '
-                              'falling back to per-row insert with update recovery', batch_err)
-                for added_episode in chunk:
-                    try:
-                        database.execute(insert(TableEpisodes).values(added_episode))
-                    except IntegrityError as e:
-                        logging.error(f"BAZARR cannot insert episodes because of {e}. We'll try to update it instead.")  # noqa: G004
-                        del added_episode['created_at_timestamp']
-                        episodes_to_update.append(added_episode)
-                    else:
-                        store_subtitles(added_episode['path'], path_mappings.path_replace(added_episode['path']))
-                        rows_changed = True
+                with database.begin_nested():
+                    database.execute(scoped(delete(TableEpisodes)
+                                            .where(TableEpisodes.sonarrEpisodeId.in_(episodes_to_delete)),
+                                            TableEpisodes.arr_instance_id, arr_instance_id))
+            except IntegrityError as e:
+                logging.error(f"BAZARR cannot delete episodes because of {e}")  # noqa: G004
             else:
-                for added_episode in chunk:
-                    store_subtitles(added_episode['path'], path_mappings.path_replace(added_episode['path']))
-                    rows_changed = True
+                # Per-row episode delete events used to fire one socketio
+                # packet per row here (5000 packets for an initial sync of a
+                # 5000-episode library). The frontend only needs to know that
+                # episodes for this series changed; we coalesce all per-row
+                # episode events into a single series.update emit at the end.
+                rows_changed = True
 
-    # Update existing episodes in DB
-    if len(episodes_to_update):
-        for updated_episode in episodes_to_update:
-            previous_episode_id = updated_episode['sonarrEpisodeId']
-            # Read previous values from the cache built up at the top of
-            # this function instead of re-querying. Pre-refactor this
-            # loop ran an extra SELECT per updated episode just to read
-            # episode_file_id + path - both are already in the dict.
-            cached_previous = current_episodes_in_db_row_as_dict.get(previous_episode_id, {})
-            previous_episode_file_id = cached_previous.get('episode_file_id')
-            previous_episode_path = cached_previous.get('path')
+        # Insert new episodes in DB. Batch inserts in fixed-size chunks to
+        # stay under bind-parameter limits (SQLite builds with the legacy
+        # 999-variable limit fail at ~52 rows since each episode row binds
+        # ~19 values, and the IntegrityError catch wouldn't recover from
+        # the resulting OperationalError). On IntegrityError fall back to
+        # per-row inserts for that chunk only - preserving the existing
+        # convert-to-update recovery for individual conflicting rows.
+        if len(episodes_to_add):
+            insertion_timestamp = datetime.now()
+            for added_episode in episodes_to_add:
+                added_episode['created_at_timestamp'] = insertion_timestamp
+                stamp_owner(added_episode, owner_instance_id)
+                if parent_local_id is not None:
+                    added_episode['series_id'] = parent_local_id
+
+            for chunk_start in range(0, len(episodes_to_add), EPISODE_INSERT_CHUNK_SIZE):
+                chunk = episodes_to_add[chunk_start:chunk_start + EPISODE_INSERT_CHUNK_SIZE]
+                try:
+                    with database.begin_nested():
+                        database.execute(insert(TableEpisodes).values(chunk))
+                except IntegrityError as batch_err:
+                    logging.debug('BAZARR batched episode insert failed (%s); '
+                                  'falling back to per-row insert with update recovery', batch_err)
+                    for added_episode in chunk:
+                        try:
+                            with database.begin_nested():
+                                database.execute(insert(TableEpisodes).values(added_episode))
+                        except IntegrityError as e:
+                            logging.error(f"BAZARR cannot insert episodes because of {e}. We'll try to update it instead.")  # noqa: G004
+                            del added_episode['created_at_timestamp']
+                            episodes_to_update.append(added_episode)
+                        else:
+                            paths_to_index.setdefault(added_episode['path'], []).append(
+                                added_episode['sonarrEpisodeId'])
+                            rows_changed = True
+                else:
+                    for added_episode in chunk:
+                        paths_to_index.setdefault(added_episode['path'], []).append(
+                            added_episode['sonarrEpisodeId'])
+                        rows_changed = True
 
-            try:
-                updated_episode['updated_at_timestamp'] = datetime.now()
-                # Stamp AFTER the subset-diff above (line ~188) so the added
-                # key never forces a spurious update on the next sync.
+        # Update existing episodes in DB
+        if len(episodes_to_update):
+            update_timestamp = datetime.now()
+            for updated_episode in episodes_to_update:
+                updated_episode['updated_at_timestamp'] = update_timestamp
+                # Stamp AFTER the subset-diff above so the added key never
+                # forces a spurious update on the next sync.
                 stamp_owner(updated_episode, owner_instance_id)
                 if parent_local_id is not None:
                     updated_episode['series_id'] = parent_local_id
-                database.execute(scoped(update(TableEpisodes)
-                                        .values(updated_episode)
-                                        .where(TableEpisodes.sonarrEpisodeId == updated_episode['sonarrEpisodeId']),
-                                        TableEpisodes.arr_instance_id, arr_instance_id))
-            except IntegrityError as e:
-                logging.error(f"BAZARR cannot update episodes because of {e}")  # noqa: G004
-            else:
-                if (previous_episode_file_id != updated_episode['episode_file_id'] or
-                        previous_episode_path != updated_episode['path']):
+
+            for updated_episode in _update_episodes(episodes_to_update, arr_instance_id):
+                # Read previous values from the cache built up at the top of
+                # this function instead of re-querying.
+                cached_previous = current_episodes_in_db_row_as_dict.get(updated_episode['sonarrEpisodeId'], {})
+                if (cached_previous.get('episode_file_id') != updated_episode['episode_file_id'] or
+                        cached_previous.get('path') != updated_episode['path']):
                     # Store subtitles for updated episode where path or episode_file_id changed
                     logging.debug('BAZARR updating subtitles for episode %s', updated_episode["path"])
-                    store_subtitles(updated_episode['path'], path_mappings.path_replace(updated_episode['path']))
+                    paths_to_index.setdefault(updated_episode['path'], []).append(
+                        updated_episode['sonarrEpisodeId'])
                 else:
                     logging.debug('BAZARR skipping subtitle update for episode %s as path '
                                   'and episode_file_id unchanged', updated_episode["path"])
                 rows_changed = True
 
+    # Index subtitles once per file (multi-episode files share a path), then
+    # recompute missing subtitles in one pass over the episodes whose file
+    # was actually there to index.
+    episodes_to_recompute = []
+    for path, episode_ids in paths_to_index.items():
+        reversed_path = path_mappings.path_replace(path)
+        store_subtitles(path, reversed_path, list_missing=False)
+        if os.path.exists(reversed_path):
+            episodes_to_recompute.extend(episode_ids)
+    if episodes_to_recompute:
+        list_missing_subtitles(episodes=episodes_to_recompute, arr_instance_id=arr_instance_id)
+
     # Downloading missing subtitles
     series_data = database.execute(
         scoped(select(TableShows.title,
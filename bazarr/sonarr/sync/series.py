@@ -10,10 +10,11 @@ from datetime import datetime
 from app.config import settings
 from subtitles.indexer.series import list_missing_subtitles  # noqa: F401
 from sonarr.rootfolder import check_sonarr_rootfolder
-from app.database import TableShows, TableLanguagesProfiles, database, insert, update, delete, select
+from app.database import TableShows, TableLanguagesProfiles, database, insert, update, delete, select, index_tags
 from utilities.path_mappings import path_mappings
 from app.event_handler import event_stream
 from app.jobs_queue import jobs_queue
+from arr_instances.delta_sync import fetch_changed, plan_sync, record_sync
 from arr_instances.resolution import client_for_instance, default_instance_id, scoped, stamp_owner
 
 from .episodes import sync_episodes
@@ -55,11 +56,15 @@ def get_series_monitored_table(arr_instance_id=None):
     return series_dict
 
 
-def update_series(job_id=None, wait_for_completion=False, arr_instance_id=None, arr_client=None):
+def update_series(job_id=None, wait_for_completion=False, arr_instance_id=None, arr_client=None,
+                  series_ids=None):
     # arr_instance_id/arr_client thread an instance identity through the sync.
     # Both None = today's exact default-instance path (byte-identical): the leaf
     # fetchers fall back to the scalar settings.sonarr path, and writes stamp the
     # resolved default. A client routes HTTP through that instance instead.
+    # series_ids (delta sync, instance-scoped only) limits the sync to those
+    # series: only they are fetched, updated or removed. Returns True once the
+    # series were synced.
     if not job_id:
         jobs_queue.add_job_from_function("Syncing series with Sonarr", is_progress=True,
                                          wait_for_completion=wait_for_completion)
@@ -70,7 +75,10 @@ def update_series(job_id=None, wait_for_completion=False, arr_instance_id=None,
 
     # Get shows data from Sonarr
     try:
-        series = get_series_from_sonarr_api(apikey_sonarr=settings.sonarr.apikey, arr_client=arr_client)
+        if series_ids is None:
+            series = get_series_from_sonarr_api(apikey_sonarr=settings.sonarr.apikey, arr_client=arr_client)
+        else:
+            series = fetch_changed(arr_client, 'series', series_ids)
     except Exception as e:
         logging.exception(f"BAZARR Error trying to get series from Sonarr: {e}")  # noqa: G004
         return
@@ -88,9 +96,11 @@ def update_series(job_id=None, wait_for_completion=False, arr_instance_id=None,
 
         # Get current shows in DB (scoped to this instance when instance-synced,
         # so removed-series computation never sees another instance's shows).
-        current_shows_db = set(database.execute(
-            scoped(select(TableShows.sonarrSeriesId),
-                   TableShows.arr_instance_id, arr_instance_id)).scalars().all())
+        current_shows_stmt = scoped(select(TableShows.sonarrSeriesId),
+                                    TableShows.arr_instance_id, arr_instance_id)
+        if series_ids is not None:
+            current_shows_stmt = current_shows_stmt.where(TableShows.sonarrSeriesId.in_(series_ids))
+        current_shows_db = set(database.execute(current_shows_stmt).scalars().all())
 
         current_shows_sonarr = set()
 
@@ -196,9 +206,10 @@ def update_series(job_id=None, wait_for_completion=False, arr_instance_id=None,
     jobs_queue.update_job_name(job_id=job_id, new_job_name="Synced series with Sonarr")
 
     gc.collect()
+    return True
 
 
-def update_series_for_instance(arr_instance_id, job_id=None, wait_for_completion=False):
+def update_series_for_instance(arr_instance_id, job_id=None, wait_for_completion=False, force_full=False):
     """Bulk-sync one Sonarr instance (scheduler fan-out entry).
 
     Mirrors update_series's enqueue-then-run so only the int arr_instance_id
@@ -214,7 +225,19 @@ def update_series_for_instance(arr_instance_id, job_id=None, wait_for_completion
     if arr_client is None:
         logging.warning('BAZARR skipping Sonarr sync for unknown/disabled instance %s', arr_instance_id)
         return
-    update_series(job_id=job_id, arr_instance_id=arr_instance_id, arr_client=arr_client)
+    # Between full reconciliations only the series with Sonarr history since
+    # the instance's cursor are synced.
+    plan = plan_sync(database, arr_instance_id, arr_client, enabled=settings.sonarr.delta_sync,
+                     full_sync_hours=settings.sonarr.full_sync_hours, force_full=force_full)
+    if not plan.full and not plan.item_ids:
+        logging.debug('BAZARR no Sonarr changes since the last sync of instance %s', arr_instance_id)
+        jobs_queue.update_job_name(job_id=job_id, new_job_name="Synced series with Sonarr")
+        synced = True
+    else:
+        synced = update_series(job_id=job_id, arr_instance_id=arr_instance_id, arr_client=arr_client,
+                               series_ids=plan.item_ids)
+    if synced:
+        record_sync(database, arr_instance_id, plan)
 
 
 def update_one_series_for_instance(arr_instance_id, series_id, action, **kwargs):
@@ -228,6 +251,12 @@ def update_one_series_for_instance(arr_instance_id, series_id, action, **kwargs)
                       arr_client=arr_client, **kwargs)
 
 
+def _index_series_tags(series_id, arr_instance_id=None):
+    index_tags(database, TableShows,
+               scoped(select(TableShows.id).where(TableShows.sonarrSeriesId == series_id),
+                      TableShows.arr_instance_id, arr_instance_id))
+
+
 def update_one_series(series_id, action, is_signalr=False, series_data=None,
                       audio_profiles=None, tags_dict=None, language_profiles=None,
                       existing_in_db=None, skip_episode_sync=False,
@@ -326,6 +355,7 @@ def update_one_series(series_id, action, is_signalr=False, series_data=None,
         except IntegrityError as e:
             logging.error(f"BAZARR cannot update series {series['path']} because of {e}")  # noqa: G004
         else:
+            _index_series_tags(series['sonarrSeriesId'], arr_instance_id)
             if not is_signalr and not skip_episode_sync:
                 # Sonarr emit two SignalR events when episodes must be refreshed.
                 # The one that gets there doesn't include the episodeChanged flag.
@@ -352,6 +382,7 @@ def update_one_series(series_id, action, is_signalr=False, series_data=None,
         except IntegrityError as e:
             logging.error(f"BAZARR cannot insert series {series['path']} because of {e}")  # noqa: G004
         else:
+            _index_series_tags(series['sonarrSeriesId'], series.get('arr_instance_id'))
             if not is_signalr and not skip_episode_sync:
                 # Newly inserted series have zero episodes in the DB; the
                 # bulk update_series() loop relies on this call to
@@ -29,7 +29,7 @@ from arr_instances.resolution import scoped
 gc.enable()
 
 
-def store_subtitles(original_path, reversed_path, use_cache=True):
+def store_subtitles(original_path, reversed_path, use_cache=True, list_missing=True):
     logging.debug(f'BAZARR started subtitles indexing for this file: {reversed_path}')  # noqa: G004
     actual_subtitles = []
     # Resolve the owning instance for this file up front (#156) so every
@@ -181,8 +181,11 @@ def store_subtitles(original_path, reversed_path, use_cache=True):
                 # Scope the missing-subtitle recompute to the owning instance so
                 # an upstream id shared across instances can't recompute the
                 # wrong row (no-op for the default/single-instance path).
-                list_missing_subtitles(epno=episode.sonarrEpisodeId,
-                                       arr_instance_id=episode.arr_instance_id)
+                # Bulk callers (episode sync) recompute their whole affected
+                # set in one pass afterwards instead.
+                if list_missing:
+                    list_missing_subtitles(epno=episode.sonarrEpisodeId,
+                                           arr_instance_id=episode.arr_instance_id)
                 if embedded_languages:
                     # Pass the DB-side path (original_path), not the local
                     # filesystem path. history_log stores result.path verbatim,
@@ -264,7 +267,7 @@ def _log_embedded_history(series_id, episode_id, embedded_languages, reversed_pa
         logging.exception("BAZARR error writing embedded subtitle history for episode %s", episode_id)
 
 
-def list_missing_subtitles(no=None, epno=None, arr_instance_id=None):
+def list_missing_subtitles(no=None, epno=None, arr_instance_id=None, episodes=None):
     stmt = select(TableShows.sonarrSeriesId,
                   TableEpisodes.sonarrEpisodeId,
                   TableEpisodes.id,
@@ -281,6 +284,10 @@ def list_missing_subtitles(no=None, epno=None, arr_instance_id=None):
         episodes_subtitles = database.execute(
             scoped(stmt.where(TableEpisodes.sonarrEpisodeId == epno),
                    TableEpisodes.arr_instance_id, arr_instance_id)).all()
+    elif episodes is not None:
+        episodes_subtitles = database.execute(
+            scoped(stmt.where(TableEpisodes.sonarrEpisodeId.in_(episodes)),
+                   TableEpisodes.arr_instance_id, arr_instance_id)).all()
     elif no is not None:
         episodes_subtitles = database.execute(
             scoped(stmt.where(TableEpisodes.sonarrSeriesId == no),
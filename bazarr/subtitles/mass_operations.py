@@ -4,6 +4,8 @@ import ast
 import logging
 import os
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from app.config import settings
 from app.database import TableEpisodes, TableMovies, TableHistory, TableHistoryMovie, TableShows, database, select
 from app.jobs_queue import jobs_queue
@@ -475,6 +477,42 @@ def _process_subtitle_item(item, action, options, job_id):
     return False
 
 
+def _apply_mods_to_items(items, action, options, job_id, errors):
+    """Apply a mod action to every collected subtitle from a small thread pool.
+
+    The mod pipeline is compiled once and shared by all files, so the workers
+    mostly overlap subtitle file I/O. Files finish out of order, so progress
+    counts completions. Returns (processed, failed) and appends error
+    messages to ``errors``.
+    """
+    processed = 0
+    failed = 0
+    total_count = len(items)
+    workers = max(1, min(settings.general.concurrent_jobs, total_count))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mass-mods') as executor:
+        futures = {executor.submit(_process_subtitle_item, item, action, options, job_id): item
+                   for item in items}
+        for i, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            try:
+                if future.result():
+                    processed += 1
+                else:
+                    failed += 1
+            except Exception as e:
+                logger.error(f'Error during {action} on {item["srt_path"]}: {e}')  # noqa: G004
+                errors.append(str(e))
+                failed += 1
+            jobs_queue.update_job_progress(
+                job_id=job_id,
+                progress_value=i,
+                progress_message=f"{action}: {os.path.basename(item['srt_path'])} ({i}/{total_count})"
+            )
+
+    return processed, failed
+
+
 def _process_media_action(items, action, job_id):
     """Handle scan-disk, search-missing, and upgrade actions for series/movies.
 
@@ -570,7 +608,8 @@ def mass_batch_operation(items=None, action='sync', options=None, job_id=None):
 
     Handles sync, translate, subtitle mods, scan-disk, and search-missing
     in a unified interface. Runs as a single job with progress tracking,
-    processing items sequentially.
+    processing items sequentially, except subtitle mods which run from a
+    small thread pool.
 
     Args:
         items: List of dicts with 'type' and IDs. If None, processes entire library.
@@ -610,7 +649,7 @@ def mass_batch_operation(items=None, action='sync', options=None, job_id=None):
 
     all_items, total_skipped = _collect_subtitle_items(items, action, options)
 
-    # Process items sequentially within this single job
+    # Process items within this single job
     total_count = len(all_items)
     jobs_queue.update_job_progress(job_id=job_id, progress_max=total_count)
 
@@ -621,30 +660,33 @@ def mass_batch_operation(items=None, action='sync', options=None, job_id=None):
     failed = 0
     all_errors = []
 
-    for i, item in enumerate(all_items, start=1):
-        jobs_queue.update_job_progress(
-            job_id=job_id,
-            progress_value=i - 1,
-            progress_message=f"{action}: {os.path.basename(item['srt_path'])} ({i}/{total_count})"
-        )
-
-        try:
-            result = _process_subtitle_item(item, action, options, job_id)
-            if result:
-                processed += 1
-            else:
-                failed += 1
-        except Exception as e:
-            logger.error(f'Error during {action} on {item["srt_path"]}: {e}')  # noqa: G004
-            all_errors.append(str(e))
-            failed += 1
-        finally:
+    if action in MOD_ACTIONS:
+        processed, failed = _apply_mods_to_items(all_items, action, options, job_id, all_errors)
+    else:
+        for i, item in enumerate(all_items, start=1):
             jobs_queue.update_job_progress(
                 job_id=job_id,
-                progress_value=i,
+                progress_value=i - 1,
                 progress_message=f"{action}: {os.path.basename(item['srt_path'])} ({i}/{total_count})"
             )
 
+            try:
+                result = _process_subtitle_item(item, action, options, job_id)
+                if result:
+                    processed += 1
+                else:
+                    failed += 1
+            except Exception as e:
+                logger.error(f'Error during {action} on {item["srt_path"]}: {e}')  # noqa: G004
+                all_errors.append(str(e))
+                failed += 1
+            finally:
+                jobs_queue.update_job_progress(
+                    job_id=job_id,
+                    progress_value=i,
+                    progress_message=f"{action}: {os.path.basename(item['srt_path'])} ({i}/{total_count})"
+                )
+
     jobs_queue.update_job_name(
         job_id=job_id,
         new_job_name=f"Mass {action} complete: {processed} done, {total_skipped} skipped"
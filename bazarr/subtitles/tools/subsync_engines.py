@@ -274,9 +274,13 @@ def is_sync_engine_language_key(language):
 
 
 class SubsyncEngineRunner:
-    def __init__(self, failure_store=None, failure_threshold=FAILURE_THRESHOLD):
+    def __init__(self, failure_store=None, failure_threshold=FAILURE_THRESHOLD, max_parallel_engines=1):
         self.failure_store = failure_store or DatabaseSubsyncFailureStore(failure_threshold=failure_threshold)
         self.failure_threshold = failure_threshold
+        # Only honoured in keep-all mode, where every engine writes its own
+        # output file; overwrite mode stops at the first success and so is
+        # inherently sequential.
+        self.max_parallel_engines = max(1, int(max_parallel_engines or 1))
 
     def _existing_keep_all_output_is_current(self, srt_path, output_path, engine):
         if self.failure_store.failure_count(srt_path, engine) > 0:
@@ -290,6 +294,80 @@ class SubsyncEngineRunner:
 
         return output_stat.st_size > 0 and output_stat.st_mtime_ns >= source_stat.st_mtime_ns
 
+    def _skip_result(self, srt_path, output_mode, engine, final_engine_output_path, force_sync):
+        if self.failure_store.should_skip(srt_path, engine) and not force_sync:
+            return SyncEngineResult(
+                engine=engine,
+                status=RESULT_SKIPPED,
+                output_path=str(final_engine_output_path),
+                reason='failure_threshold',
+                message=f'{engine} skipped after {self.failure_threshold} consecutive failures.',
+            )
+
+        if output_mode == OUTPUT_MODE_KEEP_ALL and final_engine_output_path.is_file() and not force_sync:
+            if self._existing_keep_all_output_is_current(srt_path, final_engine_output_path, engine):
+                return SyncEngineResult(
+                    engine=engine,
+                    status=RESULT_SKIPPED,
+                    output_path=str(final_engine_output_path),
+                    reason='output_exists',
+                    message='Generated sync output already exists.',
+                )
+        return None
+
+    @staticmethod
+    def _execute(engine, output_path, execute_engine):
+        if output_path.is_file():
+            output_path.unlink()
+
+        raw_result = execute_engine(engine, output_path)
+        if not output_path.is_file():
+            raise RuntimeError(f'{engine} did not create a synced subtitle file.')
+        if output_path.stat().st_size == 0:
+            raise RuntimeError(f'{engine} created an empty synced subtitle file.')
+        return raw_result
+
+    def _record(self, srt_path, output_mode, engine, output_path, final_engine_output_path, raw_result=None,
+                exc=None):
+        if exc is None:
+            generated_path = str(output_path)
+            final_output_path = output_path
+            if output_mode == OUTPUT_MODE_OVERWRITE:
+                os.replace(str(output_path), srt_path)
+                final_output_path = Path(srt_path)
+                generated_path = None
+
+            self.failure_store.record_success(srt_path, engine)
+            return SyncEngineResult(
+                engine=engine,
+                status=RESULT_SUCCESS,
+                output_path=str(final_output_path),
+                generated_path=generated_path,
+                raw_result=raw_result,
+            )
+
+        if isinstance(exc, MissingSyncEngineError):
+            logging.warning('BAZARR %s sync engine skipped: %s', engine, exc)
+            return SyncEngineResult(
+                engine=engine,
+                status=RESULT_SKIPPED,
+                output_path=str(final_engine_output_path),
+                reason='missing_engine',
+                message=str(exc),
+            )
+
+        logging.error('BAZARR %s sync engine failed for %s', engine, srt_path, exc_info=exc)
+        if output_path.is_file():
+            output_path.unlink()
+        self.failure_store.record_failure(srt_path, engine, str(exc)[:500])
+        return SyncEngineResult(
+            engine=engine,
+            status=RESULT_FAILED,
+            output_path=str(final_engine_output_path),
+            reason='engine_failed',
+            message=str(exc),
+        )
+
     def run(self, srt_path, output_mode, enabled_engines, execute_engine, force_sync=False):
         output_mode = normalize_output_mode(output_mode)
         result = SyncRunResult(source_path=srt_path, output_mode=output_mode)
@@ -303,6 +381,9 @@ class SubsyncEngineRunner:
             ))
             return result
 
+        if output_mode == OUTPUT_MODE_KEEP_ALL and self.max_parallel_engines > 1:
+            return self._run_keep_all_parallel(result, srt_path, enabled_engines, execute_engine, force_sync)
+
         for engine in normalize_enabled_engines(enabled_engines):
             final_engine_output_path = engine_output_path(srt_path, engine)
             output_path = (
@@ -310,76 +391,57 @@ class SubsyncEngineRunner:
                 else temporary_engine_output_path(srt_path, engine)
             )
 
-            if self.failure_store.should_skip(srt_path, engine) and not force_sync:
-                result.results.append(SyncEngineResult(
-                    engine=engine,
-                    status=RESULT_SKIPPED,
-                    output_path=str(final_engine_output_path),
-                    reason='failure_threshold',
-                    message=f'{engine} skipped after {self.failure_threshold} consecutive failures.',
-                ))
+            skipped = self._skip_result(srt_path, output_mode, engine, final_engine_output_path, force_sync)
+            if skipped is not None:
+                result.results.append(skipped)
                 continue
 
-            if output_mode == OUTPUT_MODE_KEEP_ALL and final_engine_output_path.is_file() and not force_sync:
-                if self._existing_keep_all_output_is_current(srt_path, final_engine_output_path, engine):
-                    result.results.append(SyncEngineResult(
-                        engine=engine,
-                        status=RESULT_SKIPPED,
-                        output_path=str(final_engine_output_path),
-                        reason='output_exists',
-                        message='Generated sync output already exists.',
-                    ))
-                    continue
-
             try:
-                if output_path.is_file():
-                    output_path.unlink()
-
-                raw_result = execute_engine(engine, output_path)
-                if not output_path.is_file():
-                    raise RuntimeError(f'{engine} did not create a synced subtitle file.')
-                if output_path.stat().st_size == 0:
-                    raise RuntimeError(f'{engine} created an empty synced subtitle file.')
-
-                generated_path = str(output_path)
-                final_output_path = output_path
-                if output_mode == OUTPUT_MODE_OVERWRITE:
-                    os.replace(str(output_path), srt_path)
-                    final_output_path = Path(srt_path)
-                    generated_path = None
-
-                self.failure_store.record_success(srt_path, engine)
-                result.results.append(SyncEngineResult(
-                    engine=engine,
-                    status=RESULT_SUCCESS,
-                    output_path=str(final_output_path),
-                    generated_path=generated_path,
-                    raw_result=raw_result,
-                ))
-
-                if output_mode == OUTPUT_MODE_OVERWRITE:
-                    break
-
-            except MissingSyncEngineError as exc:
-                logging.warning('BAZARR %s sync engine skipped: %s', engine, exc)
-                result.results.append(SyncEngineResult(
-                    engine=engine,
-                    status=RESULT_SKIPPED,
-                    output_path=str(final_engine_output_path),
-                    reason='missing_engine',
-                    message=str(exc),
-                ))
+                raw_result = self._execute(engine, output_path, execute_engine)
             except Exception as exc:
-                logging.exception('BAZARR %s sync engine failed for %s', engine, srt_path)
-                if output_path.is_file():
-                    output_path.unlink()
-                self.failure_store.record_failure(srt_path, engine, str(exc)[:500])
-                result.results.append(SyncEngineResult(
-                    engine=engine,
-                    status=RESULT_FAILED,
-                    output_path=str(final_engine_output_path),
-                    reason='engine_failed',
-                    message=str(exc),
-                ))
+                result.results.append(self._record(srt_path, output_mode, engine, output_path,
+                                                   final_engine_output_path, exc=exc))
+                continue
 
+            result.results.append(self._record(srt_path, output_mode, engine, output_path,
+                                               final_engine_output_path, raw_result=raw_result))
+            if output_mode == OUTPUT_MODE_OVERWRITE:
+                break
+
+        return result
+
+    def _run_keep_all_parallel(self, result, srt_path, enabled_engines, execute_engine, force_sync):
+        """Keep-all with up to max_parallel_engines engines at once.
+
+        Skip checks and every failure-store update stay on the calling
+        thread (the store may be DB-backed); workers only run the engine.
+        Results are reported in engine order, as in the sequential path.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        pending = []
+        slots = {}
+        for engine in normalize_enabled_engines(enabled_engines):
+            output_path = engine_output_path(srt_path, engine)
+            skipped = self._skip_result(srt_path, OUTPUT_MODE_KEEP_ALL, engine, output_path, force_sync)
+            slots[engine] = skipped
+            if skipped is None:
+                pending.append((engine, output_path))
+
+        if pending:
+            workers = min(self.max_parallel_engines, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='subsync-engine') as executor:
+                futures = [(engine, output_path, executor.submit(self._execute, engine, output_path, execute_engine))
+                           for engine, output_path in pending]
+                for engine, output_path, future in futures:
+                    try:
+                        raw_result = future.result()
+                    except Exception as exc:
+                        slots[engine] = self._record(srt_path, OUTPUT_MODE_KEEP_ALL, engine, output_path,
+                                                     output_path, exc=exc)
+                    else:
+                        slots[engine] = self._record(srt_path, OUTPUT_MODE_KEEP_ALL, engine, output_path,
+                                                     output_path, raw_result=raw_result)
+
+        result.results.extend(slots.values())
         return result
@@ -0,0 +1,117 @@
+# coding=utf-8
+
+import hashlib
+import logging
+import os
+import subprocess
+import threading
+
+
+# Sample rate of the cached reference audio. autosubsync downsamples its input
+# to >= 20 kHz and alass/ffsubsync resample to their own (lower) rates, so
+# 20 kHz mono is the smallest track every engine accepts without losing
+# accuracy.
+REFERENCE_SAMPLE_RATE = 20000
+
+
+class ReferenceSignalCache:
+    """On-disk cache of the reference signal decoded from a video.
+
+    Every sync engine otherwise demuxes and decodes the whole audio track of
+    the video itself, once per engine and once per subtitle. This cache keeps
+    two artifacts per (video path, mtime, size, audio stream):
+
+    - ``audio``: the track as mono FLAC at REFERENCE_SAMPLE_RATE. alass and
+      autosubsync take it as their reference instead of the video.
+    - ``speech``: ffsubsync's VAD output as a compressed numpy array, built
+      from the cached audio by a caller-supplied function and fed back to
+      ffsubsync as an ``.npz`` reference.
+
+    Files are written to a temp name and renamed into place, so a concurrent
+    reader never sees a partial artifact. Builds are serialized per key.
+    The directory is trimmed back to ``max_bytes`` after every build, least
+    recently used first (hits refresh the file mtime).
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def _key(video_path, *parts):
+        st = os.stat(video_path)
+        raw = '|'.join(str(p) for p in (os.path.realpath(video_path), st.st_mtime_ns, st.st_size) + parts)
+        return hashlib.sha1(raw.encode('utf-8', 'surrogateescape')).hexdigest()
+
+    def _lock_for(self, name):
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _get_or_build(self, name, build):
+        path = os.path.join(self.cache_dir, name)
+        with self._lock_for(name):
+            if os.path.isfile(path):
+                os.utime(path)
+                return path
+            os.makedirs(self.cache_dir, exist_ok=True)
+            root, ext = os.path.splitext(path)
+            tmp_path = f'{root}.tmp{ext}'
+            try:
+                build(tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        self.evict(keep=path)
+        return path
+
+    def audio(self, video_path, stream, ffmpeg):
+        """Path of the cached mono FLAC for ``stream`` (e.g. 'a:1', or None
+        for ffmpeg's default audio track), decoding the video on a miss."""
+        name = f'{self._key(video_path, stream or "", REFERENCE_SAMPLE_RATE)}.flac'
+
+        def build(tmp_path):
+            command = [ffmpeg, '-y', '-nostdin', '-loglevel', 'error', '-i', video_path]
+            if stream:
+                command += ['-map', f'0:{stream}']
+            command += ['-vn', '-sn', '-dn', '-ac', '1', '-ar', str(REFERENCE_SAMPLE_RATE), '-c:a', 'flac',
+                        tmp_path]
+            logging.debug('BAZARR subsync: decoding reference audio of %s (stream=%s)', video_path, stream)
+            subprocess.run(command, check=True, capture_output=True, timeout=1800)
+
+        return self._get_or_build(name, build)
+
+    def speech(self, video_path, stream, vad, ffmpeg, build_speech):
+        """Path of the cached ffsubsync speech array for ``stream``/``vad``.
+
+        On a miss, ``build_speech(audio_path, npz_path)`` is called with the
+        cached reference audio and must write the ``.npz``."""
+        name = f'{self._key(video_path, stream or "", REFERENCE_SAMPLE_RATE, vad)}.npz'
+        return self._get_or_build(
+            name, lambda tmp_path: build_speech(self.audio(video_path, stream, ffmpeg), tmp_path))
+
+    def evict(self, keep=None):
+        """Delete least recently used artifacts until under max_bytes,
+        never the just-built ``keep``."""
+        try:
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and '.tmp.' not in entry.name and entry.path != keep:
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        if keep and os.path.isfile(keep):
+            total += os.path.getsize(keep)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
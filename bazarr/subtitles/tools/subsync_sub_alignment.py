@@ -0,0 +1,150 @@
+# coding=utf-8
+
+import logging
+import subprocess
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Timeline resolution: 10 ms frames, the same 100 Hz ffsubsync uses.
+FRAME_MS = 10
+# Overlap (as a share of the smaller track's cue time) the best lag must reach
+# before the result is trusted. Two tracks of the same cut in different
+# languages typically overlap 70-90% once aligned; below this the caller falls
+# back to audio-based sync.
+MIN_CONFIDENCE = 0.6
+# Too few cues make any lag look good.
+MIN_EVENTS = 10
+# Scale factors tried unless framerate fixing is disabled, mirroring the
+# ffsubsync framerate ratios (PAL speed-up and 23.976/24 drift).
+FRAMERATE_RATIOS = (25 / 23.976, 23.976 / 25, 24 / 23.976, 23.976 / 24, 25 / 24, 24 / 25)
+# A rescaled candidate must beat the unscaled one by this much, so noise never
+# turns a plain offset into a framerate change.
+SCALE_MARGIN = 0.05
+
+
+@dataclass(frozen=True)
+class SubAlignment:
+    offset_ms: int
+    scale: float
+    confidence: float
+
+
+def _event_spans(events):
+    return np.array([(e.start, e.end) for e in events if e.end > e.start and not getattr(e, 'is_comment', False)],
+                    dtype=np.float64).reshape(-1, 2)
+
+
+def _cue_mask(spans, length):
+    """Frame mask of the cue timeline: 1.0 where any cue is on screen."""
+    frames = np.clip((spans / FRAME_MS).astype(np.int64), 0, length)
+    delta = np.zeros(length + 1, dtype=np.int32)
+    np.add.at(delta, frames[:, 0], 1)
+    np.add.at(delta, frames[:, 1], -1)
+    return (np.cumsum(delta[:-1]) > 0).astype(np.float64)
+
+
+def _best_lag(reference, subtitle, max_lag):
+    """Lag (in frames) maximizing the overlap of the two masks, via one
+    FFT-based cross-correlation, and that overlap in frames."""
+    size = 1 << int(len(reference) + len(subtitle) - 1).bit_length()
+    corr = np.fft.irfft(np.fft.rfft(reference, size) * np.conj(np.fft.rfft(subtitle, size)), size)
+    # corr[k] is the overlap with the subtitle shifted later by k frames,
+    # corr[size - k] with it shifted earlier by k. Only lags at which the
+    # tracks can still overlap are real; past those the circular correlation
+    # wraps around, so they are never scored.
+    earliest = min(max_lag, len(subtitle) - 1)
+    latest = min(max_lag, len(reference) - 1)
+    lags = np.arange(-earliest, latest + 1)
+    scores = np.concatenate((corr[size - earliest:size], corr[:latest + 1]))
+    best = int(np.argmax(scores))
+    # When one track's cues sit inside the other's (trimmed cue edges), the
+    # overlap is flat over a range of lags; take the middle of that plateau
+    # rather than whichever edge argmax happens to hit.
+    flat = scores >= scores[best] - 0.5
+    low = best
+    while low > 0 and flat[low - 1]:
+        low -= 1
+    high = best
+    while high < len(scores) - 1 and flat[high + 1]:
+        high += 1
+    middle = (low + high) // 2
+    return int(lags[middle]), float(scores[best])
+
+
+def align_events(reference_events, subtitle_events, max_offset_ms, fix_framerate=True):
+    """Find the shift (and framerate scale) that best lays `subtitle_events`
+    over `reference_events`.
+
+    Both are pysubs2-style events (start/end in ms). Returns a SubAlignment,
+    or None when either track has too few cues to judge.
+    """
+    reference_spans = _event_spans(reference_events)
+    subtitle_spans = _event_spans(subtitle_events)
+    if len(reference_spans) < MIN_EVENTS or len(subtitle_spans) < MIN_EVENTS:
+        return None
+
+    max_lag = max(1, int(max_offset_ms // FRAME_MS))
+    reference_mask = _cue_mask(reference_spans, int(reference_spans[:, 1].max() // FRAME_MS) + 1)
+    reference_total = reference_mask.sum()
+
+    best = None
+    for scale in (1.0,) + (FRAMERATE_RATIOS if fix_framerate else ()):
+        scaled = subtitle_spans * scale
+        subtitle_mask = _cue_mask(scaled, int(scaled[:, 1].max() // FRAME_MS) + 1)
+        lag, overlap = _best_lag(reference_mask, subtitle_mask, max_lag)
+        confidence = overlap / max(1.0, min(reference_total, subtitle_mask.sum()))
+        margin = SCALE_MARGIN if scale != 1.0 else 0.0
+        if best is None or confidence > best.confidence + margin:
+            best = SubAlignment(offset_ms=lag * FRAME_MS, scale=scale, confidence=round(float(confidence), 4))
+    return best
+
+
+def extract_subtitle_stream(video_path, stream, ffmpeg):
+    """Text of embedded subtitle `stream` (e.g. 's:1') as SRT, without
+    decoding any audio. None for bitmap streams or any ffmpeg failure."""
+    command = [ffmpeg, '-nostdin', '-loglevel', 'error', '-i', video_path, '-map', f'0:{stream}',
+               '-vn', '-an', '-f', 'srt', 'pipe:1']
+    try:
+        completed = subprocess.run(command, check=True, capture_output=True, timeout=300)
+    except (OSError, subprocess.SubprocessError) as exc:
+        logging.debug('BAZARR subsync: could not extract subtitle stream %s from %s: %s', stream, video_path, exc)
+        return None
+    return completed.stdout.decode('utf-8', errors='replace') or None
+
+
+def sync_to_subtitle_reference(reference_text, srtin, output_path, max_offset_seconds, fix_framerate=True):
+    """Align `srtin` to the reference subtitle text and write `output_path`.
+
+    Returns an ffsubsync-shaped result dict on success, or None when the
+    alignment isn't confident enough and the caller should fall back to
+    audio-based sync.
+    """
+    import pysubs2
+
+    try:
+        reference = pysubs2.SSAFile.from_string(reference_text)
+        subtitle = pysubs2.load(srtin)
+    except Exception as exc:
+        logging.debug('BAZARR subsync: subtitle reference alignment unavailable: %s', exc)
+        return None
+
+    alignment = align_events(reference.events, subtitle.events, int(max_offset_seconds) * 1000,
+                             fix_framerate=fix_framerate)
+    if alignment is None or alignment.confidence < MIN_CONFIDENCE:
+        logging.debug('BAZARR subsync: subtitle reference alignment not confident (%s), falling back', alignment)
+        return None
+
+    if alignment.scale != 1.0:
+        # pysubs2 multiplies every timestamp by in_fps / out_fps.
+        subtitle.transform_framerate(alignment.scale, 1.0)
+    subtitle.shift(ms=alignment.offset_ms)
+    subtitle.save(str(output_path))
+    logging.debug('BAZARR subsync: aligned %s to subtitle reference (%s)', srtin, alignment)
+    return {
+        'offset_seconds': alignment.offset_ms / 1000,
+        'framerate_scale_factor': alignment.scale,
+        'sync_was_successful': True,
+        'confidence': alignment.confidence,
+    }
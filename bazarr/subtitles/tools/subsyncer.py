@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 import shutil
 import subprocess
+import threading
 
 from utilities.binaries import get_binary
 from radarr.history import history_log_movie
@@ -12,12 +13,15 @@ from sonarr.history import history_log
 from subtitles.processing import ProcessSubtitlesResult
 from subtitles.tools.subsync_engines import (
     DEFAULT_ENABLED_ENGINES,
+    OUTPUT_MODE_KEEP_ALL,
     OUTPUT_MODE_OVERWRITE,
     SubsyncEngineRunner,
     MissingSyncEngineError,
     normalize_enabled_engines,
     normalize_output_mode,
 )
+from subtitles.tools.subsync_reference import ReferenceSignalCache
+from subtitles.tools.subsync_sub_alignment import extract_subtitle_stream, sync_to_subtitle_reference
 from languages.get_languages import audio_language_from_name, language_from_alpha2
 from utilities.path_mappings import path_mappings
 from utilities.video_analyzer import subtitles_sync_references
@@ -40,6 +44,36 @@ def _autosubsync_model_file():
     return str((Path(autosubsync_main.__file__).resolve().parent / '..' / 'trained-model.bin').resolve())
 
 
+_reference_cache = None
+
+
+def _get_reference_cache():
+    """Process-wide ReferenceSignalCache, or None when disabled
+    (subsync.reference_cache_size_mb == 0)."""
+    global _reference_cache
+    max_bytes = int(getattr(settings.subsync, 'reference_cache_size_mb', 0) or 0) * 1024 * 1024
+    if max_bytes <= 0:
+        return None
+    if _reference_cache is None:
+        _reference_cache = ReferenceSignalCache(os.path.join(args.config_dir, 'cache', 'subsync'), max_bytes)
+    _reference_cache.max_bytes = max_bytes
+    return _reference_cache
+
+
+def _build_ffsubsync_speech(ffsubsync_args, audio_path, npz_path):
+    import copy
+
+    import numpy as np
+    from ffsubsync.ffsubsync import make_reference_pipe
+
+    speech_args = copy.copy(ffsubsync_args)
+    speech_args.reference = audio_path
+    speech_args.reference_stream = None
+    reference_pipe = make_reference_pipe(speech_args)
+    reference_pipe.fit(audio_path)
+    np.savez_compressed(npz_path, speech=reference_pipe.transform(audio_path))
+
+
 def _run_autosubsync_api(reference, subtitle_file, output_file, model_file, parallelism):
     from autosubsync.main import synchronize
 
@@ -56,6 +90,7 @@ def _run_autosubsync_api(reference, subtitle_file, output_file, model_file, para
 class SubSyncer:
     def __init__(self):
         self.reference = None
+        self.video_path = None
         self.srtin = None
         self.srtout = None
         self.ffmpeg_path = None
@@ -68,12 +103,19 @@ class SubSyncer:
             self.vad = 'subs_then_webrtc'
         self.log_dir_path = os.path.join(args.config_dir, 'log')
         self.progress_callback = None
+        self._progress_lock = threading.Lock()
+        self._progress_value = 0
         self.sync_result = None
         self.job_id = None
+        self.autosubsync_parallelism = 1
 
     def _report_progress(self, message, value, total):
         if self.progress_callback:
-            self.progress_callback(message, value, total)
+            with self._progress_lock:
+                # Engines may finish out of order when run in parallel; never
+                # let the reported value move backwards.
+                self._progress_value = max(self._progress_value, value)
+                self.progress_callback(message, self._progress_value, total)
 
     @staticmethod
     def _original_language_name(sonarr_series_id, radarr_id, arr_instance_id=None):
@@ -268,6 +310,10 @@ class SubSyncer:
                               arr_instance_id=None):
         from ffsubsync.ffsubsync import run
 
+        aligned = self._align_to_subtitle_reference(output_path, reference, max_offset_seconds, no_fix_framerate)
+        if aligned is not None:
+            return aligned
+
         self.args = self._build_ffsubsync_args(
             output_path=output_path,
             max_offset_seconds=max_offset_seconds,
@@ -280,8 +326,69 @@ class SubSyncer:
             force_sync=force_sync,
             arr_instance_id=arr_instance_id,
         )
+        self._use_cached_speech(self.args)
         return run(self.args)
 
+    def _align_to_subtitle_reference(self, output_path, reference, max_offset_seconds, no_fix_framerate):
+        """Fast path when the reference is a subtitle: an external file or an
+        embedded text stream ('s:N'). Aligns the cue timelines directly, with
+        no audio decode. Returns None (use ffsubsync) when there is no
+        subtitle reference or the alignment isn't confident."""
+        reference_text = None
+        if self.video_path and self.reference != self.video_path and os.path.isfile(self.reference):
+            try:
+                with open(self.reference, encoding='utf-8', errors='replace') as f:
+                    reference_text = f.read()
+            except OSError:
+                return None
+        elif isinstance(reference, str) and len(reference) == 3 and reference.startswith('s:'):
+            ffmpeg = get_binary('ffmpeg')
+            if ffmpeg and os.path.isfile(self.reference):
+                reference_text = extract_subtitle_stream(self.reference, reference, ffmpeg)
+        if not reference_text:
+            return None
+        return sync_to_subtitle_reference(reference_text, self.srtin, output_path, max_offset_seconds,
+                                          fix_framerate=not no_fix_framerate)
+
+    def _is_video_reference(self):
+        return bool(self.video_path and self.reference == self.video_path and os.path.isfile(self.reference))
+
+    def _use_cached_speech(self, ffsubsync_args):
+        """Point ffsubsync at the cached speech array for this video/stream
+        instead of the video itself. Leaves the args untouched when the
+        reference is a subtitle (or an embedded subtitle stream), in debug
+        mode (the test case should capture the real reference) or when the
+        cache can't be built."""
+        cache = _get_reference_cache()
+        stream = ffsubsync_args.reference_stream
+        if (cache is None or settings.subsync.debug or not self._is_video_reference()
+                or (stream and not stream.startswith('a:'))):
+            return
+        try:
+            npz_path = cache.speech(
+                self.reference, stream, ffsubsync_args.vad, get_binary('ffmpeg') or 'ffmpeg',
+                lambda audio_path, out_path: _build_ffsubsync_speech(ffsubsync_args, audio_path, out_path),
+            )
+        except Exception:
+            logging.exception('BAZARR subsync: could not use cached reference speech for %s', self.reference)
+            return
+        ffsubsync_args.reference = npz_path
+        ffsubsync_args.reference_stream = None
+        ffsubsync_args.vad = None
+
+    def _engine_reference(self, video_path):
+        """Reference file for alass/autosubsync: the cached mono audio when
+        syncing against the video, else the subtitle reference as before."""
+        reference = self.reference if self.reference and os.path.isfile(self.reference) else video_path
+        cache = _get_reference_cache()
+        if cache is None or not self._is_video_reference():
+            return reference
+        try:
+            return cache.audio(reference, None, get_binary('ffmpeg') or 'ffmpeg')
+        except Exception:
+            logging.exception('BAZARR subsync: could not use cached reference audio for %s', reference)
+            return reference
+
     def _run_external_engine(self, engine, output_path, video_path):
         if engine == 'autosubsync':
             return self._run_autosubsync_engine(output_path=output_path, video_path=video_path)
@@ -293,7 +400,7 @@ class SubSyncer:
         if not executable:
             raise MissingSyncEngineError(engine, f'{engine} executable not found on PATH')
 
-        reference = self.reference if self.reference and os.path.isfile(self.reference) else video_path
+        reference = self._engine_reference(video_path)
         command = [executable, reference, self.srtin, str(output_path)]
         try:
             completed = subprocess.run(
@@ -315,14 +422,14 @@ class SubSyncer:
         }
 
     def _run_autosubsync_engine(self, output_path, video_path):
-        reference = self.reference if self.reference and os.path.isfile(self.reference) else video_path
+        reference = self._engine_reference(video_path)
         try:
             success = _run_autosubsync_api(
                 reference=reference,
                 subtitle_file=self.srtin,
                 output_file=str(output_path),
                 model_file=_autosubsync_model_file(),
-                parallelism=1,
+                parallelism=self.autosubsync_parallelism,
             )
         except ModuleNotFoundError as exc:
             if exc.name and exc.name.split('.')[0] == 'autosubsync':
@@ -377,8 +484,10 @@ class SubSyncer:
              radarr_id=None, progress_callback=None, job_id=None, force_sync=False, output_mode=None,
              enabled_engines=None, write_history=True, arr_instance_id=None):
         self.reference = video_path
+        self.video_path = video_path
         self.srtin = srt_path
         self.progress_callback = progress_callback
+        self._progress_value = 0
         self.sync_result = None
 
         if self.srtin.casefold().endswith('.ass'):
@@ -434,7 +543,14 @@ class SubSyncer:
             )
             return raw_result
 
-        runner = SubsyncEngineRunner()
+        max_parallel_engines = max(1, int(getattr(settings.subsync, 'parallel_engines', 1) or 1))
+        # autosubsync_parallelism is the job's worker budget: engines running
+        # side by side share it instead of each forking the full amount.
+        concurrent_engines = min(max_parallel_engines, progress_total) if output_mode == OUTPUT_MODE_KEEP_ALL else 1
+        self.autosubsync_parallelism = max(
+            1, int(getattr(settings.subsync, 'autosubsync_parallelism', 1) or 1) // concurrent_engines)
+
+        runner = SubsyncEngineRunner(max_parallel_engines=max_parallel_engines)
         self.sync_result = runner.run(
             srt_path=self.srtin,
             output_mode=output_mode,
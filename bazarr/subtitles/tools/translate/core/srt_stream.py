@@ -0,0 +1,88 @@
+# coding=utf-8
+
+import os
+
+import srt
+
+
+def iter_subtitles(path):
+    """Lazily parse the SRT file at `path`, one block at a time, so only the
+    block being read is ever held in memory."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        block = []
+        for line in f:
+            if line.strip():
+                block.append(line)
+            elif block:
+                yield from srt.parse("".join(block))
+                block = []
+        if block:
+            yield from srt.parse("".join(block))
+
+
+def count_subtitles(path):
+    return sum(1 for _ in iter_subtitles(path))
+
+
+def partial_path_for(dest_path):
+    """Hidden work file next to `dest_path` that translated blocks are
+    streamed into until the translation completes."""
+    return os.path.join(os.path.dirname(dest_path), f".{os.path.basename(dest_path)}.partial")
+
+
+class SubtitleStreamWriter:
+    """
+    Appends translated SRT blocks, in order, to the partial file of
+    `dest_path` and renames it over `dest_path` on commit(), so readers only
+    ever see a complete translation.
+
+    Every write is flushed to disk, so after a crash the partial file holds
+    every block written so far. Passing the `resume_bytes` and `next_index`
+    recorded after a write resumes appending right after it, dropping
+    anything written past that point.
+    """
+
+    def __init__(self, dest_path, resume_bytes=0, next_index=1):
+        self.dest_path = dest_path
+        self.partial_path = partial_path_for(dest_path)
+        if resume_bytes and os.path.isfile(self.partial_path) and \
+                os.path.getsize(self.partial_path) >= resume_bytes:
+            self._file = open(self.partial_path, "r+b")
+            self._file.truncate(resume_bytes)
+            self._file.seek(resume_bytes)
+            self.bytes_written = resume_bytes
+            self.next_index = next_index
+        else:
+            self._file = open(self.partial_path, "wb")
+            self.bytes_written = 0
+            self.next_index = 1
+
+    @property
+    def resumed(self):
+        return self.bytes_written > 0
+
+    def write(self, subtitles):
+        """Compose and append `subtitles`, numbering them on from the last
+        block written. Blocks srt.compose would drop (empty content, bad
+        timing) are dropped here too."""
+        blocks = list(srt.sort_and_reindex(subtitles, start_index=self.next_index))
+        data = "".join(block.to_srt() for block in blocks).encode("utf-8")
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.bytes_written += len(data)
+        if blocks:
+            self.next_index = blocks[-1].index + 1
+
+    def commit(self):
+        self.close()
+        os.replace(self.partial_path, self.dest_path)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        self.close()
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
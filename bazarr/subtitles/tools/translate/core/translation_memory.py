@@ -0,0 +1,189 @@
+# coding=utf-8
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from app.config import settings
+from app.get_args import args
+
+logger = logging.getLogger(__name__)
+
+_HORIZONTAL_WHITESPACE = re.compile(r'[^\S\n]+')
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def normalize_source(text):
+    """Key form of a source line: NFC, whitespace runs collapsed and trimmed
+    per line. Line breaks and case are kept since both change the output."""
+    text = unicodedata.normalize('NFC', text or '').replace('\r\n', '\n')
+    lines = (_HORIZONTAL_WHITESPACE.sub(' ', line).strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class TranslationMemory:
+    """Persistent (source, from_lang, to_lang, engine) -> translation store.
+
+    Backed by a small SQLite file of its own, so lookups never contend with
+    the main database. Entries are refreshed on every hit and the least
+    recently used ones are dropped once the stored text exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, db_path, max_bytes):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS memory ('
+                               'key TEXT PRIMARY KEY, translation TEXT NOT NULL, '
+                               'size INTEGER NOT NULL, last_used REAL NOT NULL)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used)')
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(normalized, from_lang, to_lang, engine):
+        raw = '\x1f'.join((str(from_lang or ''), str(to_lang or ''), str(engine or ''), normalized))
+        return hashlib.sha1(raw.encode('utf-8', 'surrogateescape')).hexdigest()
+
+    def get_many(self, lines, from_lang, to_lang, engine):
+        """Cached translations for ``lines`` as {index: translation}.
+        Blank lines are never looked up."""
+        keys = {}
+        for i, line in enumerate(lines):
+            normalized = normalize_source(line)
+            if normalized:
+                keys.setdefault(self._key(normalized, from_lang, to_lang, engine), []).append(i)
+        if not keys:
+            return {}
+
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            conn = self._connection()
+            # SQLite caps bound parameters per statement (999 on older builds).
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                found.update(conn.execute(f'SELECT key, translation FROM memory WHERE key IN '
+                                          f'({",".join("?" * len(chunk))})', chunk).fetchall())
+            if found:
+                now = time.time()
+                conn.executemany('UPDATE memory SET last_used = ? WHERE key = ?',
+                                 [(now, key) for key in found])
+                conn.commit()
+
+        return {i: translation for key, translation in found.items() for i in keys[key]}
+
+    def put_many(self, pairs, from_lang, to_lang, engine):
+        """Store (source, translation) pairs, skipping blank sources and
+        empty translations, then trim the store back under max_bytes."""
+        now = time.time()
+        rows = []
+        for source, translation in pairs:
+            normalized = normalize_source(source)
+            if not normalized or not translation:
+                continue
+            size = len(normalized.encode('utf-8')) + len(translation.encode('utf-8'))
+            rows.append((self._key(normalized, from_lang, to_lang, engine), translation, size, now))
+        if not rows:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            conn.executemany('INSERT OR REPLACE INTO memory (key, translation, size, last_used) '
+                             'VALUES (?, ?, ?, ?)', rows)
+            conn.commit()
+            self._evict(conn)
+        return len(rows)
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM memory').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so a store that sits at the limit doesn't evict on
+        # every single write.
+        target = total - int(self.max_bytes * 0.9)
+        doomed = []
+        freed = 0
+        for key, size in conn.execute('SELECT key, size FROM memory ORDER BY last_used'):
+            if freed >= target:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany('DELETE FROM memory WHERE key = ?', doomed)
+        conn.commit()
+        logger.debug('BAZARR translation memory evicted %d entries (%d bytes)', len(doomed), freed)
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM memory').fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute('DELETE FROM memory')
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def get_translation_memory():
+    """Process-wide TranslationMemory, or None when disabled
+    (translator.memory_size_mb == 0)."""
+    global _memory
+    max_bytes = int(getattr(settings.translator, 'memory_size_mb', 0) or 0) * 1024 * 1024
+    if max_bytes <= 0:
+        return None
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(os.path.join(args.config_dir, 'cache', 'translation_memory.db'), max_bytes)
+        _memory.max_bytes = max_bytes
+    return _memory
+
+
+def lookup_translations(lines, from_lang, to_lang, engine):
+    """{index: translation} for every line of ``lines`` already in the
+    translation memory. Never raises: a broken store just means no hits."""
+    memory = get_translation_memory()
+    if memory is None:
+        return {}
+    try:
+        hits = memory.get_many(lines, from_lang, to_lang, engine)
+    except Exception:
+        logger.exception('BAZARR translation memory lookup failed')
+        return {}
+    if hits:
+        logger.debug('BAZARR translation memory: %d of %d lines cached for %s (%s -> %s)',
+                     len(hits), len(lines), engine, from_lang, to_lang)
+    return hits
+
+
+def remember_translations(pairs, from_lang, to_lang, engine):
+    """Store (source, translation) pairs; failures are logged, not raised."""
+    memory = get_translation_memory()
+    if memory is None:
+        return
+    try:
+        memory.put_many(pairs, from_lang, to_lang, engine)
+    except Exception:
+        logger.exception('BAZARR translation memory update failed')
@@ -10,12 +10,11 @@ import time
 import typing
 import logging
 
-import srt
-import pysubs2
 import requests
 import unicodedata as ud
 from collections import Counter
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Mapping
 from srt import Subtitle
 
 from app.config import settings
@@ -26,12 +25,38 @@ from subtitles.processing import ProcessSubtitlesResult  # noqa: F401
 from app.jobs_queue import jobs_queue
 from languages.get_languages import alpha3_from_alpha2, language_from_alpha2, language_from_alpha3  # noqa: F401
 from ..core.translator_utils import add_translator_info, get_description, create_process_result
+from ..core.translation_memory import lookup_translations, remember_translations
+from ..core.srt_stream import SubtitleStreamWriter, count_subtitles, iter_subtitles
 
 logger = logging.getLogger(__name__)
 DEFAULT_GEMINI_BATCH_SIZE = 300
 DEFAULT_GEMINI_KEY_COOLDOWN_SECONDS = 60
+DEFAULT_GEMINI_REQUESTS_PER_MINUTE = 10
+# Batches in flight per configured key; each key's token bucket still caps
+# how many requests it actually sends per minute.
+GEMINI_BATCHES_PER_KEY = 2
 _GEMINI_KEY_COOLDOWNS = {}
 _GEMINI_KEY_COOLDOWNS_LOCK = threading.Lock()
+_GEMINI_KEY_BUCKETS = {}
+_GEMINI_KEY_BUCKETS_LOCK = threading.Lock()
+
+
+class _KeyBucket:
+    """Request token bucket of one API key: holds up to a minute's quota and
+    refills continuously at requests_per_minute / 60 per second."""
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, requests_per_minute: int, now: float):
+        self.tokens = float(requests_per_minute)
+        self.updated = now
+
+    def refill(self, requests_per_minute: int, now: float):
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(float(requests_per_minute), self.tokens + elapsed * requests_per_minute / 60.0)
+        self.updated = now
+
+    def seconds_until_token(self, requests_per_minute: int) -> float:
+        return max(0.0, (1.0 - self.tokens) * 60.0 / requests_per_minute)
 
 
 class SubtitleObject(typing.TypedDict):
@@ -79,12 +104,15 @@ class GeminiTranslatorService:
         self.interrupt_flag = False
         self.progress_file = None
         self.current_progress = 0
+        self.completed_batches = {}
+        self.written_batches = 0
+        self.written_bytes = 0
+        self.next_index = 1
         self.job_id = None
+        self._progress_lock = threading.RLock()
 
     def translate(self, job_id):
         self.job_id = job_id
-        subs = pysubs2.load(self.source_srt_file, encoding='utf-8')
-        subs.remove_miscellaneous_events()
 
         try:
             logger.debug(f'BAZARR is sending subtitle file to Gemini for translation')  # noqa: F541, G004
@@ -153,8 +181,19 @@ class GeminiTranslatorService:
             instruction += "\nAdditional user instruction: '" + description + "'"
         return instruction
 
+    def _progress_signature(self) -> dict:
+        """What a checkpoint must match to be resumed: same source file (path,
+        size and mtime), target, model and batch partitioning."""
+        try:
+            stat = os.stat(self.input_file)
+            source = [stat.st_size, stat.st_mtime_ns]
+        except (OSError, TypeError):
+            source = None
+        return {"input_file": self.input_file, "source": source, "to_lang": self.to_lang,
+                "model": self.model_name, "batch_size": self.batch_size}
+
     def _check_saved_progress(self):
-        """Check if there's a saved progress file and load it if exists"""
+        """Load the batches a previous, interrupted run already completed"""
         if not self.progress_file or not os.path.exists(self.progress_file):
             return
 
@@ -162,34 +201,48 @@ class GeminiTranslatorService:
             return
 
         try:
-            with open(self.progress_file, "r") as f:
+            with open(self.progress_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                saved_line = data.get("line", 1)
-                input_file = data.get("input_file")
-
-                # Verify the progress file matches our current input file
-                if input_file != self.input_file:
-                    jobs_queue.update_job_progress(
-                        job_id=self.job_id,
-                        progress_message=f"Found progress file for different subtitle: {input_file}. Ignoring saved "
-                                         f"progress.")
-                    return
-
-                if saved_line > 1 and self.start_line == 1:
-                    os.remove(self.output_file)
+
+            # Verify the progress file matches our current input file
+            signature = self._progress_signature()
+            if any(data.get(name) != value for name, value in signature.items()):
+                jobs_queue.update_job_progress(
+                    job_id=self.job_id,
+                    progress_message=f"Found progress file for different subtitle: {data.get('input_file')}. "
+                                     f"Ignoring saved progress.")
+                return
+
+            self.completed_batches = {
+                int(batch_id): {int(index): content for index, content in lines.items()}
+                for batch_id, lines in data.get("completed_batches", {}).items()
+            }
+            self.written_batches = int(data.get("written_batches", 0))
+            self.written_bytes = int(data.get("written_bytes", 0))
+            self.next_index = int(data.get("next_index", 1))
         except Exception as e:
             jobs_queue.update_job_progress(job_id=self.job_id, progress_message=f"Error reading progress file: {e}")
 
-    def _save_progress(self, line):
-        """Save current progress to temporary file"""
+    def _save_progress(self):
+        """Save how far the partial output file got, plus the batches completed
+        ahead of it (and their translations), to the progress file"""
         if not self.progress_file:
             return
 
-        try:
-            with open(self.progress_file, "w") as f:
-                json.dump({"line": line, "input_file": self.input_file}, f)
-        except Exception as e:
-            jobs_queue.update_job_progress(job_id=self.job_id, progress_message=f"Failed to save progress: {e}")
+        with self._progress_lock:
+            data = self._progress_signature()
+            data["written_batches"] = self.written_batches
+            data["written_bytes"] = self.written_bytes
+            data["next_index"] = self.next_index
+            data["completed_batches"] = {str(batch_id): {str(index): content for index, content in lines.items()}
+                                         for batch_id, lines in self.completed_batches.items()}
+            try:
+                tmp_file = f"{self.progress_file}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_file, self.progress_file)
+            except Exception as e:
+                jobs_queue.update_job_progress(job_id=self.job_id, progress_message=f"Failed to save progress: {e}")
 
     def _clear_progress(self):
         """Clear the progress file on successful completion"""
@@ -217,6 +270,14 @@ class GeminiTranslatorService:
             batch_size = DEFAULT_GEMINI_BATCH_SIZE
         return max(1, batch_size)
 
+    @staticmethod
+    def _get_requests_per_minute() -> int:
+        try:
+            requests_per_minute = int(settings.translator.gemini_requests_per_minute)
+        except (AttributeError, TypeError, ValueError):
+            requests_per_minute = DEFAULT_GEMINI_REQUESTS_PER_MINUTE
+        return max(1, requests_per_minute)
+
     def _get_configured_api_keys(self) -> List[str]:
         keys = []
         seen_keys = set()
@@ -264,6 +325,39 @@ class GeminiTranslatorService:
         self.current_api_key = None
         return None
 
+    def _reserve_api_key(self):
+        """Take one request token from the next configured key that has one,
+        round robin, waiting for the earliest refill when every bucket is
+        drained. Raises when all keys are on cooldown."""
+        requests_per_minute = self._get_requests_per_minute()
+        while not self.interrupt_flag:
+            wait = None
+            with _GEMINI_KEY_BUCKETS_LOCK:
+                now = time.time()
+                total_keys = len(self.api_keys)
+                for offset in range(1, total_keys + 1):
+                    candidate_index = (self.current_api_index + offset) % total_keys
+                    candidate_key = self.api_keys[candidate_index]
+                    if self._is_key_on_cooldown(candidate_key):
+                        continue
+                    bucket = _GEMINI_KEY_BUCKETS.get(candidate_key)
+                    if bucket is None:
+                        bucket = _GEMINI_KEY_BUCKETS[candidate_key] = _KeyBucket(requests_per_minute, now)
+                    bucket.refill(requests_per_minute, now)
+                    if bucket.tokens >= 1.0:
+                        bucket.tokens -= 1.0
+                        self.current_api_index = candidate_index
+                        self.current_api_key = candidate_key
+                        return candidate_key
+                    delay = bucket.seconds_until_token(requests_per_minute)
+                    wait = delay if wait is None else min(wait, delay)
+
+            if wait is None:
+                raise RuntimeError("All Gemini API keys are currently rate limited. Please wait before retrying.")
+            time.sleep(min(wait, 1.0))
+
+        raise RuntimeError("Gemini translation was interrupted.")
+
     @staticmethod
     def _is_rate_limited_response(response) -> bool:
         if response is None:
@@ -298,12 +392,13 @@ class GeminiTranslatorService:
         with _GEMINI_KEY_COOLDOWNS_LOCK:
             _GEMINI_KEY_COOLDOWNS[api_key] = time.time() + max(1, cooldown_seconds)
 
-    def _handle_rate_limited_key(self, response):
-        if not self.current_api_key:
+    def _handle_rate_limited_key(self, response, api_key=None):
+        api_key = api_key or self.current_api_key
+        if not api_key:
             raise RuntimeError("All Gemini API keys are currently rate limited. Please wait before retrying.")
 
         cooldown_seconds = self._get_retry_after_seconds(response)
-        self._set_key_cooldown(self.current_api_key, cooldown_seconds)
+        self._set_key_cooldown(api_key, cooldown_seconds)
 
         rotated_key = self._select_next_api_key()
         if not rotated_key:
@@ -341,7 +436,7 @@ class GeminiTranslatorService:
     def _process_batch(
             self,
             batch: List[SubtitleObject],  # Changed from list[SubtitleObject]
-            translated_subtitle: List[Subtitle],  # Changed from list[Subtitle]
+            translated_subtitle: Mapping[int, Subtitle],
             total: int,
             retry_num=3
     ):
@@ -350,11 +445,12 @@ class GeminiTranslatorService:
 
         Args:
             batch (List[SubtitleObject]): Batch of subtitles to translate
-            translated_subtitle (List[Subtitle]): List to store translated subtitles
+            translated_subtitle (Mapping[int, Subtitle]): Subtitles to update, by line number
             total (int): Total number of subtitles to translate
         """
 
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_name}:generateContent?key={self.current_api_key}"
+        api_key = self._reserve_api_key()
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_name}:generateContent?key={api_key}"
 
         payload = json.dumps(self._build_generate_payload(batch), ensure_ascii=False)
         headers = {
@@ -383,15 +479,19 @@ class GeminiTranslatorService:
                 batch=batch,
             )
 
-            # Accurately calculate and display progress
-            self.current_progress = self.current_progress + chunk_size
-
-            jobs_queue.update_job_progress(job_id=self.job_id, progress_value=self.current_progress)
-
             # Validate translated lines
-            if len(translated_lines) != len(batch):
+            if chunk_size != len(batch):
                 raise ValueError(
-                    f"Gemini returned {len(translated_lines)} lines instead of expected {len(batch)} lines")
+                    f"Gemini returned {chunk_size} lines instead of expected {len(batch)} lines")
+
+            remember_translations(
+                [(line["content"], translated_subtitle[int(line["index"])].content) for line in batch],
+                self.from_lang, self.to_lang, self._memory_engine())
+
+            # Accurately calculate and display progress
+            with self._progress_lock:
+                self.current_progress = self.current_progress + chunk_size
+                jobs_queue.update_job_progress(job_id=self.job_id, progress_value=self.current_progress)
 
             # Clear the batch after successful processing
             batch.clear()
@@ -401,7 +501,7 @@ class GeminiTranslatorService:
         except Exception as e:
             response = getattr(e, "response", None)
             if self._is_rate_limited_response(response):
-                self._handle_rate_limited_key(response)
+                self._handle_rate_limited_key(response, api_key)
                 if retry_num > 0:
                     return self._process_batch(batch, translated_subtitle, total, retry_num - 1)
 
@@ -411,10 +511,13 @@ class GeminiTranslatorService:
                 jobs_queue.update_job_progress(job_id=self.job_id, progress_message=f"Translation request failed: {e}")
                 raise e
 
+    def _memory_engine(self):
+        return f"gemini:{self.model_name}"
+
     @staticmethod
     def _process_translated_lines(
             translated_lines: List[SubtitleObject],  # Changed from list[SubtitleObject]
-            translated_subtitle: List[Subtitle],  # Changed from list[Subtitle]
+            translated_subtitle: Mapping[int, Subtitle],
             batch: List[SubtitleObject],  # Changed from list[SubtitleObject]
     ):
         """
@@ -422,7 +525,7 @@ class GeminiTranslatorService:
 
         Args:
             translated_lines (List[SubtitleObject]): List of translated lines
-            translated_subtitle (List[Subtitle]): List to store translated subtitles
+            translated_subtitle (Mapping[int, Subtitle]): Subtitles to update, by line number
             batch (List[SubtitleObject]): Batch of subtitles to translate
         """
 
@@ -474,79 +577,162 @@ class GeminiTranslatorService:
             jobs_queue.update_job_progress(job_id=self.job_id, progress_message="Please provide a subtitle file.")
             return
 
+        total = 0
+        writer = None
         try:
-            with open(self.input_file, "r", encoding="utf-8") as original_file:
-                original_text = original_file.read()
-                original_subtitle = list(srt.parse(original_text))
-
-                try:
-                    translated_subtitle = original_subtitle.copy()
-                except FileNotFoundError:
-                    translated_subtitle = original_subtitle.copy()
-
-                # Use with statement for the output file too
-                with open(self.output_file, "w", encoding="utf-8") as translated_file:
-                    if len(original_subtitle) < self.batch_size:
-                        self.batch_size = len(original_subtitle)
-
-                    delay = False
-                    delay_time = 30
-
-                    i = self.start_line - 1
-                    total = len(original_subtitle)
-                    batch = [SubtitleObject(index=str(i), content=original_subtitle[i].content)]
-                    i += 1
-
-                    # Save initial progress
-                    self._save_progress(i)
-
-                    jobs_queue.update_job_progress(job_id=self.job_id, progress_max=total,
-                                                   progress_message=self.source_srt_file)
-
-                    while (i < total or len(batch) > 0) and not self.interrupt_flag:
-                        if i < total and len(batch) < self.batch_size:
-                            batch.append(SubtitleObject(index=str(i), content=original_subtitle[i].content))
-                            i += 1
-                            continue
+            total = count_subtitles(self.input_file)
+            writer = SubtitleStreamWriter(self.output_file, self.written_bytes, self.next_index)
+            if not writer.resumed:
+                # Nothing usable on disk: every batch has to be written again
+                self.written_batches = 0
+            self.written_bytes = writer.bytes_written
+            self.next_index = writer.next_index
+            self.current_progress = 0
 
-                        try:
-                            start_time = time.time()
-                            self._process_batch(batch, translated_subtitle, total)
-                            end_time = time.time()
+            jobs_queue.update_job_progress(job_id=self.job_id, progress_max=total,
+                                           progress_value=self.current_progress,
+                                           progress_message=self.source_srt_file)
 
-                            # Save progress after each batch
-                            self._save_progress(i + 1)
+            self._dispatch_batches(self._iter_batches(), writer)
 
-                            if delay and (end_time - start_time < delay_time) and i < total:
-                                time.sleep(delay_time - (end_time - start_time))
-
-                        except Exception as e:
-                            self._clear_progress()
-                            # File will be automatically closed by the with statement
-                            raise e
-
-                    # Check if we exited the loop due to an interrupt
-                    jobs_queue.update_job_progress(job_id=self.job_id, progress_value=total,
-                                                   progress_message=self.source_srt_file)
-                    if self.interrupt_flag:
-                        # File will be automatically closed by the with statement
-                        self._clear_progress()
+            jobs_queue.update_job_progress(job_id=self.job_id, progress_value=total,
+                                           progress_message=self.source_srt_file)
+            if self.interrupt_flag:
+                # The partial output and the progress file are kept so the
+                # remaining batches can be resumed
+                raise RuntimeError("Gemini translation was interrupted.")
 
-                    # Write the final result - this happens inside the with block
-                    translated_file.write(srt.compose(translated_subtitle))
+            writer.commit()
 
-                    # Clear progress file on successful completion
-                    self._clear_progress()
+            # Clear progress file on successful completion
+            self._clear_progress()
 
         except Exception as e:
             logger.error(f'BAZARR encountered an error translating with Gemini: {str(e)}')  # noqa: G004
             jobs_queue.update_job_progress(job_id=self.job_id, progress_value=total,
                                            progress_message=f'Gemini translation failed: {str(e)}')
-            self._clear_progress()
-            if self.output_file and os.path.exists(self.output_file):
-                try:
-                    if os.path.getsize(self.output_file) == 0:
-                        os.remove(self.output_file)
-                except OSError:
-                    pass
+            if writer is not None:
+                writer.close()
             raise e
+
+    def _iter_batches(self):
+        """
+        Lazily split the lines from `start_line` on into fixed batches of
+        `batch_size` lines, numbered so the same file always yields the same
+        batch ids.
+
+        Yields:
+            (batch id, Dict[int, Subtitle]) keyed by line number
+        """
+        first = self.start_line - 1
+        batch = {}
+        batch_id = 0
+        for position, subtitle in enumerate(iter_subtitles(self.input_file)):
+            if position < first:
+                continue
+            batch[position] = subtitle
+            if len(batch) == self.batch_size:
+                yield batch_id, batch
+                batch_id += 1
+                batch = {}
+        if batch:
+            yield batch_id, batch
+
+    def _translate_block(self, batch_id: int, subtitles: Dict[int, Subtitle]):
+        """Translate one batch of subtitles in place: restored from the progress
+        file if an earlier run completed it, otherwise from the translation
+        memory and, for the remaining lines, Gemini."""
+        if self.interrupt_flag:
+            return False
+
+        restored = self.completed_batches.get(batch_id)
+        if restored is not None and set(restored) == set(subtitles):
+            for index, content in restored.items():
+                subtitles[index].content = content
+            sent = 0
+        else:
+            indices = list(subtitles)
+            cached = lookup_translations([subtitles[i].content for i in indices], self.from_lang, self.to_lang,
+                                         self._memory_engine())
+            for offset, content in cached.items():
+                subtitles[indices[offset]].content = content
+            batch = [SubtitleObject(index=str(i), content=subtitles[i].content)
+                     for offset, i in enumerate(indices) if offset not in cached]
+            sent = len(batch)
+            if batch:
+                self._process_batch(batch, subtitles, len(subtitles))
+            with self._progress_lock:
+                self.completed_batches[batch_id] = {i: subtitles[i].content for i in indices}
+            self._save_progress()
+
+        # _process_batch already counted the lines it sent
+        with self._progress_lock:
+            self.current_progress += len(subtitles) - sent
+            jobs_queue.update_job_progress(job_id=self.job_id, progress_value=self.current_progress)
+        return True
+
+    def _dispatch_batches(self, batches, writer: SubtitleStreamWriter):
+        """
+        Translate `batches` concurrently, GEMINI_BATCHES_PER_KEY per configured
+        key, and stream them to `writer` in file order as soon as every
+        earlier batch is written. Only a bounded window of batches is parsed
+        ahead, so memory stays proportional to the batch size rather than the
+        file. The progress file is updated after every batch; the first
+        failure stops the remaining ones.
+        """
+        workers = max(1, len(self.api_keys) * GEMINI_BATCHES_PER_KEY)
+        window = workers * 2
+        pending = {}
+        done = {}
+
+        def write_ready():
+            while self.written_batches in done:
+                batch_id = self.written_batches
+                writer.write(list(done.pop(batch_id).values()))
+                with self._progress_lock:
+                    self.completed_batches.pop(batch_id, None)
+                    self.written_batches += 1
+                    self.written_bytes = writer.bytes_written
+                    self.next_index = writer.next_index
+                self._save_progress()
+
+        def collect(return_when):
+            finished, _ = wait(pending, return_when=return_when)
+            error = None
+            for future in finished:
+                batch_id, subtitles = pending.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                elif future.result():
+                    done[batch_id] = subtitles
+            # Whatever completed ahead of a failure still reaches the partial file
+            write_ready()
+            if error is not None:
+                raise error
+
+        logger.debug('BAZARR is sending batches to Gemini with %d concurrent requests', workers)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for batch_id, subtitles in batches:
+                if batch_id < self.written_batches:
+                    # Already in the partial output of an earlier run
+                    with self._progress_lock:
+                        self.current_progress += len(subtitles)
+                    continue
+                if self.interrupt_flag:
+                    break
+                pending[pool.submit(self._translate_block, batch_id, subtitles)] = (batch_id, subtitles)
+                # Batches finished behind a slow one wait in `done`; they count
+                # against the window too, so a stall can't grow it.
+                while pending and len(pending) + len(done) >= window:
+                    collect(FIRST_COMPLETED)
+            while pending:
+                collect(FIRST_COMPLETED)
+        except BaseException:
+            # Let in-flight requests finish, drop the queued ones
+            self.interrupt_flag = True
+            for future in pending:
+                future.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
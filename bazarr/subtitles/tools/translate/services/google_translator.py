@@ -1,11 +1,16 @@
 # coding=utf-8
 
 import logging
+import re
+import threading
+import time
+
 import pysubs2
 
 from retry.api import retry
-from app.config import settings  # noqa: F401
+from app.config import settings
 from ..core.translator_utils import add_translator_info, create_process_result
+from ..core.translation_memory import lookup_translations, remember_translations
 from sonarr.history import history_log
 from radarr.history import history_log_movie
 from deep_translator import GoogleTranslator
@@ -17,6 +22,10 @@ from deep_translator.exceptions import TooManyRequests, RequestError, Translatio
 from languages.get_languages import alpha3_from_alpha2, language_from_alpha2, language_from_alpha3  # noqa: F401
 
 logger = logging.getLogger(__name__)
+DEFAULT_GOOGLE_BATCH_MAX_CHARS = 1500
+# Upper bound on subtitle lines per request, whatever their length.
+GOOGLE_BATCH_MAX_LINES = 100
+_BATCH_MARKER = re.compile(r'\s*\[\s*(\d+)\s*\]\s*')
 
 
 class GoogleTranslatorService:
@@ -53,24 +62,46 @@ class GoogleTranslatorService:
             jobs_queue.update_job_progress(job_id=job_id, progress_max=lines_list_len,
                                            progress_message=self.source_srt_file)
 
-            translated_lines = []
+            # One slot per subtitle line, filled in place by the worker threads.
+            # None means untranslated and keeps the source text.
+            translated_lines = [None] * lines_list_len
             logger.debug(f'starting translation for {self.source_srt_file}')  # noqa: G004
 
-            def translate_line(line_id, subtitle_line):
-                try:
-                    translated_text = self._translate_text(subtitle_line, job_id)
-                    translated_lines.append({'id': line_id, 'line': translated_text})
-                except TranslationNotFound:
-                    logger.debug(f'Unable to translate line {subtitle_line}')  # noqa: G004
-                    translated_lines.append({'id': line_id, 'line': subtitle_line})
-                finally:
-                    jobs_queue.update_job_progress(job_id=job_id, progress_value=len(translated_lines))
-
-            logger.debug(f'BAZARR is sending {lines_list_len} blocks to Google Translate')  # noqa: G004
+            cached = lookup_translations(lines_list, self.from_lang, self.to_lang, 'google_translate')
+            for line_id, translated_text in cached.items():
+                translated_lines[line_id] = translated_text
+            learned = []
+
+            pending = [i for i in range(lines_list_len) if i not in cached and lines_list[i].strip()]
+            batches = self._build_batches(lines_list, pending, self._get_batch_max_chars())
+            self._progress_lock = threading.Lock()
+            self._progress_started = time.monotonic()
+            # Cached and blank lines need no request; count them as done up front.
+            self._progress_done = lines_list_len - len(pending)
+            self._progress_translated = 0
+            if self._progress_done:
+                jobs_queue.update_job_progress(job_id=job_id, progress_value=self._progress_done)
+
+            def translate_batch(batch):
+                results = None
+                if len(batch) > 1:
+                    results = self._translate_batch(batch, job_id)
+                if results is None:
+                    results = {}
+                    for line_id, parts in batch:
+                        results[line_id] = self._translate_line('\n'.join(parts), job_id)
+                for line_id, translated_text in results.items():
+                    translated_lines[line_id] = translated_text
+                    if translated_text:
+                        learned.append((lines_list[line_id], translated_text))
+                self._report_progress(job_id, len(batch))
+
+            logger.debug(f'BAZARR is sending {len(pending)} blocks to Google Translate '  # noqa: G004
+                         f'in {len(batches)} requests')
             pool = ThreadPoolExecutor(max_workers=10)
             futures = []
-            for i, line in enumerate(lines_list):
-                future = pool.submit(translate_line, i, line)
+            for batch in batches:
+                future = pool.submit(translate_batch, batch)
                 futures.append(future)
             pool.shutdown(wait=True)
             for future in futures:
@@ -79,23 +110,13 @@ class GoogleTranslatorService:
                 except Exception as e:
                     logger.error(f"Error in translation task: {e}")  # noqa: G004
 
-            for i, line in enumerate(translated_lines):
-                lines_list[line['id']] = line['line']
+            remember_translations(learned, self.from_lang, self.to_lang, 'google_translate')
 
             logger.debug(f'BAZARR saving translated subtitles to {self.dest_srt_file}')  # noqa: G004
             for i, line in enumerate(subs):
-                try:
-                    if lines_list[i]:
-                        line.plaintext = lines_list[i]
-                    else:
-                        # we assume that there was nothing to translate if Google returns None. ex.: "♪♪"
-                        continue
-                except IndexError:
-                    logger.error(f'BAZARR is unable to translate malformed subtitles: {self.source_srt_file}')  # noqa: G004
-                    jobs_queue.update_job_progress(job_id=job_id,
-                                                   progress_message=f'Translation failed: Unable to translate '
-                                                                    f'malformed subtitles for {self.source_srt_file}')
-                    raise
+                if translated_lines[i]:
+                    line.plaintext = translated_lines[i]
+                # else we assume that there was nothing to translate if Google returns None. ex.: "♪♪"
 
             try:
                 subs.save(self.dest_srt_file)
@@ -123,6 +144,96 @@ class GoogleTranslatorService:
                                            progress_message=f'Google translation failed: {str(e)}')
             raise
 
+    @staticmethod
+    def _get_batch_max_chars():
+        try:
+            return max(0, int(settings.translator.google_batch_max_chars))
+        except (AttributeError, TypeError, ValueError):
+            return DEFAULT_GOOGLE_BATCH_MAX_CHARS
+
+    @staticmethod
+    def _build_batches(lines_list, pending, max_chars):
+        """Group the `pending` line ids into requests of at most `max_chars`
+        characters once marked up. Each batch is a list of (line id, physical
+        lines). With max_chars 0 every line is sent on its own."""
+        batches = []
+        batch = []
+        batch_chars = 0
+        part_count = 0
+        for line_id in pending:
+            parts = [part.strip() for part in lines_list[line_id].split('\n') if part.strip()]
+            cost = sum(len(part) + len(str(part_count + k)) + 4 for k, part in enumerate(parts))
+            if batch and (batch_chars + cost > max_chars or len(batch) >= GOOGLE_BATCH_MAX_LINES):
+                batches.append(batch)
+                batch, batch_chars, part_count = [], 0, 0
+                cost = sum(len(part) + len(str(k)) + 4 for k, part in enumerate(parts))
+            batch.append((line_id, parts))
+            batch_chars += cost
+            part_count += len(parts)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _pack_batch(batch):
+        """Join every physical line of `batch` behind its own [n] marker. The
+        markers survive translation untouched, so the reply can be split back
+        even if Google drops or adds line breaks."""
+        marked = []
+        for _, parts in batch:
+            for part in parts:
+                marked.append(f'[{len(marked)}] {part}')
+        return '\n'.join(marked), len(marked)
+
+    @staticmethod
+    def _unpack_batch(batch, translated_text, part_count):
+        """{line id: translation} from a packed reply, or None when the
+        markers came back missing, duplicated or out of order."""
+        if not translated_text:
+            return None
+        pieces = _BATCH_MARKER.split(translated_text)
+        # pieces: [text before the first marker, n0, text0, n1, text1, ...]
+        if pieces[0].strip() or len(pieces) != 1 + 2 * part_count:
+            return None
+        if [int(n) for n in pieces[1::2]] != list(range(part_count)):
+            return None
+        translated_parts = iter(piece.strip() for piece in pieces[2::2])
+        results = {}
+        for line_id, parts in batch:
+            lines = [next(translated_parts) for _ in parts]
+            if not all(lines):
+                return None
+            results[line_id] = '\n'.join(lines)
+        return results
+
+    def _translate_batch(self, batch, job_id):
+        text, part_count = self._pack_batch(batch)
+        try:
+            translated_text = self._translate_text(text, job_id)
+        except TranslationNotFound:
+            translated_text = None
+        results = self._unpack_batch(batch, translated_text, part_count)
+        if results is None:
+            logger.debug('BAZARR Google Translate batch of %d lines came back malformed, '
+                         'translating them one by one', len(batch))
+        return results
+
+    def _translate_line(self, subtitle_line, job_id):
+        try:
+            return self._translate_text(subtitle_line, job_id)
+        except TranslationNotFound:
+            logger.debug(f'Unable to translate line {subtitle_line}')  # noqa: G004
+            return None
+
+    def _report_progress(self, job_id, count):
+        with self._progress_lock:
+            self._progress_done += count
+            self._progress_translated += count
+            elapsed = max(time.monotonic() - self._progress_started, 1e-6)
+            jobs_queue.update_job_progress(
+                job_id=job_id, progress_value=self._progress_done,
+                progress_message=f'{self.source_srt_file} ({self._progress_translated / elapsed:.1f} lines/s)')
+
     @retry(exceptions=(TooManyRequests, RequestError), tries=6, delay=1, backoff=2, jitter=(0, 1))
     def _translate_text(self, text, job_id):
         try:
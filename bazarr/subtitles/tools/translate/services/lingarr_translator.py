@@ -18,6 +18,7 @@ from subtitles.processing import ProcessSubtitlesResult  # noqa: F401
 from utilities.path_mappings import path_mappings  # noqa: F401
 
 from ..core.translator_utils import add_translator_info, create_process_result, get_title
+from ..core.translation_memory import lookup_translations, remember_translations
 
 logger = logging.getLogger(__name__)
 
@@ -63,19 +64,25 @@ class LingarrTranslatorService:
                 return self.dest_srt_file
 
             logger.debug(f'Starting translation for {self.source_srt_file}')  # noqa: G004
-            translated_lines = self._translate_content(lines_list, job_id=job_id)
-
-            if translated_lines is None:
-                logger.error(f'Translation failed for {self.source_srt_file}')  # noqa: G004
-                jobs_queue.update_job_progress(job_id=job_id,
-                                               progress_message=f'Translation failed for {self.source_srt_file}')
-                raise RuntimeError(f'Translation failed for {self.source_srt_file}')
+            translation_map = lookup_translations(lines_list, self.from_lang, self.to_lang, 'lingarr')
+            if len(translation_map) < lines_list_len:
+                translated_lines = self._translate_content(lines_list, job_id=job_id, skip=translation_map)
+
+                if translated_lines is None:
+                    logger.error(f'Translation failed for {self.source_srt_file}')  # noqa: G004
+                    jobs_queue.update_job_progress(job_id=job_id,
+                                                   progress_message=f'Translation failed for {self.source_srt_file}')
+                    raise RuntimeError(f'Translation failed for {self.source_srt_file}')
+
+                learned = []
+                for item in translated_lines:
+                    if isinstance(item, dict) and 'position' in item and 'line' in item:
+                        translation_map[item['position']] = item['line']
+                        if isinstance(item['position'], int) and 0 <= item['position'] < lines_list_len:
+                            learned.append((lines_list[item['position']], item['line']))
+                remember_translations(learned, self.from_lang, self.to_lang, 'lingarr')
 
             logger.debug(f'BAZARR saving Lingarr translated subtitles to {self.dest_srt_file}')  # noqa: G004
-            translation_map = {}
-            for item in translated_lines:
-                if isinstance(item, dict) and 'position' in item and 'line' in item:
-                    translation_map[item['position']] = item['line']
 
             for i, line in enumerate(subs):
                 if i in translation_map and translation_map[i]:
@@ -123,13 +130,18 @@ class LingarrTranslatorService:
     # LingarrAuthError is intentionally NOT in the exceptions tuple so 401 surfaces immediately.
     @retry(exceptions=(TooManyRequests, RequestError, requests.exceptions.RequestException), tries=5, delay=15,
            backoff=2, jitter=(0, 5), max_delay=120)
-    def _translate_content(self, lines_list, job_id):
+    def _translate_content(self, lines_list, job_id, skip=None):
         try:
             source_lang = self.language_code_convert_dict.get(self.from_lang, self.from_lang)
             target_lang = self.language_code_convert_dict.get(self.orig_to_lang, self.orig_to_lang)
 
+            # Positions already answered by the translation memory are left out;
+            # the rest keep their original position so results map back.
+            skip = skip or {}
             lines_payload = []
             for i, line in enumerate(lines_list):
+                if i in skip:
+                    continue
                 lines_payload.append({
                     "position": i,
                     "line": line
@@ -17,6 +17,7 @@ from app.event_handler import show_progress, hide_progress, show_message
 from app.jobs_queue import jobs_queue
 
 from ..core.translator_utils import add_translator_info, create_process_result, get_title
+from ..core.translation_memory import lookup_translations, remember_translations
 from .auth import get_translator_auth_headers
 
 logger = logging.getLogger(__name__)
@@ -89,20 +90,27 @@ class OpenRouterTranslatorService:
 
             logger.debug(f'Starting AI translation for {self.source_srt_file}')  # noqa: G004
 
-            # Submit job and poll for completion
-            translated_lines = self._submit_and_poll(lines_list, bazarr_job_id=job_id)
-
-            if translated_lines is None:
-                logger.error(f'Translation failed for {self.source_srt_file}')  # noqa: G004
-                show_message(f'Translation failed for {self.source_srt_file}')
-                return False
+            engine = f'openrouter:{settings.translator.openrouter_model}'
+            translation_map = lookup_translations(lines_list, self.from_lang, self.to_lang, engine)
+            if len(translation_map) < lines_list_len:
+                # Submit job and poll for completion
+                translated_lines = self._submit_and_poll(lines_list, bazarr_job_id=job_id, skip=translation_map)
+
+                if translated_lines is None:
+                    logger.error(f'Translation failed for {self.source_srt_file}')  # noqa: G004
+                    show_message(f'Translation failed for {self.source_srt_file}')
+                    return False
+
+                learned = []
+                for item in translated_lines:
+                    if isinstance(item, dict) and 'position' in item and 'line' in item:
+                        translation_map[item['position']] = item['line']
+                        if isinstance(item['position'], int) and 0 <= item['position'] < lines_list_len:
+                            learned.append((lines_list[item['position']], item['line']))
+                remember_translations(learned, self.from_lang, self.to_lang, engine)
 
             # Process results
             logger.debug(f'BAZARR saving AI translated subtitles to {self.dest_srt_file}')  # noqa: G004
-            translation_map = {}
-            for item in translated_lines:
-                if isinstance(item, dict) and 'position' in item and 'line' in item:
-                    translation_map[item['position']] = item['line']
 
             for i, line in enumerate(subs):
                 if i in translation_map and translation_map[i]:
@@ -137,8 +145,10 @@ class OpenRouterTranslatorService:
             hide_progress(id=f'translate_progress_{self.dest_srt_file}')
             return False
 
-    def _submit_and_poll(self, lines_list: List[str], bazarr_job_id=None) -> Optional[List[Dict[str, Any]]]:
-        """Submit translation job and poll for completion with progress updates"""
+    def _submit_and_poll(self, lines_list: List[str], bazarr_job_id=None,
+                         skip: Optional[Dict[int, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Submit translation job and poll for completion with progress updates.
+        Positions in `skip` (translation memory hits) are left out of the job."""
         try:
             # Prepare language codes
             # from_lang should be alpha2 (e.g., "en")
@@ -162,7 +172,9 @@ class OpenRouterTranslatorService:
                 logger.error(f'Target language is empty! from_lang={self.from_lang}, to_lang={self.to_lang}, orig_to_lang={self.orig_to_lang}')  # noqa: G004
                 return None
 
-            lines_payload: List[Dict[str, Any]] = [{"position": i, "line": line} for i, line in enumerate(lines_list)]
+            skip = skip or {}
+            lines_payload: List[Dict[str, Any]] = [{"position": i, "line": line} for i, line in enumerate(lines_list)
+                                                   if i not in skip]
 
             title = get_title(
                 media_type=self.media_type,
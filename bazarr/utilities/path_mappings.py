@@ -7,6 +7,9 @@ import re
 from app.config import settings
 
 
+_WINDOWS_PATH = re.compile(r'^[a-zA-Z]:\\')
+
+
 def _apply_mapping(path, mapping, reverse):
     """Apply a single [remote, local] mapping list to ``path``.
 
@@ -24,7 +27,7 @@ def _apply_mapping(path, mapping, reverse):
             continue
         if path_mapping[src_index] in path:
             path = path.replace(path_mapping[src_index], path_mapping[dst_index])
-            if path.startswith('\\\\') or re.match(r'^[a-zA-Z]:\\', path):
+            if path.startswith('\\\\') or _WINDOWS_PATH.match(path):
                 path = path.replace('/', '\\')
             elif path.startswith('/'):
                 path = path.replace('\\', '/')
@@ -32,9 +35,17 @@ def _apply_mapping(path, mapping, reverse):
     return path
 
 
-def _instance_path_mapping(arr_instance_id, media_type):
-    """Return the per-instance [remote, local] mapping list for ``arr_instance_id``
-    (#156), or None when the instance has no path_mappings configured.
+def _compile_mapping(mapping):
+    """Keep only the pairs ``_apply_mapping`` can ever apply, as tuples."""
+    if not isinstance(mapping, list):
+        return None
+    return tuple((m[0], m[1]) for m in mapping
+                 if isinstance(m, (list, tuple)) and len(m) >= 2 and m[0] != m[1] and '' not in m)
+
+
+def _instance_path_mappings(arr_instance_id):
+    """Return ``{'series': pairs, 'movies': pairs}`` for ``arr_instance_id``
+    (#156), either side None when the instance has no mapping for it.
 
     The arr_instances ``path_mappings`` column is a JSON blob. Two shapes are
     accepted so single-purpose and split configs both work:
@@ -42,43 +53,64 @@ def _instance_path_mapping(arr_instance_id, media_type):
       * a bare list ``[[remote, local], ...]`` applied to both series + movies;
       * an object ``{"series": [...], "movies": [...]}`` (missing key => none).
 
-    Returns None (caller falls back to the global mapping) on a missing
-    instance, empty/unset column, or malformed JSON. ``media_type`` is
-    'series'/'episode' or 'movie'/'movies'.
+    A missing instance, empty/unset column or malformed JSON yields None for
+    both sides (callers fall back to the global mapping). Returns None only
+    when the instance could not be read at all, so the failure isn't cached.
     """
-    if arr_instance_id is None:
-        return None
     try:
         from app.database import database
         from arr_instances.repository import ArrInstanceRepository
 
         row = ArrInstanceRepository(database).get(arr_instance_id)
-        if row is None or not row.path_mappings:
-            return None
-        parsed = json.loads(row.path_mappings)
     except Exception:
         logging.debug('BAZARR could not load per-instance path_mappings for instance %s', arr_instance_id)
         return None
 
+    parsed = None
+    if row is not None and row.path_mappings:
+        try:
+            parsed = json.loads(row.path_mappings)
+        except ValueError:
+            logging.debug('BAZARR ignoring malformed path_mappings for instance %s', arr_instance_id)
+
     if isinstance(parsed, dict):
-        key = 'movies' if media_type in ('movie', 'movies') else 'series'
-        mapping = parsed.get(key)
-    else:
-        mapping = parsed
-    if not isinstance(mapping, list):
-        return None
-    return [m for m in mapping if isinstance(m, (list, tuple)) and len(m) >= 2 and m[0] != m[1]]
+        return {'series': _compile_mapping(parsed.get('series')), 'movies': _compile_mapping(parsed.get('movies'))}
+    mapping = _compile_mapping(parsed)
+    return {'series': mapping, 'movies': mapping}
 
 
 class PathMappings:
     def __init__(self):
         self.path_mapping_series = []
         self.path_mapping_movies = []
+        # arr_instance_id -> _instance_path_mappings() result, dropped by
+        # clear_instance_cache() when instances change (service.refresh_runtime)
+        self._instance_mappings = {}
 
     def update(self):
         self.path_mapping_series = [x for x in settings.general.path_mappings if x[0] != x[1]]
         self.path_mapping_movies = [x for x in settings.general.path_mappings_movie if x[0] != x[1]]
 
+    def clear_instance_cache(self, arr_instance_id=None):
+        """Drop the cached per-instance mappings for one instance, or all of them."""
+        if arr_instance_id is None:
+            self._instance_mappings.clear()
+        else:
+            self._instance_mappings.pop(arr_instance_id, None)
+
+    def _instance_mapping(self, arr_instance_id, media_type):
+        """Cached per-instance mapping for ``media_type`` ('series'/'episode' or
+        'movie'/'movies'), or None when the global mapping applies."""
+        if arr_instance_id is None:
+            return None
+        mappings = self._instance_mappings.get(arr_instance_id)
+        if mappings is None:
+            mappings = _instance_path_mappings(arr_instance_id)
+            if mappings is None:
+                return None
+            self._instance_mappings[arr_instance_id] = mappings
+        return mappings['movies' if media_type in ('movie', 'movies') else 'series']
+
     def path_replace_instance(self, path, arr_instance_id, media_type):
         """Path-replace ``path`` using the owning instance's per-instance
         path_mappings when configured (#156), else the global mapping.
@@ -87,7 +119,7 @@ class PathMappings:
         point to use wherever a media row carries an arr_instance_id, so the
         per-instance path_mappings column is no longer silently ignored.
         """
-        mapping = _instance_path_mapping(arr_instance_id, media_type)
+        mapping = self._instance_mapping(arr_instance_id, media_type)
         if mapping is not None:
             return _apply_mapping(path, mapping, reverse=False)
         if media_type in ('movie', 'movies'):
@@ -96,7 +128,7 @@ class PathMappings:
 
     def path_replace_reverse_instance(self, path, arr_instance_id, media_type):
         """Reverse of :meth:`path_replace_instance` (local->remote)."""
-        mapping = _instance_path_mapping(arr_instance_id, media_type)
+        mapping = self._instance_mapping(arr_instance_id, media_type)
         if mapping is not None:
             return _apply_mapping(path, mapping, reverse=True)
         if media_type in ('movie', 'movies'):
@@ -114,7 +146,7 @@ class PathMappings:
                 continue
             if path_mapping[0] in path:
                 path = path.replace(path_mapping[0], path_mapping[1])
-                if path.startswith('\\\\') or re.match(r'^[a-zA-Z]:\\', path):
+                if path.startswith('\\\\') or _WINDOWS_PATH.match(path):
                     path = path.replace('/', '\\')
                 elif path.startswith('/'):
                     path = path.replace('\\', '/')
@@ -132,7 +164,7 @@ class PathMappings:
                 continue
             if path_mapping[1] in path:
                 path = path.replace(path_mapping[1], path_mapping[0])
-                if path.startswith('\\\\') or re.match(r'^[a-zA-Z]:\\', path):
+                if path.startswith('\\\\') or _WINDOWS_PATH.match(path):
                     path = path.replace('/', '\\')
                 elif path.startswith('/'):
                     path = path.replace('\\', '/')
@@ -150,7 +182,7 @@ class PathMappings:
                 continue
             if path_mapping[0] in path:
                 path = path.replace(path_mapping[0], path_mapping[1])
-                if path.startswith('\\\\') or re.match(r'^[a-zA-Z]:\\', path):
+                if path.startswith('\\\\') or _WINDOWS_PATH.match(path):
                     path = path.replace('/', '\\')
                 elif path.startswith('/'):
                     path = path.replace('\\', '/')
@@ -168,7 +200,7 @@ class PathMappings:
                 continue
             if path_mapping[1] in path:
                 path = path.replace(path_mapping[1], path_mapping[0])
-                if path.startswith('\\\\') or re.match(r'^[a-zA-Z]:\\', path):
+                if path.startswith('\\\\') or _WINDOWS_PATH.match(path):
                     path = path.replace('/', '\\')
                 elif path.startswith('/'):
                     path = path.replace('\\', '/')
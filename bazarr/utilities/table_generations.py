@@ -0,0 +1,122 @@
+# coding=utf-8
+"""Per-table write generations for conditional GETs.
+
+Every INSERT/UPDATE/DELETE that goes through an engine with
+install_write_tracking() bumps an in-memory counter for its table once it
+commits. A polled endpoint folds the counters of the tables it reads into its
+ETag, so an unchanged ``If-None-Match`` is answered with 304 before any of its
+queries run.
+
+Counters only ever grow and live for the process; the ETag also carries a
+per-process token so a restart never revalidates a tag from the previous run.
+Raw SQL writes bump every generation.
+"""
+
+import itertools
+import threading
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+# Counter for writes whose table can't be told from the statement (raw SQL).
+# It is part of every generation.
+ANY_TABLE = '*'
+
+_DML_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+BOOT_TOKEN = uuid.uuid4().hex
+
+_counter = itertools.count(1)
+_generations = {}
+_lock = threading.Lock()
+
+
+def bump(*tables):
+    """Mark ``tables`` as written. Also usable for non-table state (e.g.
+    'settings') that a conditional GET depends on."""
+    with _lock:
+        value = next(_counter)
+        for table in tables:
+            _generations[table] = value
+
+
+def generation(*tables):
+    """Opaque value that changes whenever one of ``tables`` is written."""
+    return tuple(_generations.get(table, 0) for table in (ANY_TABLE, *tables))
+
+
+def _written_table(clauseelement):
+    if isinstance(clauseelement, UpdateBase):
+        return getattr(clauseelement.table, 'name', ANY_TABLE)
+    if isinstance(clauseelement, TextClause) and clauseelement.text.lstrip().upper().startswith(_DML_PREFIXES):
+        return ANY_TABLE
+    return None
+
+
+def install_write_tracking(engine, autocommit=False):
+    """Bump the generation of every table written through ``engine`` once
+    the write is visible to other connections. Safe to call more than once.
+
+    ``autocommit`` says the engine runs in AUTOCOMMIT, where a write outside
+    a SAVEPOINT is visible at once. Otherwise, and always inside a
+    SAVEPOINT, the tables are held on the connection and bumped on COMMIT
+    (or the RELEASE of the outermost SAVEPOINT under AUTOCOMMIT), so a poll
+    can't pair a new ETag with rows it can't see yet. Writes that are
+    rolled back never bump.
+    """
+    if getattr(engine, '_bazarr_write_tracking_installed', False):
+        return
+    engine._bazarr_write_tracking_installed = True
+
+    def _pending(conn):
+        # One set of written tables per open SAVEPOINT, innermost last, under
+        # the set for the enclosing (non-AUTOCOMMIT) transaction.
+        return conn.info.setdefault('table_generations_pending', [set()])
+
+    @event.listens_for(engine, 'after_execute')
+    def _after_execute(conn, clauseelement, multiparams, params, execution_options, result):
+        table = _written_table(clauseelement)
+        if table is None:
+            return
+        pending = _pending(conn)
+        if len(pending) > 1 or (not autocommit and conn.in_transaction()):
+            pending[-1].add(table)
+        else:
+            bump(table)
+
+    @event.listens_for(engine, 'savepoint')
+    def _savepoint(conn, name):
+        _pending(conn).append(set())
+
+    @event.listens_for(engine, 'release_savepoint')
+    def _release_savepoint(conn, name, context):
+        pending = _pending(conn)
+        tables = pending.pop() if len(pending) > 1 else set()
+        if autocommit and len(pending) == 1:
+            bump(*tables)
+        else:
+            pending[-1].update(tables)
+
+    @event.listens_for(engine, 'rollback_savepoint')
+    def _rollback_savepoint(conn, name, context):
+        pending = _pending(conn)
+        if len(pending) > 1:
+            pending.pop()
+
+    @event.listens_for(engine, 'commit')
+    def _commit(conn):
+        tables = set().union(*_pending(conn))
+        conn.info.pop('table_generations_pending', None)
+        bump(*tables)
+
+    @event.listens_for(engine, 'rollback')
+    def _rollback(conn):
+        conn.info.pop('table_generations_pending', None)
+
+    @event.listens_for(engine, 'checkin')
+    def _checkin(dbapi_connection, connection_record):
+        # conn.info lives with the pooled connection; never carry writes
+        # over to its next checkout.
+        connection_record.info.pop('table_generations_pending', None)
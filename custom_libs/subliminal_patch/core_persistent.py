@@ -3,10 +3,10 @@ from __future__ import absolute_import
 
 from collections import defaultdict
 from concurrent.futures import (
+    FIRST_COMPLETED,
     ThreadPoolExecutor,
-    as_completed,
     Future,
-    TimeoutError as FTimeout,
+    wait,
 )
 import logging
 import threading
@@ -225,8 +225,8 @@ def _safe_submit(executor: ThreadPoolExecutor, fn, *args, **kwargs):
     """Submit fn to the captured executor; if it was shutdown by a
     concurrent reset_pool() (config change), grab a fresh executor and
     retry once. Returning the Future as if nothing happened keeps the
-    fanout's as_completed() loop oblivious to the swap; futures from
-    two pools mix fine since as_completed accepts an arbitrary set."""
+    fanout's wait() loop oblivious to the swap; futures from
+    two pools mix fine since wait() accepts an arbitrary set."""
     try:
         return executor.submit(fn, *args, **kwargs)
     except RuntimeError:
@@ -240,7 +240,8 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
                                  per_provider_timeout: int = 5,
                                  wall_timeout: int = 8,
                                  exclude_providers=None,
-                                 on_result=None):
+                                 on_result=None,
+                                 provider_deadlines=None):
     """Parallel fanout with a hard wall-clock timeout, sharing one
     bounded executor process-wide.
 
@@ -250,8 +251,12 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
     Contract:
       - Submits every non-excluded provider to the shared compat-fanout
         ThreadPoolExecutor (bounded; see module docstring).
-      - Iterates `as_completed(futures, timeout=wall_timeout)` so the
-        wall is enforced by cpython itself, not by a per-iteration check.
+      - Waits on the futures with `wait(..., FIRST_COMPLETED)` bounded by
+        the wall, so the wall is enforced by cpython itself, not by a
+        per-iteration check. With provider_deadlines, the fanout also
+        returns early once every provider still running is past its own
+        deadline - a provider past its deadline is still ingested if it
+        finishes while others are being waited on.
       - On wall expiry, any future that finished before the wall but was
         not yet yielded is harvested (no results dropped); futures still
         running are reported as "abandoned" via on_result and registered
@@ -274,12 +279,17 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
         not cut providers off (the wall does that).
       wall_timeout: hard budget for the whole fanout, in seconds.
       exclude_providers: iterable of provider names to skip entirely.
+      provider_deadlines: optional ``{name: seconds}`` of per-provider
+        deadlines (see ProviderHealthTracker.plan_fanout). Providers not
+        listed are waited on up to the wall.
       on_result: optional callable ``(name, outcome, latency_ms) -> None``
         invoked exactly once per non-excluded provider. Outcomes:
         ``"ok"`` (returned within per_provider_timeout),
         ``"slow"`` (returned, but over threshold),
         ``"exception"`` (raised),
-        ``"abandoned"`` (wall fired before completion).
+        ``"cutoff"`` (still running when the fanout returned early past
+        its provider deadline, before the wall),
+        ``"abandoned"`` (wall fired before completion, or still queued).
     """
     global _abandoned_total
     exclude = set(exclude_providers or ())
@@ -297,7 +307,7 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
 
     # The wall_timeout is the contract caller's hard budget for the
     # whole fanout. Track a deadline so the semaphore wait, future
-    # submission, and as_completed iteration ALL fit inside it. Without
+    # submission, and wait loop ALL fit inside it. Without
     # this, a saturated semaphore could double the effective wall.
     deadline = time.monotonic() + float(wall_timeout)
 
@@ -333,6 +343,11 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
 
             slow_threshold = float(per_provider_timeout)
             processed = set()
+            wall_deadline = time.monotonic() + remaining
+            cutoffs = {fut: min(wall_deadline,
+                                start_times[fut] + float(provider_deadlines[name]))
+                       for fut, name in futures.items()
+                       if provider_deadlines and name in provider_deadlines}
 
             def _emit(name, outcome, latency_s):
                 if on_result is not None:
@@ -357,12 +372,20 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
                     out[video].extend(subs)
 
             try:
-                for fut in as_completed(futures, timeout=remaining):
-                    processed.add(fut)
-                    _ingest(fut, futures[fut],
-                             time.monotonic() - start_times[fut])
-            except FTimeout:
-                pass
+                pending = set(futures)
+                while pending:
+                    # Stop at the wall, or earlier once every pending
+                    # provider is past its own deadline.
+                    cutoff = max(cutoffs.get(f, wall_deadline) for f in pending)
+                    timeout = cutoff - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    done, pending = wait(pending, timeout=timeout,
+                                         return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        processed.add(fut)
+                        _ingest(fut, futures[fut],
+                                 time.monotonic() - start_times[fut])
             finally:
                 # Three groups left:
                 #   1. futures that finished but weren't yielded before
@@ -373,8 +396,10 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
                 #      has returned. cancel() returns True only when the
                 #      future hadn't started yet.
                 #   3. futures already running - cannot be cancelled.
-                #      Report abandoned and register them so they're
-                #      observable. They keep running in the shared pool;
+                #      Report them "cutoff" when the fanout returned early
+                #      past their own deadline (still inside the wall, so
+                #      not a failure), else abandoned, and register them
+                #      so they're observable. They keep running in the shared pool;
                 #      max_workers caps the total background work
                 #      regardless of how many fanouts have been
                 #      abandoned.
@@ -394,7 +419,8 @@ def list_all_subtitles_parallel(videos, languages, pool_instance,
                         # the caller as one that timed out.
                         _emit(name, "abandoned", latency_s)
                     else:
-                        _emit(name, "abandoned", latency_s)
+                        cut_early = now < wall_deadline and now >= cutoffs.get(fut, wall_deadline)
+                        _emit(name, "cutoff" if cut_early else "abandoned", latency_s)
                         still_running.append((fut, name))
                 if still_running:
                     with _abandoned_lock:
@@ -14,13 +14,18 @@ Typical flow from compat/service._do_fanout:
         ..., exclude_providers=exclude,
         on_result=lambda name, outcome, latency_ms: health.record(name, outcome),
     )
+
+It also keeps a decaying fixed-bucket latency histogram per provider so the
+fanout can size per-provider deadlines and skip providers that are too slow
+for the caller's budget (see `plan_fanout`).
 """
 from __future__ import annotations
 
 import logging
+import math
 import threading
 import time
-from typing import Dict, Set
+from typing import Dict, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -35,19 +40,85 @@ FAILURES_TO_DISCARD = 3
 COOLDOWN_BASE_SECONDS = 60
 COOLDOWN_MAX_SECONDS = 600
 
-# Outcomes that count as a failure toward auto-discard.
+# Latency histogram bucket upper bounds, in ms. Percentiles are reported as
+# the upper bound of the bucket they fall in, i.e. rounded up - a
+# conservative estimate for deadline sizing. Anything above the last bound
+# lands in the overflow bucket and reads back as the last bound.
+LATENCY_BUCKETS_MS = (100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 5000,
+                      7500, 10000, 15000, 20000, 30000, 60000, 120000)
+# Percentiles stay unknown (None) until a provider has at least this many
+# samples, so a single cold-start blip can't get a provider skipped.
+LATENCY_MIN_SAMPLES = 5
+# Bucket counts halve every this many seconds. Keeps the percentiles
+# tracking a provider's current behaviour, and guarantees a provider skipped
+# for being slow eventually drops below LATENCY_MIN_SAMPLES and is probed
+# again instead of being skipped forever.
+LATENCY_HALF_LIFE_SECONDS = 600
+# Per-provider fanout deadline = p95 * factor, floored and capped at the wall.
+DEADLINE_P95_FACTOR = 1.5
+DEADLINE_FLOOR_SECONDS = 2.0
+
+# Outcomes whose latency is sampled. "abandoned" and "cutoff" are lower
+# bounds on the real latency but still the best signal that a provider is
+# slow; quick exceptions/timeouts say nothing about how long a good answer
+# takes.
+_SAMPLED_OUTCOMES = frozenset({"ok", "slow", "abandoned", "cutoff"})
+# Outcomes that count as a failure toward auto-discard. "cutoff" (left
+# behind at its own p95-based deadline, inside the wall) is deliberately not
+# one: the fanout chose not to wait, the provider didn't fail.
 _BAD_OUTCOMES = frozenset({"timeout", "exception", "abandoned"})
 # Outcomes that reset the failure counter.
 _GOOD_OUTCOMES = frozenset({"ok", "slow"})
 
 
+class _LatencyHistogram:
+    __slots__ = ("counts", "decayed_at")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.decayed_at = time.monotonic()
+
+    def _decay(self, now: float) -> None:
+        halvings = int((now - self.decayed_at) // LATENCY_HALF_LIFE_SECONDS)
+        if halvings <= 0:
+            return
+        self.counts = [c >> halvings for c in self.counts]
+        self.decayed_at += halvings * LATENCY_HALF_LIFE_SECONDS
+
+    def add(self, latency_ms: int, now: float) -> None:
+        self._decay(now)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def total(self, now: float) -> int:
+        self._decay(now)
+        return sum(self.counts)
+
+    def percentile(self, q: float, now: float) -> Optional[int]:
+        total = self.total(now)
+        if total < LATENCY_MIN_SAMPLES:
+            return None
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[min(i, len(LATENCY_BUCKETS_MS) - 1)]
+        return LATENCY_BUCKETS_MS[-1]
+
+
 class _ProviderState:
-    __slots__ = ("consecutive_failures", "discarded_until", "discard_level")
+    __slots__ = ("consecutive_failures", "discarded_until", "discard_level",
+                 "latency")
 
     def __init__(self) -> None:
         self.consecutive_failures = 0
         self.discarded_until = 0.0  # monotonic timestamp; 0 = not discarded
         self.discard_level = 0      # n-th discard for exponential backoff
+        self.latency = _LatencyHistogram()
 
 
 class ProviderHealthTracker:
@@ -68,11 +139,17 @@ class ProviderHealthTracker:
             abandoned      -> wall_timeout fired before the provider
                               returned. Treated as failure because the
                               caller didn't get data.
+            cutoff         -> the fanout returned early, before the wall,
+                              with the provider past its own deadline.
+                              Only sampled; neither good nor bad.
 
-        Any other outcome string is ignored (forward-compat).
+        Any other outcome string is ignored (forward-compat). ok / slow /
+        abandoned / cutoff also feed latency_ms into the latency histogram.
         """
         with self._lock:
             st = self._state.setdefault(name, _ProviderState())
+            if outcome in _SAMPLED_OUTCOMES:
+                st.latency.add(max(0, int(latency_ms)), time.monotonic())
             if outcome in _GOOD_OUTCOMES:
                 st.consecutive_failures = 0
                 st.discarded_until = 0.0
@@ -123,6 +200,46 @@ class ProviderHealthTracker:
                     out.add(name)
         return out
 
+    def latency_percentile(self, name: str, q: float) -> Optional[int]:
+        """q-th latency percentile (0 < q <= 1) in ms, rounded up to a
+        bucket bound. None until the provider has LATENCY_MIN_SAMPLES."""
+        now = time.monotonic()
+        with self._lock:
+            st = self._state.get(name)
+            if st is None:
+                return None
+            return st.latency.percentile(q, now)
+
+    def plan_fanout(self, names, wall_seconds: float
+                    ) -> Tuple[Dict[str, float], Set[str]]:
+        """Size per-provider deadlines for a fanout with `wall_seconds` left.
+
+        Returns (deadlines, skipped). deadlines maps provider -> seconds,
+        p95 * DEADLINE_P95_FACTOR floored at DEADLINE_FLOOR_SECONDS and
+        capped at the wall; providers without enough samples get the whole
+        wall. skipped holds providers whose p50 alone exceeds the wall:
+        more often than not they'd be abandoned, holding a shared executor
+        worker for nothing.
+        """
+        now = time.monotonic()
+        wall = float(wall_seconds)
+        deadlines: Dict[str, float] = {}
+        skipped: Set[str] = set()
+        with self._lock:
+            for name in names:
+                st = self._state.get(name)
+                p50 = st.latency.percentile(0.5, now) if st else None
+                if p50 is not None and p50 / 1000.0 > wall:
+                    skipped.add(name)
+                    continue
+                p95 = st.latency.percentile(0.95, now) if st else None
+                if p95 is None:
+                    deadlines[name] = wall
+                else:
+                    deadlines[name] = min(wall, max(DEADLINE_FLOOR_SECONDS,
+                                                    p95 / 1000.0 * DEADLINE_P95_FACTOR))
+        return deadlines, skipped
+
     def snapshot(self) -> dict:
         """Introspective view for tests / diagnostics."""
         now = time.monotonic()
@@ -134,6 +251,9 @@ class ProviderHealthTracker:
                     "discarded_for_seconds": max(0, int(st.discarded_until - now))
                                               if st.discarded_until else 0,
                     "discard_level": st.discard_level,
+                    "latency_samples": st.latency.total(now),
+                    "latency_p50_ms": st.latency.percentile(0.5, now),
+                    "latency_p95_ms": st.latency.percentile(0.95, now),
                 }
                 for name, st in self._state.items()
             }
@@ -10,6 +10,7 @@ import time
 from .mods import EMPTY_TAG_PROCESSOR
 from .exc import EmptyEntryError
 from .registry import registry
+from .pipeline import get_pipeline
 from subzero.language import Language
 import six
 
@@ -21,6 +22,7 @@ class SubtitleModifications(object):
     debug = False
     language = None
     initialized_mods = {}
+    compiled_mods = {}
     mods_used = []
     mostly_uppercase = False
     f = None
@@ -30,6 +32,7 @@ class SubtitleModifications(object):
     def __init__(self, debug=False):
         self.debug = debug
         self.initialized_mods = {}
+        self.compiled_mods = {}
         self.mods_used = []
 
     def load(self, fn=None, content=None, language=None, encoding="utf-8", mods=None):
@@ -226,8 +229,12 @@ class SubtitleModifications(object):
         if self.mostly_uppercase and self.debug:
             logger.debug("Mostly-uppercase subtitle found")
 
-        line_mods, non_line_mods, mods_used = self.prepare_mods(*mods)
-        self.mods_used = mods_used
+        # prepared and compiled once per mods/language/case, see pipeline.py
+        pipeline = get_pipeline(self, mods)
+        self.initialized_mods = pipeline.initialized_mods
+        self.compiled_mods = pipeline.compiled_mods
+        self.mods_used = list(pipeline.used_mods)
+        line_mods, non_line_mods = pipeline.line_mods, pipeline.non_line_mods
 
         # apply non-last file mods
         if non_line_mods:
@@ -237,9 +244,6 @@ class SubtitleModifications(object):
             if self.debug:
                 logger.debug("Non-Line mods took %ss", time.time() - non_line_mods_start)
 
-        # sort line mods
-        line_mods.sort(key=lambda x: (x is None, x))
-
         # apply line mods
         if line_mods:
             line_mods_start = time.time()
@@ -317,7 +321,7 @@ class SubtitleModifications(object):
 
                 # fixme: this double loop is ugly
                 for order, identifier, args in mods:
-                    mod = self.initialized_mods[identifier]
+                    mod = self.compiled_mods.get(identifier) or self.initialized_mods[identifier]
 
                     try:
                         line = mod.modify(line.strip(), entry=t, debug=self.debug, parent=self, index=index,
@@ -346,7 +350,7 @@ class SubtitleModifications(object):
                     continue
 
                 for identifier, args in last_procs_mods:
-                    mod = self.initialized_mods[identifier]
+                    mod = self.compiled_mods.get(identifier) or self.initialized_mods[identifier]
 
                     try:
                         line = mod.modify(line.strip(), entry=t, debug=self.debug, parent=self, index=index,
@@ -0,0 +1,261 @@
+# coding=utf-8
+
+from __future__ import absolute_import
+import logging
+import re
+import string
+import threading
+from collections import OrderedDict
+
+from .mods import SubtitleModification
+from .processors.re_processor import ReProcessor, NReProcessor, MultipleWordReProcessor
+from .processors.string_processor import MultipleLineProcessor
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_CACHE_SIZE = 64
+
+# Longest run of processors fused behind one gate regex. A line that matches
+# the gate runs every processor of the run, so shorter runs waste less work on
+# hits; longer ones skip more on misses.
+MAX_FUSED_RUN = 6
+
+STAGES = ("pre_process", "process", "post_process", "last_process")
+
+_GATE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"), (re.ASCII, "a"))
+_LEADING_FLAGS = re.compile(r"^\(\?[aiLmsux]+\)")
+# Numbered back-references and conditionals change meaning once the pattern is
+# embedded in a bigger one.
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\\g<")
+# Shapes of the word list patterns built by dictionaries/make_data.py, around
+# the alternation of their keys (leading flags stripped).
+_WORD_LIST_SHAPES = (
+    (r"(\b|^)(?:", r")(\b|$)"),
+    (r"(?:(?<=\s)|(?<=^)|(?<=\b))(?:", r")(?:(?=\s)|(?=$)|(?=\b))"),
+    (r"^(?:", r")"),
+    (r"(?:", r")$"),
+)
+
+_ALPHANUMERIC = frozenset(string.ascii_letters + string.digits)
+
+_pipelines = OrderedDict()
+_pipelines_lock = threading.Lock()
+
+
+def _trie_source(keys):
+    """
+    Alternation of `keys` factored by common prefixes. Python's re tries every
+    branch of a flat alternation at every position; the trie only follows the
+    branches whose first character matches. Branch order differs from the flat
+    list, so this is only suited to telling whether any key matches.
+    """
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = None
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:%s)" % "|".join(branches)
+        return "(?:%s)?" % body if "" in node else body
+
+    return emit(trie)
+
+
+def _legacy_escape(key):
+    # re.escape of Python 2, which generated dictionaries/data.py
+    return "".join(char if char in _ALPHANUMERIC else "\\" + char for char in key)
+
+
+def _is_alternation_of(source, keys):
+    return source in ("|".join(re.escape(key) for key in keys), "|".join(_legacy_escape(key) for key in keys))
+
+
+def _gate_source(processor):
+    """
+    Regex source matching wherever `processor` could change a line and whether
+    it's cheap enough to be worth checking on its own, or (None, False) if it
+    can't be fused: it looks at the whole entry, runs custom code, or its
+    pattern doesn't survive being embedded in an alternation.
+    """
+    kind = type(processor)
+    if kind in (ReProcessor, NReProcessor):
+        if processor.use_entry:
+            return None, False
+        pattern = processor.pattern
+    elif kind is MultipleWordReProcessor:
+        pattern = processor.snr_dict["pattern"]
+    elif kind is MultipleLineProcessor:
+        return "|".join(re.escape(key) for key in processor.snr_dict["data"]), False
+    else:
+        return None, False
+
+    if not isinstance(pattern.pattern, str) or pattern.flags & re.LOCALE:
+        return None, False
+    source = _LEADING_FLAGS.sub("", pattern.pattern)
+    if _GROUP_REFERENCE.search(source):
+        return None, False
+    standalone = False
+    if kind is MultipleWordReProcessor:
+        # OCR dictionaries hold thousands of words; the factored form searches
+        # them far faster than the flat alternation the processor uses
+        keys = processor.snr_dict["data"]
+        for prefix, suffix in _WORD_LIST_SHAPES:
+            if source.startswith(prefix) and source.endswith(suffix) and \
+                    _is_alternation_of(source[len(prefix):len(source) - len(suffix)], keys):
+                source = prefix + _trie_source(keys) + suffix
+                standalone = True
+                break
+    flags = "".join(letter for flag, letter in _GATE_FLAGS if pattern.flags & flag)
+    # a trailing comment in a verbose pattern would swallow the closing paren
+    end = "\n" if pattern.flags & re.VERBOSE else ""
+    return "(?%s:%s%s)" % (flags, source, end), standalone
+
+
+def _is_identity(processor):
+    kind = type(processor)
+    return kind in (MultipleWordReProcessor, MultipleLineProcessor) and not processor.snr_dict["data"]
+
+
+class CompiledStage(object):
+    """
+    One processor list of a mod (e.g. its processors) for a fixed parent.
+
+    Processors unsupported for the parent's language/case are dropped up
+    front. Consecutive plain regex and string replacement processors are
+    fused into runs behind one alternation of their patterns: a line none of
+    them matches can't be changed by any of them, so the whole run is skipped
+    with a single search.
+    """
+
+    def __init__(self, processors, parent):
+        self.steps = []
+        run, sources, standalone = [], [], False
+        for processor in processors:
+            if not processor.supported(parent) or _is_identity(processor):
+                continue
+            source, cheap = _gate_source(processor)
+            if source is None or len(run) >= MAX_FUSED_RUN:
+                self._add_run(run, sources, standalone)
+                run, sources, standalone = [], [], False
+            if source is None:
+                self.steps.append((None, [processor]))
+            else:
+                run.append(processor)
+                sources.append(source)
+                standalone = standalone or cheap
+        self._add_run(run, sources, standalone)
+
+    def _add_run(self, run, sources, standalone=False):
+        if not run:
+            return
+        gate = None
+        if len(run) > 1 or standalone:
+            try:
+                gate = re.compile("|".join(sources))
+            except re.error:
+                gate = None
+        self.steps.append((gate, run))
+
+    def run(self, content, debug=False, index=None, **kwargs):
+        # mirrors SubtitleModification._process
+        new_content = content
+        for gate, processors in self.steps:
+            if gate is not None and not gate.search(new_content):
+                continue
+            for processor in processors:
+                old_content = new_content
+                new_content = processor.process(new_content, debug=debug, **kwargs)
+                if not new_content:
+                    if debug:
+                        logger.debug("Processor returned empty line: %s", processor.name)
+                    return new_content
+                if debug and old_content != new_content:
+                    logger.debug("%d: %s: %s -> %s", index, processor.name, repr(old_content), repr(new_content))
+        return new_content
+
+
+class CompiledMod(object):
+    """
+    Line-level stand-in for a mod instance. Mods that only declare processor
+    lists run through CompiledStages; mods with their own modify() logic are
+    called as they are.
+    """
+
+    def __init__(self, mod, parent):
+        self.mod = mod
+        cls = type(mod)
+        self.custom = any(getattr(cls, name) is not getattr(SubtitleModification, name)
+                          for name in ("modify", "_process") + STAGES[:3])
+        self.stages = {}
+        if not self.custom:
+            for stage in STAGES:
+                self.stages[stage] = CompiledStage(getattr(mod, "%sors" % stage), parent)
+
+    def __getattr__(self, name):
+        return getattr(self.mod, name)
+
+    def modify(self, content, debug=False, parent=None, procs=None, **kwargs):
+        if self.custom:
+            if procs is not None:
+                kwargs["procs"] = procs
+            return self.mod.modify(content, debug=debug, parent=parent, **kwargs)
+
+        if not content:
+            return
+
+        new_content = content
+        for method in procs or STAGES[:3]:
+            if not new_content:
+                return
+            new_content = self.stages[method].run(new_content, debug=debug, **kwargs)
+
+        return new_content
+
+
+class ModPipeline(object):
+    """
+    The outcome of SubtitleModifications.prepare_mods for one mod list,
+    language and uppercase-ness, plus the compiled line mods. Built once and
+    shared by every file processed with the same inputs.
+    """
+
+    def __init__(self, parent, mods):
+        line_mods, non_line_mods, used_mods = parent.prepare_mods(*mods)
+        line_mods.sort(key=lambda x: (x is None, x))
+        self.line_mods = line_mods
+        self.non_line_mods = non_line_mods
+        self.used_mods = used_mods
+        self.initialized_mods = dict(parent.initialized_mods)
+        self.compiled_mods = dict((identifier, CompiledMod(mod, parent))
+                                  for identifier, mod in self.initialized_mods.items())
+
+
+def get_pipeline(parent, mods):
+    """
+    Cached ModPipeline for `mods` applied to parent's current subtitle.
+
+    Preparing mods depends on the subtitle only through its language and
+    whether it's mostly uppercase, so those key the cache.
+    """
+    key = (tuple(mods), str(parent.language) if parent.language else None, bool(parent.mostly_uppercase))
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+        if pipeline is not None:
+            _pipelines.move_to_end(key)
+            return pipeline
+
+        pipeline = ModPipeline(parent, mods)
+        _pipelines[key] = pipeline
+        while len(_pipelines) > PIPELINE_CACHE_SIZE:
+            _pipelines.popitem(last=False)
+        return pipeline
+
+
+def clear_pipelines():
+    with _pipelines_lock:
+        _pipelines.clear()
@@ -56,13 +56,12 @@ class WholeLineProcessor(MultipleLineProcessor):
             return content
         content = content.strip()
 
-        for key, value in six.iteritems(self.snr_dict["data"]):
-            if content == key:
-                if debug:
-                    logger.debug(u"Replacing '%s' with '%s'", key, value)
+        value = self.snr_dict["data"].get(content)
+        if value is not None:
+            if debug:
+                logger.debug(u"Replacing '%s' with '%s'", content, value)
 
-                content = value
-                break
+            content = value
 
         return content
 
@@ -249,6 +249,18 @@ const SettingsGeneralView: FunctionComponent = () => {
           too long.
         </Message>
       </Section>
+      <Section header="History Statistics">
+        <Check
+          label="Daily Rollups"
+          settingKey="settings-general-history_stats_rollup"
+        ></Check>
+        <Message>
+          Keep daily history counts in a summary table so statistics over long
+          time frames don't count every history row. A day is summarized once,
+          after it ends: history removed afterwards (e.g. with its series or
+          movie) is still counted for that day.
+        </Message>
+      </Section>
       <Section header="External Integrations">
         <ExternalWebhookSelector />
       </Section>
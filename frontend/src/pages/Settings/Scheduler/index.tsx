@@ -35,6 +35,15 @@ const SettingsSchedulerView: FunctionComponent = () => {
           options={seriesSyncOptions}
           settingKey="settings-sonarr-series_sync"
         ></Selector>
+        <Check
+          label="Only Sync Changes Between Full Syncs"
+          settingKey="settings-sonarr-delta_sync"
+        ></Check>
+        <Message>
+          Scheduled syncs only fetch what changed in Sonarr history since the
+          previous sync. The whole library is still synced periodically (daily
+          by default), and whenever the sync task is run from System, Tasks.
+        </Message>
         <Check
           label="Sync Only Monitored Series"
           settingKey={"settings-sonarr-sync_only_monitored_series"}
@@ -72,6 +81,15 @@ const SettingsSchedulerView: FunctionComponent = () => {
           options={moviesSyncOptions}
           settingKey="settings-radarr-movies_sync"
         ></Selector>
+        <Check
+          label="Only Sync Changes Between Full Syncs"
+          settingKey="settings-radarr-delta_sync"
+        ></Check>
+        <Message>
+          Scheduled syncs only fetch what changed in Radarr history since the
+          previous sync. The whole library is still synced periodically (daily
+          by default), and whenever the sync task is run from System, Tasks.
+        </Message>
         <Check
           label="Sync Only Monitored Movies"
           settingKey={"settings-radarr-sync_only_monitored_movies"}
@@ -43,6 +43,7 @@ declare namespace Settings {
     dont_notify_manual_actions: boolean;
     embedded_subs_show_desired: boolean;
     enabled_providers: string[];
+    history_stats_rollup: boolean;
     ignore_pgs_subs: boolean;
     ignore_vobsub_subs: boolean;
     instance_name: string;
@@ -168,6 +169,8 @@ declare namespace Settings {
     full_update_hour: number;
     only_monitored: boolean;
     series_sync: number;
+    delta_sync: boolean;
+    full_sync_hours: number;
     excluded_tags: string[];
     excluded_series_types: SonarrSeriesType[];
   }
@@ -183,6 +186,8 @@ declare namespace Settings {
     full_update_hour: number;
     only_monitored: boolean;
     movies_sync: number;
+    delta_sync: boolean;
+    full_sync_hours: number;
     excluded_tags: string[];
   }
 
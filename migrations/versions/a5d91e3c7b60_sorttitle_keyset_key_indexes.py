@@ -0,0 +1,57 @@
+"""index the coalesced sortTitle keyset paging key
+
+Revision ID: a5d91e3c7b60
+Revises: f1a7c3e92d04
+Create Date: 2026-10-19 18:00:00.000000
+
+The series and movies APIs page on coalesce(sortTitle, '') rather than the
+nullable sortTitle itself: a NULL cursor value never compares, which emptied
+every page after one ending on a NULL title. This replaces the (sortTitle, id)
+indexes from d8b2c6a41f95 with ones on the expression the queries use.
+
+Guarded, so it no-ops on fresh installs that already have the new indexes
+from create_all(). SQLite doesn't reflect expression indexes, so the new ones
+are guarded with IF [NOT] EXISTS rather than by name.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a5d91e3c7b60'
+down_revision = 'f1a7c3e92d04'
+branch_labels = None
+depends_on = None
+
+
+# (table, old index, new index)
+_INDEXES = [
+    ('table_shows', 'ix_table_shows_sorttitle_id', 'ix_table_shows_sorttitle_key_id'),
+    ('table_movies', 'ix_table_movies_sorttitle_id', 'ix_table_movies_sorttitle_key_id'),
+]
+_SORT_KEY = sa.text('coalesce("sortTitle", \'\')')
+
+
+def _index_names(insp, table):
+    return {index['name'] for index in insp.get_indexes(table)}
+
+
+def upgrade():
+    insp = sa.inspect(op.get_context().bind)
+    tables = insp.get_table_names()
+    for table, old, new in _INDEXES:
+        if table not in tables:
+            continue
+        if old in _index_names(insp, table):
+            op.drop_index(old, table_name=table)
+        op.create_index(new, table, [_SORT_KEY, 'id'], if_not_exists=True)
+
+
+def downgrade():
+    insp = sa.inspect(op.get_context().bind)
+    tables = insp.get_table_names()
+    for table, old, new in reversed(_INDEXES):
+        if table not in tables:
+            continue
+        op.drop_index(new, table_name=table, if_exists=True)
+        if old not in _index_names(insp, table):
+            op.create_index(old, table, ['sortTitle', 'id'])
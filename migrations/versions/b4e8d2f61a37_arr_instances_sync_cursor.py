@@ -0,0 +1,54 @@
+"""multiple arr instances: delta sync cursor columns
+
+Revision ID: b4e8d2f61a37
+Revises: e7f4c9d80abc
+Create Date: 2026-10-19 10:00:00.000000
+
+Adds the per-instance state the scheduled delta sync keeps on arr_instances:
+
+- sync_cursor:  JSON {"id", "date"} of the newest *arr history record synced
+- full_sync_at: when the instance last ran a full library reconciliation
+
+Purely additive and nullable; a NULL cursor makes the next scheduled sync a
+full one. Each add is guarded, so it no-ops on fresh installs that already
+have the columns from create_all().
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b4e8d2f61a37'
+down_revision = 'e7f4c9d80abc'
+branch_labels = None
+depends_on = None
+
+
+_ADDITIONS = [
+    ('sync_cursor', sa.Text()),
+    ('full_sync_at', sa.DateTime()),
+]
+
+
+def _columns(insp, table):
+    return {c['name'] for c in insp.get_columns(table)}
+
+
+def upgrade():
+    insp = sa.inspect(op.get_context().bind)
+    if 'arr_instances' not in insp.get_table_names():
+        return
+    existing = _columns(insp, 'arr_instances')
+    for column, column_type in _ADDITIONS:
+        if column not in existing:
+            op.add_column('arr_instances', sa.Column(column, column_type, nullable=True))
+
+
+def downgrade():
+    insp = sa.inspect(op.get_context().bind)
+    if 'arr_instances' not in insp.get_table_names():
+        return
+    existing = _columns(insp, 'arr_instances')
+    for column, _ in reversed(_ADDITIONS):
+        if column in existing:
+            with op.batch_alter_table('arr_instances') as batch:
+                batch.drop_column(column)
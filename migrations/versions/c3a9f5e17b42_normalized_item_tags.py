@@ -0,0 +1,76 @@
+"""normalized series/movie tag tables
+
+Revision ID: c3a9f5e17b42
+Revises: b4e8d2f61a37
+Create Date: 2026-10-19 12:00:00.000000
+
+Adds ``table_shows_tags`` and ``table_movies_tags``: one row per (item, tag
+label), indexed on the tag, so the excluded-tags filter is an anti-join rather
+than a LIKE over every row's serialized ``tags`` column. The sync code keeps
+them current from then on; this migration backfills them from the existing
+``tags`` columns.
+
+Fresh installs already have the (empty) tables from create_all(), so the
+creates are guarded; the backfill only runs into an empty table.
+"""
+import ast
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c3a9f5e17b42'
+down_revision = 'b4e8d2f61a37'
+branch_labels = None
+depends_on = None
+
+
+# (tag table, item column, item table)
+_TAG_TABLES = [
+    ('table_shows_tags', 'series_id', 'table_shows'),
+    ('table_movies_tags', 'movie_id', 'table_movies'),
+]
+
+
+def _labels(tags):
+    try:
+        labels = ast.literal_eval(tags) if tags else []
+    except (ValueError, SyntaxError):
+        return set()
+    return {str(label) for label in labels} if isinstance(labels, (list, tuple, set)) else set()
+
+
+def upgrade():
+    bind = op.get_context().bind
+    insp = sa.inspect(bind)
+    existing = insp.get_table_names()
+    for tag_table, item_column, item_table in _TAG_TABLES:
+        if item_table not in existing:
+            continue
+        if tag_table not in existing:
+            op.create_table(
+                tag_table,
+                sa.Column(item_column, sa.Integer(), nullable=False),
+                sa.Column('tag', sa.Text(), nullable=False),
+                sa.ForeignKeyConstraint([item_column], [f'{item_table}.id'], ondelete='CASCADE'),
+                sa.PrimaryKeyConstraint(item_column, 'tag'),
+            )
+            op.create_index(f'ix_{tag_table}_tag', tag_table, ['tag', item_column])
+
+        if bind.execute(sa.text(f'SELECT 1 FROM {tag_table} LIMIT 1')).first() is not None:
+            continue
+        values = [{'item_id': row.id, 'tag': tag}
+                  for row in bind.execute(sa.text(f'SELECT id, tags FROM {item_table}'))
+                  for tag in _labels(row.tags)]
+        if values:
+            bind.execute(sa.text(f'INSERT INTO {tag_table} ({item_column}, tag) VALUES (:item_id, :tag)'),
+                         values)
+
+
+def downgrade():
+    insp = sa.inspect(op.get_context().bind)
+    existing = insp.get_table_names()
+    for tag_table, _, _ in reversed(_TAG_TABLES):
+        if tag_table in existing:
+            op.drop_index(f'ix_{tag_table}_tag', table_name=tag_table)
+            op.drop_table(tag_table)
@@ -0,0 +1,51 @@
+"""keyset paging indexes for the series, movies and history APIs
+
+Revision ID: d8b2c6a41f95
+Revises: c3a9f5e17b42
+Create Date: 2026-10-19 14:00:00.000000
+
+The list endpoints' opt-in cursor paging seeks on (sort column, id); these
+indexes make that seek, and the ORDER BY behind it, an index range scan:
+
+- table_shows / table_movies: (sortTitle, id)
+- table_history / table_history_movie: (timestamp, id)
+
+Each create is guarded, so it no-ops on fresh installs that already have the
+indexes from create_all().
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd8b2c6a41f95'
+down_revision = 'c3a9f5e17b42'
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = [
+    ('ix_table_shows_sorttitle_id', 'table_shows', ['sortTitle', 'id']),
+    ('ix_table_movies_sorttitle_id', 'table_movies', ['sortTitle', 'id']),
+    ('ix_table_history_timestamp_id', 'table_history', ['timestamp', 'id']),
+    ('ix_table_history_movie_timestamp_id', 'table_history_movie', ['timestamp', 'id']),
+]
+
+
+def _index_names(insp, table):
+    return {index['name'] for index in insp.get_indexes(table)}
+
+
+def upgrade():
+    insp = sa.inspect(op.get_context().bind)
+    tables = insp.get_table_names()
+    for name, table, columns in _INDEXES:
+        if table in tables and name not in _index_names(insp, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    insp = sa.inspect(op.get_context().bind)
+    tables = insp.get_table_names()
+    for name, table, _ in reversed(_INDEXES):
+        if table in tables and name in _index_names(insp, table):
+            op.drop_index(name, table_name=table)
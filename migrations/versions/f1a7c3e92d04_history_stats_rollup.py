@@ -0,0 +1,66 @@
+"""history statistics index and daily rollup table
+
+Revision ID: f1a7c3e92d04
+Revises: d8b2c6a41f95
+Create Date: 2026-10-19 16:00:00.000000
+
+The history statistics endpoint groups history rows by day in SQL. A
+(timestamp, action, provider, language) index on both history tables covers
+that query, so it's an index range scan that never reads the table itself.
+
+``table_history_daily`` holds the optional daily rollup
+(general.history_stats_rollup). It is filled on demand by the endpoint, so
+nothing is backfilled here.
+
+Creates are guarded, so they no-op on fresh installs that already have the
+index and table from create_all().
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f1a7c3e92d04'
+down_revision = 'd8b2c6a41f95'
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = [
+    ('ix_table_history_stats', 'table_history'),
+    ('ix_table_history_movie_stats', 'table_history_movie'),
+]
+_COLUMNS = ['timestamp', 'action', 'provider', 'language']
+
+
+def _index_names(insp, table):
+    return {index['name'] for index in insp.get_indexes(table)}
+
+
+def upgrade():
+    insp = sa.inspect(op.get_context().bind)
+    tables = insp.get_table_names()
+    for name, table in _INDEXES:
+        if table in tables and name not in _index_names(insp, table):
+            op.create_index(name, table, _COLUMNS)
+
+    if 'table_history_daily' not in tables:
+        op.create_table(
+            'table_history_daily',
+            sa.Column('media', sa.Text(), nullable=False),
+            sa.Column('day', sa.Text(), nullable=False),
+            sa.Column('action', sa.Integer(), nullable=False),
+            sa.Column('provider', sa.Text(), nullable=False),
+            sa.Column('language', sa.Text(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('media', 'day', 'action', 'provider', 'language'),
+        )
+
+
+def downgrade():
+    insp = sa.inspect(op.get_context().bind)
+    tables = insp.get_table_names()
+    if 'table_history_daily' in tables:
+        op.drop_table('table_history_daily')
+    for name, table in reversed(_INDEXES):
+        if table in tables and name in _index_names(insp, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark subzero subtitle mods over a corpus of SRT files.
+
+Applies the same mod list to every *.srt below CORPUS_DIR three times: with
+mods prepared for each file and no fused gates (how every file was handled
+before pipelines were cached), with the cached, compiled pipeline, and with
+the cached pipeline from a thread pool as mass operations do. Outputs are
+compared so a regression in the fused pipeline shows up as a mismatch rather
+than just a number.
+
+    CORPUS_DIR=/media/subs MODS=remove_HI,OCR_fixes,common LANGUAGE=en \\
+        python3 scripts/benchmark_subtitle_mods.py
+
+Run from a checkout (BAZARR_ROOT defaults to the parent of this script).
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BAZARR_ROOT = Path(os.environ.get("BAZARR_ROOT", Path(__file__).resolve().parent.parent))
+CORPUS_DIR = Path(os.environ.get("CORPUS_DIR", BAZARR_ROOT / "tests" / "subliminal_patch" / "data"))
+MODS = [m for m in os.environ.get("MODS", "remove_HI,OCR_fixes,common").split(",") if m]
+LANGUAGE = os.environ.get("LANGUAGE", "en")
+WORKERS = int(os.environ.get("WORKERS", "4"))
+
+# Ensure bazarr libs are importable
+for p in [
+    str(BAZARR_ROOT / "custom_libs"),
+    str(BAZARR_ROOT / "libs"),
+    str(BAZARR_ROOT / "bazarr"),
+    str(BAZARR_ROOT),
+]:
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+
+def load_corpus() -> list:
+    files = sorted(CORPUS_DIR.rglob("*.srt"))
+    return [(path, path.read_bytes()) for path in files]
+
+
+def apply_mods(language, content: bytes):
+    from subliminal_patch.subtitle import Subtitle
+
+    sub = Subtitle(language, mods=list(MODS), original_format=True)
+    sub.content = content
+    if not sub.is_valid():
+        return None
+    return sub.get_modified_content(format=sub.format)
+
+
+def timed(label: str, func, corpus: list) -> list:
+    start = time.perf_counter()
+    outputs = func(corpus)
+    elapsed = time.perf_counter() - start
+    lines = sum(content.count(b"\n") for _, content in corpus)
+    print(f"{label:<28} {elapsed:8.3f}s  {len(corpus) / elapsed:8.1f} files/s  {lines / elapsed:10.0f} lines/s")
+    return outputs
+
+
+def main() -> int:
+    from subzero.language import Language
+    from subzero.modification import pipeline
+
+    corpus = load_corpus()
+    if not corpus:
+        print(f"No .srt files found below {CORPUS_DIR}", file=sys.stderr)
+        return 1
+    language = Language.fromietf(LANGUAGE)
+    print(f"{len(corpus)} files, mods={','.join(MODS)}, language={language}")
+
+    def uncached(files):
+        outputs = []
+        fused_run = pipeline.MAX_FUSED_RUN
+        # single processor runs never get a gate
+        pipeline.MAX_FUSED_RUN = 1
+        try:
+            for _, content in files:
+                pipeline.clear_pipelines()
+                outputs.append(apply_mods(language, content))
+        finally:
+            pipeline.MAX_FUSED_RUN = fused_run
+        return outputs
+
+    def cached(files):
+        return [apply_mods(language, content) for _, content in files]
+
+    def pooled(files):
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            return list(executor.map(lambda f: apply_mods(language, f[1]), files))
+
+    baseline = timed("unfused, prepared per file", uncached, corpus)
+    pipeline.clear_pipelines()
+    compiled = timed("cached pipeline", cached, corpus)
+    pooled_outputs = timed(f"cached pipeline, {WORKERS} workers", pooled, corpus)
+
+    mismatches = [str(path) for (path, _), a, b, c in zip(corpus, baseline, compiled, pooled_outputs)
+                  if not a == b == c]
+    for path in mismatches:
+        print(f"MISMATCH {path}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
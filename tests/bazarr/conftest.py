@@ -39,5 +39,9 @@ def schema_session():
     try:
         yield session
     finally:
+        # Instance ids restart at 1 in every fresh DB; don't let one test's
+        # cached client answer for another's instance.
+        from arr_instances.resolution import clear_client_cache
+        clear_client_cache()
         session.remove()
         engine.dispose()
@@ -111,6 +111,37 @@ def test_client_for_instance_skips_disabled(schema_session):
     assert client_for_instance(schema_session, 999999) is None
 
 
+def test_client_for_instance_is_cached_until_refresh(schema_session, monkeypatch):
+    # Per-item hot paths resolve the same instance over and over: the row read
+    # and key decrypt happen once, until a CRUD refresh drops the cache.
+    import secret_store
+    from arr_instances import service
+    from arr_instances.repository import ArrInstanceRepository
+    from arr_instances.resolution import client_for_instance
+
+    decrypts = []
+    real_decrypt = secret_store.decrypt_secret
+    monkeypatch.setattr(secret_store, "decrypt_secret",
+                        lambda value: decrypts.append(value) or real_decrypt(value))
+    repo = ArrInstanceRepository(schema_session)
+    inst = repo.create("sonarr", "On", api_key="K", enabled=True)
+    schema_session.flush()
+
+    client = client_for_instance(schema_session, inst.id)
+    assert client_for_instance(schema_session, inst.id) is client
+    assert client_for_instance(schema_session, inst.id, enabled_only=False) is client
+    assert len(decrypts) == 1
+    # an injected getter always gets its own client
+    assert client_for_instance(schema_session, inst.id, http_get=lambda *a, **k: None) is not client
+
+    repo.update(inst.id, enabled=False)
+    schema_session.flush()
+    assert client_for_instance(schema_session, inst.id) is client  # stale until refreshed
+    service.refresh_runtime("none")
+    assert client_for_instance(schema_session, inst.id) is None
+    assert client_for_instance(schema_session, inst.id, enabled_only=False) is not client
+
+
 def test_service_test_connection_invalid_kind_returns_400():
     from arr_instances import service
 
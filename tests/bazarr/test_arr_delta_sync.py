@@ -0,0 +1,250 @@
+# coding=utf-8
+"""Scheduled Radarr syncs run against a local fake Radarr HTTP server: full
+the first time, then only over the movies with history since the cursor.
+
+The server is real HTTP (the instance's ArrClient goes through the shared
+Radarr session); the parser and subtitle/event leaves are stubbed.
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+from sqlalchemy import select
+
+from app.database import TableArrInstances, TableMovies
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class _DummyJobs:
+    def update_job_progress(self, *a, **k):
+        return None
+
+    def update_job_name(self, *a, **k):
+        return None
+
+
+class _FakeRadarr:
+    def __init__(self):
+        self.movies = {}
+        self.history = []
+        self.requests = []
+        self.failing = set()
+
+    def movie(self, movie_id, title, has_file=True):
+        payload = {"id": movie_id, "title": title, "hasFile": has_file, "monitored": True}
+        if has_file:
+            payload["movieFile"] = {"size": 10 ** 9, "path": f"/movies/{movie_id}.mkv"}
+        self.movies[movie_id] = payload
+
+    def record(self, movie_id):
+        self.history.append({"id": len(self.history) + 1, "movieId": movie_id,
+                             "date": f"2026-10-19T10:00:{len(self.history):02d}Z"})
+
+    def respond(self, path):
+        self.requests.append(path)
+        parts = urlsplit(path).path.rstrip("/").split("/")[3:]
+        if path in self.failing:
+            return 500, {}
+        if parts == ["history"]:
+            return 200, {"records": self.history[-1:]}
+        if parts == ["history", "since"]:
+            return 200, list(self.history)
+        if parts == ["movie"]:
+            return 200, list(self.movies.values())
+        if parts[0] == "movie" and int(parts[1]) in self.movies:
+            return 200, self.movies[int(parts[1])]
+        return 404, {}
+
+
+@pytest.fixture
+def radarr():
+    fake = _FakeRadarr()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, body = fake.respond(self.path)
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fake.port = server.server_address[1]
+    yield fake
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sync(schema_session, monkeypatch, radarr):
+    import radarr.sync.movies as mv_mod
+    from arr_instances.client import ArrClient
+    from arr_instances.repository import ArrInstanceRepository
+
+    instance_id = ArrInstanceRepository(schema_session).create("radarr", "R", port=radarr.port).id
+    client = ArrClient(kind="radarr", ip="127.0.0.1", port=radarr.port)
+    monkeypatch.setattr(mv_mod, "database", schema_session)
+    monkeypatch.setattr(mv_mod, "client_for_instance", lambda *a, **k: client)
+    monkeypatch.setattr(mv_mod, "event_stream", _noop)
+    monkeypatch.setattr(mv_mod, "store_subtitles_movie", _noop)
+    monkeypatch.setattr(mv_mod, "check_radarr_rootfolder", _noop)
+    monkeypatch.setattr(mv_mod, "jobs_queue", _DummyJobs())
+    monkeypatch.setattr(mv_mod, "get_profile_list", lambda *a, **k: [])
+    monkeypatch.setattr(mv_mod, "get_tags", lambda *a, **k: [])
+    monkeypatch.setattr(mv_mod, "movieParser", lambda movie, **k: {
+        "radarrId": movie["id"], "title": movie["title"], "path": movie["movieFile"]["path"],
+        "tmdbId": f"t{movie['id']}", "movie_file_id": movie["id"]})
+
+    def run(force_full=False):
+        radarr.requests.clear()
+        mv_mod.update_movies_for_instance(instance_id, job_id="job", force_full=force_full)
+        return sorted(urlsplit(path).path for path in radarr.requests)
+
+    def titles():
+        return dict(schema_session.execute(select(TableMovies.radarrId, TableMovies.title)).all())
+
+    def instance():
+        return schema_session.get(TableArrInstances, instance_id)
+
+    return run, titles, instance
+
+
+def test_delta_sync_fetches_only_changed_movies(radarr, sync):
+    run, titles, instance = sync
+    for movie_id in (1, 2, 3):
+        radarr.movie(movie_id, f"M{movie_id}")
+        radarr.record(movie_id)
+
+    assert run() == ["/api/v3/history", "/api/v3/movie"]  # no cursor yet: full sync
+    assert titles() == {1: "M1", 2: "M2", 3: "M3"}
+    assert json.loads(instance().sync_cursor)["id"] == 3
+
+    radarr.movie(2, "Renamed")
+    radarr.record(2)
+    radarr.movie(3, "M3", has_file=False)
+    radarr.record(3)
+    assert run() == ["/api/v3/history/since", "/api/v3/movie/2", "/api/v3/movie/3"]
+    assert titles() == {1: "M1", 2: "Renamed"}
+    assert json.loads(instance().sync_cursor)["id"] == 5
+
+    # nothing new: the history check is the whole sync
+    assert run() == ["/api/v3/history/since"]
+
+    # a movie removed from Radarr (404) is removed here too
+    del radarr.movies[1]
+    radarr.record(1)
+    assert run() == ["/api/v3/history/since", "/api/v3/movie/1"]
+    assert titles() == {2: "Renamed"}
+
+
+def test_failed_fetch_keeps_the_cursor(radarr, sync):
+    run, titles, instance = sync
+    radarr.movie(1, "M1")
+    radarr.record(1)
+    run()
+
+    radarr.movie(1, "Renamed")
+    radarr.record(1)
+    radarr.failing.add("/api/v3/movie/1")
+    run()
+    assert titles() == {1: "M1"}  # an outage is not a deletion
+    assert json.loads(instance().sync_cursor)["id"] == 1
+
+    radarr.failing.clear()
+    assert run() == ["/api/v3/history/since", "/api/v3/movie/1"]
+    assert titles() == {1: "Renamed"}
+    assert json.loads(instance().sync_cursor)["id"] == 2
+
+
+def test_full_sync_when_due_or_disabled(radarr, sync, monkeypatch, schema_session):
+    from app.config import settings
+
+    run, _, instance = sync
+    radarr.movie(1, "M1")
+    radarr.record(1)
+    run()
+
+    instance().full_sync_at = datetime.now() - timedelta(hours=25)
+    schema_session.flush()
+    assert "/api/v3/movie" in run()
+    assert instance().full_sync_at > datetime.now() - timedelta(hours=1)
+
+    monkeypatch.setattr(settings.radarr, "delta_sync", False)
+    assert run() == ["/api/v3/movie"]
+    assert instance().sync_cursor is None
+
+
+def test_manual_run_is_a_full_sync(radarr, sync):
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    from app.scheduler import Scheduler
+    from radarr.sync.movies import update_movies_for_instance
+
+    run, _, _ = sync
+    radarr.movie(1, "M1")
+    radarr.record(1)
+    run()
+    assert run(force_full=True) == ["/api/v3/history", "/api/v3/movie"]
+    assert run() == ["/api/v3/history/since"]
+
+    # System > Tasks sets force_full for the next run only
+    scheduler = object.__new__(Scheduler)
+    scheduler.aps_scheduler = BackgroundScheduler()
+    scheduler.aps_scheduler.start(paused=True)
+    try:
+        scheduler.aps_scheduler.add_job(update_movies_for_instance, 'interval', minutes=60, id='update_movies_1',
+                                        kwargs=dict(arr_instance_id=1, wait_for_completion=True))
+        scheduler.aps_scheduler.add_job(_noop, 'interval', minutes=60, id='cache_cleanup')
+        scheduler.execute_job_now('update_movies_1', force_full=True)
+        scheduler.execute_job_now('cache_cleanup', force_full=True)
+        assert scheduler.aps_scheduler.get_job('update_movies_1').kwargs == dict(
+            arr_instance_id=1, wait_for_completion=True, force_full=True)
+        assert scheduler.aps_scheduler.get_job('cache_cleanup').kwargs == {}
+
+        scheduler._Scheduler__clear_force_full('update_movies_1')
+        assert scheduler.aps_scheduler.get_job('update_movies_1').kwargs == dict(
+            arr_instance_id=1, wait_for_completion=True)
+    finally:
+        scheduler.aps_scheduler.shutdown(wait=False)
+
+
+def test_sonarr_delta_only_reconciles_changed_series(schema_session, monkeypatch):
+    import sonarr.sync.series as series_mod
+    from sqlalchemy import insert
+
+    from app.database import TableShows
+
+    for series_id in (5, 6):
+        schema_session.execute(insert(TableShows).values(
+            sonarrSeriesId=series_id, id=series_id, arr_instance_id=2, path=f"/tv/{series_id}",
+            title="S", audio_language="[]"))
+    calls = []
+    monkeypatch.setattr(series_mod, "database", schema_session)
+    monkeypatch.setattr(series_mod, "check_sonarr_rootfolder", _noop)
+    monkeypatch.setattr(series_mod, "jobs_queue", _DummyJobs())
+    monkeypatch.setattr(series_mod, "get_tags", lambda *a, **k: [])
+    monkeypatch.setattr(series_mod, "get_series_from_sonarr_api",
+                        lambda *a, **k: pytest.fail("delta sync fetched the whole library"))
+    # series 5 was deleted in Sonarr (404), series 7 is new
+    monkeypatch.setattr(series_mod, "fetch_changed",
+                        lambda client, resource, ids: [{"id": 7, "title": "New", "monitored": True}])
+    monkeypatch.setattr(series_mod, "get_episodes_from_sonarr_api", lambda **k: [])
+    monkeypatch.setattr(series_mod, "sync_episodes", _noop)
+    monkeypatch.setattr(series_mod, "update_one_series",
+                        lambda series_id, action, **k: calls.append((series_id, action, k["existing_in_db"])))
+
+    assert series_mod.update_series(job_id="job", arr_instance_id=2, arr_client=object(), series_ids={5, 7})
+    assert sorted(calls) == [(5, "deleted", True), (7, "updated", False)]  # 6 untouched
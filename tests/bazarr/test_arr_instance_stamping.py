@@ -19,6 +19,7 @@ import semver
 from sqlalchemy import insert, select
 
 from app.database import TableEpisodes, TableMovies, TableShows
+from arr_instances.delta_sync import SyncPlan
 
 
 def _noop(*args, **kwargs):
@@ -474,10 +475,12 @@ def test_update_series_for_instance_forwards(monkeypatch):
     sentinel = object()
     seen = {}
     monkeypatch.setattr(series_mod, "client_for_instance", lambda *a, **k: sentinel)
+    monkeypatch.setattr(series_mod, "plan_sync", lambda *a, **k: SyncPlan(None))
     monkeypatch.setattr(series_mod, "update_series", lambda **k: seen.update(k))
 
     series_mod.update_series_for_instance(2, job_id="job-x")
     assert seen["arr_instance_id"] == 2 and seen["arr_client"] is sentinel and seen["job_id"] == "job-x"
+    assert seen["series_ids"] is None  # no cursor yet -> full sync
 
 
 def test_update_series_for_instance_skips_unknown(monkeypatch):
@@ -497,10 +500,12 @@ def test_update_movies_for_instance_forwards(monkeypatch):
     sentinel = object()
     seen = {}
     monkeypatch.setattr(mv_mod, "client_for_instance", lambda *a, **k: sentinel)
+    monkeypatch.setattr(mv_mod, "plan_sync", lambda *a, **k: SyncPlan(None))
     monkeypatch.setattr(mv_mod, "update_movies", lambda **k: seen.update(k))
 
     mv_mod.update_movies_for_instance(3, job_id="job-y")
     assert seen["arr_instance_id"] == 3 and seen["arr_client"] is sentinel
+    assert seen["radarr_ids"] is None
 
 
 def test_update_movies_for_instance_skips_unknown(monkeypatch):
@@ -0,0 +1,95 @@
+# coding=utf-8
+"""Polled endpoints answer a current If-None-Match with 304 without running
+their handler; any committed write to a table they read changes the ETag."""
+from flask import Flask
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.database import Base, TableMovies, TableShows
+
+
+def test_writes_bump_only_their_table_on_commit(schema_session):
+    from utilities.table_generations import generation, install_write_tracking
+
+    install_write_tracking(schema_session.get_bind())
+    movies, shows = generation('table_movies'), generation('table_shows')
+
+    schema_session.execute(select(TableMovies.id)).all()
+    schema_session.execute(insert(TableMovies).values(id=1, radarrId=1, path="/m", title="M", tmdbId="1"))
+    assert generation('table_movies') == movies  # not visible to anyone else yet
+    schema_session.commit()
+    assert generation('table_movies') != movies
+    assert generation('table_shows') == shows
+
+    movies = generation('table_movies')
+    schema_session.execute(update(TableMovies).values(title="N"))
+    schema_session.rollback()
+    assert generation('table_movies') == movies
+
+
+def test_savepoint_writes_bump_on_release(tmp_path):
+    from utilities.table_generations import generation, install_write_tracking
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'gen.db'}", isolation_level="AUTOCOMMIT")
+    Base.metadata.create_all(engine)
+    install_write_tracking(engine, autocommit=True)
+    writer, reader = Session(engine), Session(engine)
+
+    shows = generation('table_shows')
+    writer.execute(insert(TableShows).values(id=1, sonarrSeriesId=1, path="/s1", title="S"))
+    assert generation('table_shows') != shows  # autocommitted at once
+
+    shows = generation('table_shows')
+    with writer.begin_nested():
+        writer.execute(insert(TableShows).values(id=2, sonarrSeriesId=2, path="/s2", title="S"))
+        with writer.begin_nested():
+            writer.execute(update(TableShows).values(title="T"))
+        # a poll now must not get a new ETag for rows it can't read yet
+        assert generation('table_shows') == shows
+        assert reader.execute(select(TableShows.title)).scalars().all() == ["S"]
+    assert generation('table_shows') != shows
+    assert reader.execute(select(TableShows.title)).scalars().all() == ["T", "T"]
+
+    shows = generation('table_shows')
+    nested = writer.begin_nested()
+    writer.execute(update(TableShows).values(title="U"))
+    nested.rollback()
+    assert generation('table_shows') == shows
+    writer.close()
+    reader.close()
+    engine.dispose()
+
+
+def test_unchanged_poll_is_answered_304(schema_session):
+    from api.utils import conditional_get
+    from utilities.table_generations import bump, install_write_tracking
+
+    install_write_tracking(schema_session.get_bind())
+    runs = []
+    app = Flask(__name__)
+
+    @app.route('/api/shows')
+    @conditional_get('table_shows', 'settings')
+    def shows():
+        runs.append(1)
+        return {'titles': list(schema_session.execute(select(TableShows.title)).scalars())}
+
+    client = app.test_client()
+    first = client.get('/api/shows')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'no-cache'
+
+    again = client.get('/api/shows', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.headers['ETag'] == etag
+    assert len(runs) == 1
+    # another query string is another resource
+    assert client.get('/api/shows?start=1', headers={'If-None-Match': etag}).status_code == 200
+
+    schema_session.execute(insert(TableShows).values(id=1, sonarrSeriesId=1, path="/s", title="S"))
+    schema_session.commit()
+    changed = client.get('/api/shows', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.json == {'titles': ['S']}
+
+    bump('settings')
+    assert client.get('/api/shows', headers={'If-None-Match': changed.headers['ETag']}).status_code == 200
+    assert len(runs) == 4
@@ -15,7 +15,8 @@ from collections import namedtuple
 from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch, mock_open  # noqa: F401
 
-import pytest  # noqa: F401
+import numpy as np
+import pytest
 
 _SYS_BEFORE = dict(sys.modules)
 
@@ -404,6 +405,92 @@ def _value_after(items, key):
     return items[idx + 1]
 
 
+# ---------------------------------------------------------------------------
+# Shared HLS segment cache
+# ---------------------------------------------------------------------------
+
+class TestHlsSegmentCache:
+    """Tests for the grid-addressed segment cache of transcoded sessions."""
+
+    @staticmethod
+    def _cache(tmp_path, duration=30.0):
+        return editor_module.hls_segments.SegmentCache(
+            str(tmp_path), '/video/movie.mkv', 0, duration, True, '/usr/bin/ffmpeg',
+        )
+
+    @staticmethod
+    def _entries(playlist):
+        lines = playlist.splitlines()
+        return [(float(line[len('#EXTINF:'):-1]), lines[i + 1])
+                for i, line in enumerate(lines) if line.startswith('#EXTINF:')]
+
+    def test_grid_start_playlist_lists_absolute_segments(self, tmp_path):
+        playlist = self._cache(tmp_path).playlist(8.0)
+
+        assert self._entries(playlist) == [
+            (4.0, 'segment_2.m4s'), (4.0, 'segment_3.m4s'), (4.0, 'segment_4.m4s'),
+            (4.0, 'segment_5.m4s'), (4.0, 'segment_6.m4s'), (2.0, 'segment_7.m4s'),
+        ]
+        assert playlist.rstrip().endswith('#EXT-X-ENDLIST')
+
+    def test_off_grid_start_gets_lead_in_up_to_next_boundary(self, tmp_path):
+        cache = self._cache(tmp_path)
+
+        assert self._entries(cache.playlist(5.5))[:2] == [(2.5, 'lead.m4s'), (4.0, 'segment_2.m4s')]
+        # Less than HLS_MIN_LEAD_SECONDS before a boundary: the lead-in runs on
+        # to the one after it.
+        assert self._entries(cache.playlist(7.5))[:2] == [(4.5, 'lead.m4s'), (4.0, 'segment_3.m4s')]
+        assert '#EXT-X-TARGETDURATION:5' in cache.playlist(7.5)
+        assert cache.playlist(30.0) is None
+
+    def test_cached_segment_is_served_without_encoding(self, tmp_path):
+        cache = self._cache(tmp_path)
+        for index in range(0, 8):
+            (tmp_path / f'segment_{index}.m4s').write_bytes(b'x')
+
+        with patch.object(cache, '_start_encoder', side_effect=AssertionError('should not encode')):
+            assert cache.request_segment(3, deadline=0) == cache.segment_path(3)
+
+    def test_encoder_only_fills_the_gap_up_to_cached_segments(self, tmp_path):
+        cache = self._cache(tmp_path)
+        (tmp_path / 'segment_5.m4s').write_bytes(b'x')
+
+        with patch.object(editor_module.hls_segments.threading, 'Thread') as thread, \
+             patch.object(editor_module.hls_segments, 'max_encoders', return_value=2):
+            assert cache._start_encoder(2, deadline=0, preempt=False)
+
+        encoder = thread.call_args.kwargs['target'].__self__
+        cmd = encoder.command('/usr/bin/ffmpeg')
+        assert (encoder.first_index, encoder.end_index) == (2, 5)
+        assert _value_after(cmd, '-ss') == '8.000'
+        assert _value_after(cmd, '-t') == '12.000'
+        assert _value_after(cmd, '-output_ts_offset') == '8.000'
+        assert _value_after(cmd, '-start_number') == '2'
+        assert _value_after(cmd, '-hls_segment_options') == 'use_editlist=0'
+        editor_module.hls_segments._release_slot(encoder)
+
+    def test_encoder_slots_are_bounded(self, tmp_path):
+        hls_segments = editor_module.hls_segments
+        busy = object()
+        with patch.object(hls_segments, 'max_encoders', return_value=1):
+            assert hls_segments._acquire_slot(busy, deadline=0, preempt=True)
+            try:
+                assert not self._cache(tmp_path)._start_encoder(0, deadline=0, preempt=True)
+            finally:
+                hls_segments._release_slot(busy)
+
+    def test_only_zero_start_h264_or_hevc_uses_stream_copy(self):
+        assert editor_module._hls_uses_stream_copy(_make_probe_json(video_codec='hevc'), 0)
+        assert not editor_module._hls_uses_stream_copy(_make_probe_json(video_codec='hevc'), 12.5)
+        assert not editor_module._hls_uses_stream_copy(_make_probe_json(video_codec='mpeg4'), 0)
+
+    def test_segment_cache_dir_is_shared_across_sessions(self):
+        first = editor_module._hls_segment_cache_dir('/video/movie.mkv', 1, 1000.0)
+        assert first == editor_module._hls_segment_cache_dir('/video/movie.mkv', 1, 1000.0)
+        assert first != editor_module._hls_segment_cache_dir('/video/movie.mkv', 2, 1000.0)
+        assert first != editor_module._hls_segment_cache_dir('/video/movie.mkv', 1, 2000.0)
+
+
 # ---------------------------------------------------------------------------
 # _validate_params
 # ---------------------------------------------------------------------------
@@ -1242,3 +1329,56 @@ class TestEditorSubtitles:
             result = subs_resource.get()
 
         assert result[1] == 400
+
+
+# ---------------------------------------------------------------------------
+# Waveform peaks
+# ---------------------------------------------------------------------------
+
+class TestEditorPeaks:
+    """Tests for the NumPy peak extraction and the multi-level peaks cache."""
+
+    @staticmethod
+    def _pcm(seconds):
+        import io
+
+        # 1 Hz envelope so every second has a different loudest sample
+        t = np.arange(int(seconds * editor_module.PEAKS_SAMPLE_RATE))
+        samples = np.sin(t * 0.7) * (1 + (t // editor_module.PEAKS_SAMPLE_RATE) % 5)
+        samples[123] = -8.0  # the loudest sample overall is negative
+        return io.BytesIO(samples.astype('<f4').tobytes()), samples
+
+    def test_levels_match_per_peak_max_abs(self):
+        stream, samples = self._pcm(12.5)
+        levels = editor_module._extract_peak_levels(stream)
+
+        assert sorted(levels) == [1, 10, 100]
+        assert levels[100].shape == (1250, 2)
+        assert levels[10].shape == (125, 2)
+        first = samples[:80]
+        assert levels[10][0][0] == pytest.approx(first.min(), abs=1e-5)
+        assert levels[10][0][1] == pytest.approx(first.max(), abs=1e-5)
+
+    def test_cache_round_trip_serves_ranges_at_requested_resolution(self, tmp_path):
+        stream, samples = self._pcm(30)
+        cache_file = str(tmp_path / 'movie.peaks')
+        editor_module._write_peaks_cache(cache_file, editor_module._extract_peak_levels(stream), 30.0)
+
+        header, levels = editor_module._read_peaks_cache(cache_file)
+        assert header['duration'] == 30.0
+
+        peaks, rate, _, _ = editor_module._select_peaks(levels, 30.0, 10)
+        assert rate == 10 and len(peaks) == 300
+        assert peaks[1] == -1.0
+
+        peaks, rate, start, end = editor_module._select_peaks(levels, 30.0, 50, start=10, end=12)
+        assert rate == 50 and (start, end) == (10, 12)
+        assert len(peaks) == 100
+        expected = samples[8000:8016]
+        expected_peak = expected[np.argmax(np.abs(expected))] / 8.0
+        assert peaks[0] == pytest.approx(expected_peak, abs=1e-3)
+
+    def test_legacy_or_corrupt_cache_is_ignored(self, tmp_path):
+        cache_file = tmp_path / 'movie.peaks'
+        cache_file.write_text('{"peaks": []}')
+        assert editor_module._read_peaks_cache(str(cache_file)) is None
@@ -0,0 +1,67 @@
+# coding=utf-8
+"""Excluded tags filter through the normalized tag tables, which index_tags
+rebuilds from the serialized ``tags`` column the sync writes."""
+from sqlalchemy import delete, insert, select, update
+
+from app.database import TableMovies, TableMoviesTags, TableShows, TableShowsTags
+
+
+def _show(session, show_id, tags):
+    session.execute(insert(TableShows).values(
+        id=show_id, sonarrSeriesId=show_id, path=f"/tv/{show_id}", title="S", tags=tags))
+
+
+def _visible_shows(session):
+    from app.database import get_exclusion_clause
+
+    return sorted(session.execute(
+        select(TableShows.id).where(*get_exclusion_clause('series'))).scalars())
+
+
+def test_excluded_series_tags_use_the_tag_table(schema_session, monkeypatch):
+    from app.config import settings
+    from app.database import index_tags
+
+    monkeypatch.setattr(settings.sonarr, "excluded_tags", ["anime", "kids"])
+    monkeypatch.setattr(settings.sonarr, "only_monitored", False)
+    monkeypatch.setattr(settings.sonarr, "excluded_series_types", [])
+    monkeypatch.setattr(settings.sonarr, "exclude_season_zero", False)
+    _show(schema_session, 1, "['anime', '4k']")
+    _show(schema_session, 2, "['4k']")
+    _show(schema_session, 3, "['kids']")
+    _show(schema_session, 4, None)
+    _show(schema_session, 5, "['animes']")  # substring of nothing excluded
+    index_tags(schema_session, TableShows, select(TableShows.id))
+
+    assert sorted(schema_session.execute(select(TableShowsTags.series_id, TableShowsTags.tag)).all()) == [
+        (1, "4k"), (1, "anime"), (2, "4k"), (3, "kids"), (5, "animes")]
+    assert _visible_shows(schema_session) == [2, 4, 5]
+
+    # a retagged series is reindexed alone; a deleted one takes its tags along
+    schema_session.execute(update(TableShows).where(TableShows.id == 2).values(tags="['kids']"))
+    schema_session.execute(update(TableShows).where(TableShows.id == 3).values(tags="[]"))
+    index_tags(schema_session, TableShows, select(TableShows.id).where(TableShows.id.in_([2, 3])))
+    schema_session.execute(delete(TableShows).where(TableShows.id == 1))
+    assert _visible_shows(schema_session) == [3, 4, 5]
+    assert schema_session.execute(
+        select(TableShowsTags.tag).where(TableShowsTags.series_id == 1)).first() is None
+
+    monkeypatch.setattr(settings.sonarr, "excluded_tags", [])
+    assert _visible_shows(schema_session) == [2, 3, 4, 5]
+
+
+def test_movie_sync_indexes_tags(schema_session, monkeypatch):
+    import radarr.sync.movies as mv_mod
+
+    monkeypatch.setattr(mv_mod, "database", schema_session)
+    monkeypatch.setattr(mv_mod, "store_subtitles_movie", lambda *a, **k: None)
+    monkeypatch.setattr(mv_mod, "event_stream", lambda *a, **k: None)
+    movie = {"radarrId": 7, "title": "M", "path": "/m/7", "tmdbId": "t7", "tags": "['4k', 'hdr']",
+             "movie_file_id": 1}
+
+    mv_mod.add_movie(dict(movie))
+    mv_mod.update_movie(dict(movie, tags="['hdr']"))
+
+    movie_id = schema_session.execute(select(TableMovies.id)).scalar_one()
+    assert schema_session.execute(select(TableMoviesTags.movie_id, TableMoviesTags.tag)).all() == [
+        (movie_id, "hdr")]
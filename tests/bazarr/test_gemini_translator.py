@@ -1,7 +1,10 @@
+import json
+import threading
 import time
 
 import pytest
 
+from subtitles.tools.translate.core import translation_memory
 from subtitles.tools.translate.services import gemini_translator
 
 
@@ -60,10 +63,17 @@ def _clear_gemini_key_cooldowns():
     cooldowns = getattr(gemini_translator, "_GEMINI_KEY_COOLDOWNS", None)
     if cooldowns is not None:
         cooldowns.clear()
+    gemini_translator._GEMINI_KEY_BUCKETS.clear()
     yield
     cooldowns = getattr(gemini_translator, "_GEMINI_KEY_COOLDOWNS", None)
     if cooldowns is not None:
         cooldowns.clear()
+    gemini_translator._GEMINI_KEY_BUCKETS.clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_translation_memory(mocker):
+    mocker.patch.object(translation_memory, "get_translation_memory", return_value=None)
 
 
 def test_get_configured_api_keys_trims_and_deduplicates(mocker):
@@ -149,8 +159,9 @@ def test_translate_with_gemini_does_not_leave_output_file_on_failure(tmp_path, m
     service.job_id = "job-1"
 
     def _fail_after_output_file_created(*args, **kwargs):
-        # Translation output file should be opened before batch processing starts.
-        assert output_file.exists()
+        # Translated blocks are streamed to a partial file, not the output.
+        assert (tmp_path / ".output.srt.partial").exists()
+        assert not output_file.exists()
         raise RuntimeError("boom")
 
     mocker.patch.object(service, "_process_batch", side_effect=_fail_after_output_file_created)
@@ -160,3 +171,170 @@ def test_translate_with_gemini_does_not_leave_output_file_on_failure(tmp_path, m
         service._translate_with_gemini()
 
     assert not output_file.exists()
+
+
+def _write_srt(path, count):
+    path.write_text(
+        "".join(f"{i + 1}\n00:00:{i:02d},000 --> 00:00:{i:02d},500\nline {i}\n\n" for i in range(count)),
+        encoding="utf-8",
+    )
+
+
+def _prepare_service(tmp_path, keys, batch_size):
+    input_file = tmp_path / "input.srt"
+    service = _build_service()
+    service.input_file = str(input_file)
+    service.output_file = str(tmp_path / "output.srt")
+    service.progress_file = str(tmp_path / ".input.srt.progress")
+    service.api_keys = keys
+    service.current_api_key = keys[0]
+    service.target_language = "German"
+    service.batch_size = batch_size
+    service.job_id = "job-1"
+    return service
+
+
+class _FakeGemini:
+    """Stands in for requests.request: upper-cases every line and records
+    which key each batch used and how many requests overlapped."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.keys = []
+        self.batches = []
+
+    def __call__(self, method, url, headers=None, data=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.keys.append(url.rsplit("key=", 1)[1])
+        time.sleep(self.delay)
+        batch = json.loads(json.loads(data)["contents"][0]["parts"][0]["text"])
+        with self.lock:
+            self.in_flight -= 1
+            self.batches.append([int(line["index"]) for line in batch])
+
+        class _Response:
+            status_code = 200
+            text = json.dumps({"candidates": [{"content": {"parts": [{"text": json.dumps(
+                [{"index": line["index"], "content": line["content"].upper()} for line in batch])}]}}]})
+
+            def raise_for_status(self):
+                pass
+
+        return _Response()
+
+
+def test_batches_are_spread_over_keys_and_reassembled_in_order(tmp_path, mocker):
+    _write_srt(tmp_path / "input.srt", 10)
+    service = _prepare_service(tmp_path, ["key-1", "key-2"], batch_size=2)
+    fake = _FakeGemini()
+    mocker.patch.object(gemini_translator.requests, "request", side_effect=fake)
+    mocker.patch.object(gemini_translator.jobs_queue, "update_job_progress")
+
+    service._translate_with_gemini()
+
+    assert fake.max_in_flight > 1
+    assert set(fake.keys) == {"key-1", "key-2"}
+    output = (tmp_path / "output.srt").read_text(encoding="utf-8")
+    assert [line for line in output.splitlines() if line.startswith("LINE")] == [f"LINE {i}" for i in range(10)]
+    assert not (tmp_path / ".input.srt.progress").exists()
+
+
+def test_completed_batches_are_resumed_from_progress_file(tmp_path, mocker):
+    _write_srt(tmp_path / "input.srt", 6)
+    service = _prepare_service(tmp_path, ["key-1"], batch_size=2)
+    fake = _FakeGemini(delay=0)
+    mocker.patch.object(gemini_translator.requests, "request", side_effect=fake)
+    mocker.patch.object(gemini_translator.jobs_queue, "update_job_progress")
+
+    service.completed_batches = {1: {2: "saved 2", 3: "saved 3"}}
+    service._save_progress()
+    service.completed_batches = {}
+    service._check_saved_progress()
+    service._translate_with_gemini()
+
+    assert sorted(fake.batches) == [[0, 1], [4, 5]]
+    output = (tmp_path / "output.srt").read_text(encoding="utf-8")
+    assert "saved 2" in output and "saved 3" in output and "LINE 5" in output
+
+
+def test_reserve_api_key_rotates_when_a_bucket_is_drained(mocker):
+    mocker.patch.object(gemini_translator.settings.translator, "gemini_requests_per_minute", 1, create=True)
+    service = _build_service()
+    service.api_keys = ["key-1", "key-2"]
+
+    assert service._reserve_api_key() == "key-1"
+    assert service._reserve_api_key() == "key-2"
+    assert gemini_translator._GEMINI_KEY_BUCKETS["key-1"].seconds_until_token(1) > 0
+
+
+def test_interrupted_run_resumes_after_the_written_part_of_the_output(tmp_path, mocker):
+    _write_srt(tmp_path / "input.srt", 6)
+    service = _prepare_service(tmp_path, ["key-1"], batch_size=2)
+    mocker.patch.object(gemini_translator.jobs_queue, "update_job_progress")
+
+    calls = []
+
+    def fail_on_second_batch(batch, translated_subtitle, total, retry_num=3):
+        calls.append([line["index"] for line in batch])
+        if len(calls) > 1:
+            raise RuntimeError("boom")
+        for line in batch:
+            translated_subtitle[int(line["index"])].content = line["content"].upper()
+
+    mocker.patch.object(service, "_process_batch", side_effect=fail_on_second_batch)
+    mocker.patch.object(gemini_translator, "GEMINI_BATCHES_PER_KEY", 0)
+    with pytest.raises(RuntimeError, match="boom"):
+        service._translate_with_gemini()
+
+    assert not (tmp_path / "output.srt").exists()
+    partial = tmp_path / ".output.srt.partial"
+    assert "LINE 1" in partial.read_text(encoding="utf-8")
+    # Bytes written after the last checkpoint are dropped on resume
+    with open(partial, "a", encoding="utf-8") as f:
+        f.write("3\n00:00:02,000 --> 00:00:02,500\ngarbage\n\n")
+
+    resumed = _prepare_service(tmp_path, ["key-1"], batch_size=2)
+    resumed._check_saved_progress()
+    fake = _FakeGemini(delay=0)
+    mocker.patch.object(gemini_translator.requests, "request", side_effect=fake)
+    resumed._translate_with_gemini()
+
+    assert sorted(fake.batches) == [[2, 3], [4, 5]]
+    output = (tmp_path / "output.srt").read_text(encoding="utf-8")
+    assert "garbage" not in output
+    assert [line for line in output.splitlines() if line.startswith("LINE")] == [f"LINE {i}" for i in range(6)]
+    assert [line for line in output.splitlines() if line.isdigit()] == [str(i) for i in range(1, 7)]
+    assert not partial.exists()
+
+
+def test_batches_held_behind_a_slow_one_stay_within_the_window(tmp_path, mocker):
+    _write_srt(tmp_path / "input.srt", 40)
+    service = _prepare_service(tmp_path, ["key-1"], batch_size=2)
+    mocker.patch.object(gemini_translator.jobs_queue, "update_job_progress")
+    mocker.patch.object(gemini_translator, "GEMINI_BATCHES_PER_KEY", 2)
+    window = 2 * 2
+
+    first_done = threading.Event()
+    started_meanwhile = []
+
+    def stall_first_batch(batch, translated_subtitle, total, retry_num=3):
+        if batch[0]["index"] == "0":
+            time.sleep(0.3)
+            first_done.set()
+        elif not first_done.is_set():
+            started_meanwhile.append(batch[0]["index"])
+        for line in batch:
+            translated_subtitle[int(line["index"])].content = line["content"].upper()
+
+    mocker.patch.object(service, "_process_batch", side_effect=stall_first_batch)
+    service._translate_with_gemini()
+
+    # the stalled batch and everything finished behind it share the window
+    assert len(started_meanwhile) <= window - 1
+    output = (tmp_path / "output.srt").read_text(encoding="utf-8")
+    assert [line for line in output.splitlines() if line.startswith("LINE")] == [f"LINE {i}" for i in range(40)]
@@ -0,0 +1,82 @@
+# coding=utf-8
+
+import pysubs2
+import pytest
+
+from subtitles.tools.translate.core import translation_memory
+from subtitles.tools.translate.services import google_translator
+from subtitles.tools.translate.services.google_translator import GoogleTranslatorService
+
+
+@pytest.fixture
+def service(mocker, tmp_path):
+    mocker.patch.object(translation_memory, 'get_translation_memory', return_value=None)
+    mocker.patch.object(google_translator, 'jobs_queue')
+    mocker.patch.object(google_translator, 'add_translator_info')
+    mocker.patch.object(google_translator, 'create_process_result')
+    mocker.patch.object(google_translator, 'history_log')
+    mocker.patch.object(google_translator, 'language_from_alpha2', return_value='English')
+    mocker.patch.object(google_translator, 'language_from_alpha3', return_value='German')
+
+    source = tmp_path / 'Show.en.srt'
+    subs = pysubs2.SSAFile()
+    for i, text in enumerate(('Hello', 'How are you?\\NFine.', '♪♪', 'Goodbye')):
+        subs.append(pysubs2.SSAEvent(start=i * 2000, end=i * 2000 + 1000, text=text))
+    subs.save(str(source))
+
+    return GoogleTranslatorService(
+        source_srt_file=str(source), dest_srt_file=str(tmp_path / 'Show.de.srt'), lang_obj=mocker.Mock(alpha2='de'),
+        to_lang='ger', from_lang='en', media_type='episode', video_path='/tmp/Show.mkv', orig_to_lang='de',
+        forced=False, hi=False, sonarr_series_id=1, sonarr_episode_id=1, radarr_id=None)
+
+
+def test_lines_are_packed_into_one_request_and_split_back(mocker, service):
+    sent = []
+    mocker.patch.object(service, '_translate_text', side_effect=lambda text, job_id: sent.append(text) or text.upper())
+
+    service.translate(job_id=1)
+
+    assert len(sent) == 1
+    assert [e.plaintext for e in pysubs2.load(service.dest_srt_file)] == [
+        'HELLO', 'HOW ARE YOU?\nFINE.', '♪♪', 'GOODBYE']
+
+
+def test_malformed_batch_falls_back_to_single_lines(mocker, service):
+    sent = []
+
+    def fake_translate(text, job_id):
+        sent.append(text)
+        # Markers lost in translation
+        return 'Hallo alle zusammen' if text.startswith('[0]') else text.upper()
+
+    mocker.patch.object(service, '_translate_text', side_effect=fake_translate)
+
+    service.translate(job_id=1)
+
+    assert len(sent) == 5
+    assert [e.plaintext for e in pysubs2.load(service.dest_srt_file)] == [
+        'HELLO', 'HOW ARE YOU?\nFINE.', '♪♪', 'GOODBYE']
+
+
+def test_batches_are_bounded_by_size():
+    lines = ['x' * 40] * 10
+    batches = GoogleTranslatorService._build_batches(lines, list(range(10)), 100)
+    assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+    assert all(len(GoogleTranslatorService._pack_batch(batch)[0]) <= 100 for batch in batches)
+
+    assert [len(batch) for batch in GoogleTranslatorService._build_batches(lines, list(range(10)), 0)] == [1] * 10
+
+
+def test_progress_reaches_max_with_blank_lines(mocker, service):
+    subs = pysubs2.load(service.source_srt_file)
+    subs.insert(1, pysubs2.SSAEvent(start=500, end=900, text=' '))
+    subs.save(service.source_srt_file)
+    mocker.patch.object(pysubs2.SSAFile, 'remove_miscellaneous_events')
+    mocker.patch.object(service, '_translate_text', side_effect=lambda text, job_id: text.upper())
+
+    service.translate(job_id=1)
+
+    calls = google_translator.jobs_queue.update_job_progress.call_args_list
+    progress_max = next(c.kwargs['progress_max'] for c in calls if 'progress_max' in c.kwargs)
+    assert progress_max == 5
+    assert [c.kwargs['progress_value'] for c in calls if 'progress_value' in c.kwargs][-1] == progress_max
@@ -0,0 +1,84 @@
+# coding=utf-8
+"""History statistics are grouped by day in SQL; with the daily rollup on,
+whole past days come from table_history_daily and the result is unchanged."""
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from sqlalchemy import func, insert, select
+
+
+@pytest.fixture
+def stats(schema_session, monkeypatch):
+    from api.history import stats as stats_mod
+    from app.database import TableHistory, TableHistoryMovie
+
+    monkeypatch.setattr(stats_mod, "database", schema_session)
+    now = datetime.now()
+    rows = [
+        # (days ago, action, provider, language)
+        (0, 1, "opensubtitles", "en"),
+        (1, 1, "opensubtitles", "en"),
+        (1, 3, "podnapisi", "fr"),
+        (1, 1, None, None),
+        (3, 2, "podnapisi", "en"),
+        (3, 4, "podnapisi", "en"),  # not a download: never counted
+        (10, 1, "opensubtitles", "en"),
+        (40, 1, "opensubtitles", "en"),  # outside a month
+    ]
+    for days_ago, action, provider, language in rows:
+        schema_session.execute(insert(TableHistory).values(
+            action=action, description="", provider=provider, language=language,
+            timestamp=now - timedelta(days=days_ago, minutes=1)))
+    schema_session.execute(insert(TableHistoryMovie).values(
+        action=1, description="", provider="opensubtitles", language="en", timestamp=now - timedelta(days=2)))
+
+    def get(query=""):
+        with Flask(__name__).test_request_context(f"/api/history/stats?timeFrame=month{query}"):
+            result = stats_mod.HistoryStats.get.__wrapped__(stats_mod.HistoryStats())
+        return {media: {item["date"]: item["count"] for item in items if item["count"]}
+                for media, items in result.items()}, result
+
+    return get, now
+
+
+def test_stats_count_per_day(stats):
+    get, now = stats
+    counts, result = get()
+
+    def day(days_ago):
+        return (now - timedelta(days=days_ago, minutes=1)).date().isoformat()
+
+    assert counts["series"] == {day(0): 1, day(1): 3, day(3): 1, day(10): 1}
+    assert counts["movies"] == {(now - timedelta(days=2)).date().isoformat(): 1}
+    # every day of the time frame is listed, in order
+    dates = [item["date"] for item in result["series"]]
+    assert dates == sorted(dates) and len(dates) == 31 and dates[-1] == now.date().isoformat()
+
+    assert get("&provider=podnapisi")[0]["series"] == {day(1): 1, day(3): 1}
+    assert get("&action=1&language=en")[0]["series"] == {day(0): 1, day(1): 1, day(10): 1}
+
+
+def test_rollup_matches_live_counts(stats, schema_session, monkeypatch):
+    from app.config import settings
+    from app.database import TableHistory, TableHistoryDaily
+
+    get, now = stats
+    live = [get(query)[0] for query in ("", "&provider=podnapisi", "&action=1&language=en")]
+
+    monkeypatch.setattr(settings.general, "history_stats_rollup", True)
+    assert [get(query)[0] for query in ("", "&provider=podnapisi", "&action=1&language=en")] == live
+
+    # closed days only, each rolled up once, NULLs stored as ''
+    rolled = schema_session.execute(select(TableHistoryDaily.day, func.sum(TableHistoryDaily.count))
+                                    .where(TableHistoryDaily.media == "series")
+                                    .group_by(TableHistoryDaily.day)).all()
+    assert now.date().isoformat() not in dict(rolled)
+    assert sum(count for _, count in rolled) == 7
+    assert schema_session.execute(select(TableHistoryDaily.provider, TableHistoryDaily.language)
+                                  .where(TableHistoryDaily.provider == "")).all() == [("", "")]
+
+    # today's new history is counted live
+    schema_session.execute(insert(TableHistory).values(
+        action=1, description="", provider="opensubtitles", language="en", timestamp=datetime.now()))
+    assert get()[0]["series"][now.date().isoformat()] == 2
@@ -0,0 +1,86 @@
+# coding=utf-8
+"""Opt-in keyset (cursor) paging on the list endpoints walks every row exactly
+once, in the same order as the offset paging next to it."""
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+
+@pytest.fixture
+def api(schema_session, monkeypatch):
+    from api import utils
+    from api.movies import history, movies
+    from app.database import TableHistoryMovie, TableMovies
+
+    for module in (history, movies):
+        monkeypatch.setattr(module, "database", schema_session)
+    monkeypatch.setattr(history, "get_upgradable_movies_subtitles", lambda history_id_list: {})
+    monkeypatch.setattr(history, "_language_still_desired", lambda language, profile_id: True)
+    monkeypatch.setattr(history, "pretty_date", lambda value: "pretty")
+    monkeypatch.setattr(utils, "language_from_alpha2", lambda value: "English")
+    monkeypatch.setattr(utils, "alpha3_from_alpha2", lambda value: "eng")
+
+    # sort titles with a tie (B, B) and history timestamps with a tie (minute 2)
+    for movie_id, sort_title in enumerate(["c", "a", "b", "b", "d"], start=1):
+        schema_session.add(TableMovies(id=movie_id, radarrId=movie_id, path=f"/m/{movie_id}", title=f"M{movie_id}",
+                                       sortTitle=sort_title, tmdbId=str(movie_id), subtitles="[]", tags="[]"))
+    schema_session.flush()
+    for history_id, minute in enumerate([1, 2, 2, 3, 4, 2, 5], start=1):
+        schema_session.add(TableHistoryMovie(id=history_id, movie_id=1, radarrId=1, action=1, language="en",
+                                             description=str(history_id), video_path="/m/1",
+                                             timestamp=datetime(2026, 1, 1, 12, minute)))
+    schema_session.flush()
+
+    def get(resource, query):
+        with Flask(__name__).test_request_context(f"/api/{query}"):
+            return resource.get.__wrapped__(resource())
+
+    return get, history.MoviesHistory, movies.Movies
+
+
+def _walk(get, resource, path, field, length):
+    seen, cursor, pages = [], "", 0
+    while cursor is not None:
+        page = get(resource, f"{path}?length={length}&cursor={cursor}")
+        seen += [item[field] for item in page["data"]]
+        cursor = page["next"]
+        pages += 1
+    return seen, pages
+
+
+def test_history_cursor_walks_newest_first(api):
+    get, history_resource, _ = api
+
+    seen, pages = _walk(get, history_resource, "movies/history", "description", 2)
+    assert seen == ["7", "5", "4", "6", "3", "2", "1"]  # ties broken by id, newest first
+    assert pages == 4
+    assert [item["description"] for item in get(history_resource, "movies/history?length=3")["data"]] == seen[:3]
+
+
+def test_movies_cursor_matches_offset_order(api):
+    get, _, movies_resource = api
+
+    seen, _ = _walk(get, movies_resource, "movies", "radarrId", 2)
+    offset = [item["radarrId"] for start in (0, 2, 4)
+              for item in get(movies_resource, f"movies?start={start}&length=2")["data"]]
+    assert seen == offset == [2, 3, 4, 1, 5]
+    assert get(movies_resource, "movies?start=0&length=2")["next"] is None  # offset paging unchanged
+    assert get(movies_resource, "movies?length=2&cursor=bogus") == ("Invalid paging cursor", 400)
+
+
+def test_movies_cursor_pages_past_null_sort_titles(api, schema_session):
+    from app.database import TableMovies
+
+    get, _, movies_resource = api
+    for movie_id in (6, 7):
+        schema_session.add(TableMovies(id=movie_id, radarrId=movie_id, path=f"/m/{movie_id}", title=f"M{movie_id}",
+                                       sortTitle=None, tmdbId=str(movie_id), subtitles="[]", tags="[]"))
+    schema_session.flush()
+
+    # the first page ends on a NULL sort title
+    seen, pages = _walk(get, movies_resource, "movies", "radarrId", 2)
+    offset = [item["radarrId"] for start in (0, 2, 4, 6)
+              for item in get(movies_resource, f"movies?start={start}&length=2")["data"]]
+    assert seen == offset == [6, 7, 2, 3, 4, 1, 5]
+    assert pages == 4
@@ -0,0 +1,69 @@
+# coding=utf-8
+
+import pytest
+
+
+def _profile(profile_id, cutoff=None):
+    return {
+        "profileId": profile_id, "name": f"profile {profile_id}", "cutoff": cutoff,
+        "items": [{"id": 1, "language": "en"}, {"id": 2, "language": "fr"}],
+        "mustContain": [], "mustNotContain": [], "originalFormat": None,
+        "tag": None, "combine": None,
+    }
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    from app import database
+
+    calls = []
+    rows = [_profile(1), _profile(2, cutoff=2)]
+
+    def fake_load():
+        calls.append(1)
+        return [dict(row) for row in rows]
+
+    monkeypatch.setattr(database, "_load_profiles", fake_load)
+    database.invalidate_profiles()
+    yield calls, rows
+    database.invalidate_profiles()
+
+
+def test_lookups_share_one_load(loads):
+    from app.database import (get_desired_languages, get_profile_cutoff, get_profile_id_name,
+                              get_profiles_list, update_profile_id_list)
+    calls, _ = loads
+
+    assert get_profile_id_name(1) == "profile 1"
+    assert get_desired_languages(2) == ["en", "fr"]
+    assert get_profiles_list(2)["cutoff"] == 2
+    assert get_profile_cutoff("2") == [{"id": 2, "language": "fr"}]
+    assert get_profile_cutoff(1) is None
+    assert [p["profileId"] for p in get_profiles_list()] == [1, 2]
+    assert update_profile_id_list() is get_profiles_list()
+    assert len(calls) == 1
+
+
+def test_unknown_profiles(loads):
+    from app.database import get_desired_languages, get_profile_cutoff, get_profile_id_name, get_profiles_list
+
+    assert get_profiles_list(9) is None
+    assert get_profiles_list("1") is None
+    assert get_desired_languages(9) is None
+    assert get_profile_id_name(None) is None
+    assert get_profile_cutoff(9) is None
+    assert get_profile_cutoff("null") is None
+
+
+def test_invalidate_reloads_profiles(loads):
+    from app.database import get_desired_languages, get_profile_id_name, invalidate_profiles
+    calls, rows = loads
+
+    get_desired_languages(1).append("de")
+    assert get_desired_languages(1) == ["en", "fr"]
+
+    rows.append(_profile(3))
+    assert get_profile_id_name(3) is None
+    invalidate_profiles()
+    assert get_profile_id_name(3) == "profile 3"
+    assert len(calls) == 2
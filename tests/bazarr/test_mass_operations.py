@@ -191,6 +191,30 @@ class TestMassBatchOperationValidation:
         mass_batch_operation(items=items, action='remove_HI', job_id='test')
         mock_collect.assert_called_once()
 
+    @patch('subtitles.mass_operations.settings')
+    @patch('subtitles.mass_operations._process_subtitle_item')
+    @patch('subtitles.mass_operations._collect_subtitle_items')
+    @patch('subtitles.mass_operations.jobs_queue')
+    def test_mod_action_processes_items_concurrently(self, mock_jobs_queue, mock_collect, mock_process,
+                                                     mock_settings):
+        from subtitles.mass_operations import mass_batch_operation
+        mock_settings.general.concurrent_jobs = 4
+        collected = [{'srt_path': f'/subs/{n}.en.srt', 'video_path': f'/video/{n}.mkv'} for n in range(3)]
+        mock_collect.return_value = (collected, 1)
+
+        def process(item, action, options, job_id):
+            if item['srt_path'] == '/subs/1.en.srt':
+                raise OSError('read-only')
+            return item['srt_path'] != '/subs/2.en.srt'
+        mock_process.side_effect = process
+
+        result = mass_batch_operation(items=[{'type': 'movie', 'radarrId': 10}], action='remove_HI', job_id='test')
+
+        assert result == {'queued': 1, 'skipped': 3, 'errors': ['read-only']}
+        assert mock_process.call_count == 3
+        progress_values = [c.kwargs.get('progress_value') for c in mock_jobs_queue.update_job_progress.call_args_list]
+        assert progress_values[-3:] == [1, 2, 3]
+
     @patch('subtitles.mass_operations._process_media_action')
     @patch('subtitles.mass_operations.jobs_queue')
     def test_scan_disk_calls_process_media_action(self, mock_jobs_queue, mock_process):
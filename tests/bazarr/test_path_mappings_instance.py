@@ -93,3 +93,65 @@ def test_path_replace_instance_none_owner_uses_global(schema_session, monkeypatc
 
     out = pm.path_replace_instance("/g/remote/x.mkv", None, "series")
     assert out == "/g/local/x.mkv", "None owner => global mapping (legacy)"
+
+
+def test_instance_mapping_is_cached_until_cleared(schema_session, monkeypatch):
+    import utilities.path_mappings as pm_mod
+    from app.database import TableArrInstances
+    from arr_instances.repository import ArrInstanceRepository
+
+    monkeypatch.setattr("app.database.database", schema_session)
+    _seed_instance(schema_session, 7, json.dumps([["/remote", "/local"]]))
+
+    lookups = []
+    real_get = ArrInstanceRepository.get
+
+    def counting_get(self, instance_id):
+        lookups.append(instance_id)
+        return real_get(self, instance_id)
+
+    monkeypatch.setattr(ArrInstanceRepository, "get", counting_get)
+
+    pm = pm_mod.PathMappings()
+    assert pm.path_replace_instance("/remote/a.mkv", 7, "series") == "/local/a.mkv"
+    assert pm.path_replace_reverse_instance("/local/b.mkv", 7, "movie") == "/remote/b.mkv"
+    assert lookups == [7]
+
+    schema_session.get(TableArrInstances, 7).path_mappings = json.dumps([["/remote", "/elsewhere"]])
+    schema_session.flush()
+    assert pm.path_replace_instance("/remote/a.mkv", 7, "series") == "/local/a.mkv"
+
+    pm.clear_instance_cache(7)
+    assert pm.path_replace_instance("/remote/a.mkv", 7, "series") == "/elsewhere/a.mkv"
+    assert lookups == [7, 7]
+
+
+def test_instance_mapping_shapes(schema_session, monkeypatch):
+    import utilities.path_mappings as pm_mod
+
+    monkeypatch.setattr("app.database.database", schema_session)
+    monkeypatch.setattr(pm_mod, "settings", SimpleNamespace(
+        general=SimpleNamespace(path_mappings=[["/g/remote", "/g/local"]], path_mappings_movie=[])))
+    _seed_instance(schema_session, 7, json.dumps({"movies": [["/same", "/same"], ["", "/x"], ["/r", "/l"]]}))
+    _seed_instance(schema_session, 8, "{not json")
+    _seed_instance(schema_session, 9, json.dumps([]))
+
+    pm = pm_mod.PathMappings()
+    pm.update()
+
+    # a missing side falls back to the global mapping; unusable pairs are dropped
+    assert pm.path_replace_instance("/g/remote/a.mkv", 7, "episode") == "/g/local/a.mkv"
+    assert pm.path_replace_instance("/r/same/a.mkv", 7, "movies") == "/l/same/a.mkv"
+    # malformed JSON is treated as unset
+    assert pm.path_replace_instance("/g/remote/a.mkv", 8, "series") == "/g/local/a.mkv"
+    # an explicit empty list maps nothing, it doesn't defer to the global mapping
+    assert pm.path_replace_instance("/g/remote/a.mkv", 9, "series") == "/g/remote/a.mkv"
+
+
+def test_refresh_runtime_clears_instance_mappings(monkeypatch):
+    from arr_instances import service
+    from utilities.path_mappings import path_mappings
+
+    monkeypatch.setitem(path_mappings._instance_mappings, 7, {"series": (("/a", "/b"),), "movies": None})
+    service.refresh_runtime("unknown-kind", instance_id=7)
+    assert 7 not in path_mappings._instance_mappings
@@ -76,3 +76,61 @@ def test_radarr_signalr_start_handles_missing_transport_before_first_start(monke
     client.start()
 
     assert connection.starts == 1
+
+
+def _episode_event(episode_id, series_id, instance=None, action="updated"):
+    return {"name": "episode", "_arr_instance_id": instance,
+            "body": {"action": action, "resource": {"id": episode_id, "seriesId": series_id}}}
+
+
+def _series_event(series_id, instance=None, episodes_changed=False):
+    return {"name": "series", "_arr_instance_id": instance,
+            "body": {"action": "updated",
+                     "resource": {"id": series_id, "episodesChanged": episodes_changed}}}
+
+
+def test_coalesce_events_keeps_latest_per_instance_topic_and_id():
+    events = [
+        _episode_event(1, 10),
+        _episode_event(2, 10),
+        _episode_event(1, 10, instance=2),
+        _series_event(10, episodes_changed=True),
+        _episode_event(1, 10),
+        _series_event(10),
+        {"name": "episode"},
+        {"name": "episode"},
+    ]
+
+    kept = signalr_client.coalesce_events(events)
+
+    assert kept == [events[1], events[2], events[3], events[4], events[5], events[6], events[7]]
+
+
+def test_dispatch_batch_orders_per_series_and_refreshes_badges_once(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    dispatched = []
+    badges = []
+    monkeypatch.setattr(signalr_client, "_dispatch_event", dispatched.append)
+    monkeypatch.setattr(signalr_client, "event_stream", lambda **kwargs: badges.append(kwargs))
+
+    events = [_episode_event(n, series_id=n % 3) for n in range(30)]
+    events.append(_series_event(1))
+    events.append(_episode_event(1, 1))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        signalr_client.dispatch_batch(events, executor)
+
+    assert badges == [{"type": "badges"}]
+    assert len(dispatched) == 31
+    series_one = [e for e in dispatched if signalr_client._ordering_key(e) == (None, "series", 1)]
+    assert series_one == [e for e in events[2:] if signalr_client._ordering_key(e) == (None, "series", 1)]
+    assert series_one[-2:] == [events[-2], events[-1]]
+
+
+def test_dispatcher_still_refreshes_badges_per_event(monkeypatch):
+    badges = []
+    monkeypatch.setattr(signalr_client, "event_stream", lambda **kwargs: badges.append(kwargs))
+
+    signalr_client.dispatcher({"name": "series", "body": {}})
+
+    assert badges == [{"type": "badges"}]
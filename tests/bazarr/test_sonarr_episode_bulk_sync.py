@@ -0,0 +1,101 @@
+# coding=utf-8
+"""sync_episodes writes a series in one transaction, with batched updates and
+deferred subtitle indexing.
+
+Drives the real write path against an in-memory DB with the parser and I/O
+leaves stubbed, counting the statements that reach the driver.
+"""
+import semver
+
+from sqlalchemy import event, insert, select
+
+from app.database import TableEpisodes, TableShows
+
+
+class _SonarrInfoStub:
+    # >= 4.0.9.2421 so sync_episodes skips the legacy episodeFile backfill fetch
+    def semver(self):
+        return semver.Version(4, 0, 10, 0)
+
+
+def _parsed(episode_id, path, title="E"):
+    return {"sonarrSeriesId": 5, "sonarrEpisodeId": episode_id, "path": path, "season": 1,
+            "episode": episode_id, "title": title, "monitored": "True", "episode_file_id": episode_id}
+
+
+def _sonarr_episode(episode_id):
+    return {"id": episode_id, "hasFile": True, "monitored": True, "episodeFileId": episode_id,
+            "episodeFile": {"size": 999999, "path": f"/tv/s/{episode_id}"}}
+
+
+def _setup(schema_session, monkeypatch, tmp_path, parsed):
+    import sonarr.sync.episodes as ep_mod
+
+    schema_session.execute(insert(TableShows).values(
+        sonarrSeriesId=5, id=5, path="/tv/s", title="S", audio_language="[]"))
+    for episode_id in (1, 2, 3, 4):
+        schema_session.execute(insert(TableEpisodes).values(
+            sonarrSeriesId=5, sonarrEpisodeId=episode_id, path=f"/tv/s/{episode_id}", season=1,
+            episode=episode_id, title="E", monitored="True", episode_file_id=episode_id))
+
+    indexed, recomputed = [], []
+    (tmp_path / "new").write_text("")
+    monkeypatch.setattr(ep_mod, "database", schema_session)
+    monkeypatch.setattr(ep_mod, "event_stream", lambda *a, **k: None)
+    monkeypatch.setattr(ep_mod, "get_sonarr_info", _SonarrInfoStub())
+    monkeypatch.setattr(ep_mod, "episodeParser", lambda e, **_kw: parsed[e["id"]])
+    monkeypatch.setattr(ep_mod.path_mappings, "path_replace",
+                        lambda path: str(tmp_path / "new") if path.endswith("/new") else path)
+    monkeypatch.setattr(ep_mod, "store_subtitles",
+                        lambda path, reversed_path, **kw: indexed.append((path, kw)))
+    monkeypatch.setattr(ep_mod, "list_missing_subtitles",
+                        lambda **kw: recomputed.append(kw))
+    return ep_mod, indexed, recomputed
+
+
+def test_changed_episodes_are_written_in_one_batch(schema_session, monkeypatch, tmp_path):
+    parsed = {
+        1: _parsed(1, "/tv/s/1", title="Renamed"),
+        2: _parsed(2, "/tv/s/new"),
+        3: _parsed(3, "/tv/s/new", title="Renamed"),
+        5: _parsed(5, "/tv/s/5"),
+    }
+    ep_mod, indexed, recomputed = _setup(schema_session, monkeypatch, tmp_path, parsed)
+
+    statements = []
+    engine = schema_session.get_bind()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            statements.append(executemany)
+
+    ep_mod.sync_episodes(series_id=5, defer_search=True,
+                         episodes_data=[_sonarr_episode(i) for i in (1, 2, 3, 5)])
+    event.remove(engine, "before_cursor_execute", _count)
+
+    rows = dict(schema_session.execute(
+        select(TableEpisodes.sonarrEpisodeId, TableEpisodes.title)).all())
+    assert rows == {1: "Renamed", 2: "E", 3: "Renamed", 5: "E"}  # 4 deleted, 5 added
+    assert schema_session.execute(
+        select(TableEpisodes.path).where(TableEpisodes.sonarrEpisodeId == 2)).scalar() == "/tv/s/new"
+    # three changed rows, one executemany UPDATE
+    assert statements == [True]
+    # the new path is indexed once for both episodes sharing it, and only the
+    # file that exists gets its missing subtitles recomputed
+    assert sorted(path for path, _ in indexed) == ["/tv/s/5", "/tv/s/new"]
+    assert all(kw == {"list_missing": False} for _, kw in indexed)
+    assert [sorted(kw["episodes"]) for kw in recomputed] == [[2, 3]]
+
+
+def test_failing_row_does_not_drop_its_batch(schema_session, monkeypatch, tmp_path):
+    ep_mod, _, _ = _setup(schema_session, monkeypatch, tmp_path, {})
+
+    # episode is NOT NULL, so the second row fails the batch and is retried alone
+    updated = ep_mod._update_episodes([_parsed(1, "/tv/s/1", title="Renamed"),
+                                       dict(_parsed(2, "/tv/s/2", title="Renamed"), episode=None)])
+
+    assert [episode["sonarrEpisodeId"] for episode in updated] == [1]
+    rows = dict(schema_session.execute(
+        select(TableEpisodes.sonarrEpisodeId, TableEpisodes.title)).all())
+    assert rows == {1: "Renamed", 2: "E", 3: "E", 4: "E"}
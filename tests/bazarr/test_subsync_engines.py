@@ -117,6 +117,41 @@ def test_keep_all_mode_runs_all_enabled_engines(tmp_path):
     assert [item.engine for item in result.successful_results] == ['ffsubsync', 'autosubsync', 'alass']
 
 
+def test_keep_all_mode_runs_engines_concurrently_and_keeps_order(tmp_path):
+    import threading
+
+    from subtitles.tools.subsync_engines import (
+        OUTPUT_MODE_KEEP_ALL,
+        InMemorySubsyncFailureStore,
+        SubsyncEngineRunner,
+    )
+
+    subtitle = tmp_path / 'Movie.en.srt'
+    _write(subtitle, 'original')
+    store = InMemorySubsyncFailureStore()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def execute(engine, output_path):
+        # Every engine must be running at once to get past the barrier.
+        barrier.wait()
+        if engine == 'autosubsync':
+            raise RuntimeError('no fit')
+        _write(output_path, f'{engine} result')
+        return {}
+
+    result = SubsyncEngineRunner(store, max_parallel_engines=3).run(
+        srt_path=str(subtitle),
+        output_mode=OUTPUT_MODE_KEEP_ALL,
+        enabled_engines=['alass', 'autosubsync', 'ffsubsync'],
+        execute_engine=execute,
+    )
+
+    assert [item.engine for item in result.results] == ['ffsubsync', 'autosubsync', 'alass']
+    assert [item.status for item in result.results] == ['success', 'failed', 'success']
+    assert store.failure_count(str(subtitle), 'autosubsync') == 1
+    assert not (tmp_path / 'Movie.en.autosubsync.srt').exists()
+
+
 def test_existing_generated_output_is_skipped_until_force_resync(tmp_path):
     from subtitles.tools.subsync_engines import (
         OUTPUT_MODE_KEEP_ALL,
@@ -404,6 +439,89 @@ def test_autosubsync_engine_uses_python_api_without_multiprocessing(monkeypatch,
     assert output.read_text(encoding='utf-8') == 'autosubsync result'
 
 
+def test_reference_cache_decodes_once_and_rebuilds_when_video_changes(monkeypatch, tmp_path):
+    from subtitles.tools.subsync_reference import ReferenceSignalCache
+
+    video = tmp_path / 'Movie.mkv'
+    video.write_bytes(b'video')
+    decodes = []
+
+    def fake_ffmpeg(command, **kwargs):
+        decodes.append(command)
+        with open(command[-1], 'wb') as f:
+            f.write(b'flac')
+
+    monkeypatch.setattr('subtitles.tools.subsync_reference.subprocess.run', fake_ffmpeg)
+    cache = ReferenceSignalCache(str(tmp_path / 'cache'), max_bytes=1024)
+
+    first = cache.audio(str(video), None, 'ffmpeg')
+    assert cache.audio(str(video), None, 'ffmpeg') == first
+    assert len(decodes) == 1
+    assert cache.audio(str(video), 'a:1', 'ffmpeg') != first
+    assert decodes[-1][decodes[-1].index('-map') + 1] == '0:a:1'
+
+    speech_builds = []
+
+    def build_speech(audio_path, npz_path):
+        speech_builds.append(audio_path)
+        with open(npz_path, 'wb') as f:
+            f.write(b'npz')
+
+    cache.speech(str(video), None, 'webrtc', 'ffmpeg', build_speech)
+    cache.speech(str(video), None, 'webrtc', 'ffmpeg', build_speech)
+    assert speech_builds == [first]
+    assert len(decodes) == 2
+
+    stat = video.stat()
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.audio(str(video), None, 'ffmpeg') != first
+    assert len(decodes) == 3
+
+
+def test_reference_cache_evicts_least_recently_used(monkeypatch, tmp_path):
+    from subtitles.tools.subsync_reference import ReferenceSignalCache
+
+    def fake_ffmpeg(command, **kwargs):
+        with open(command[-1], 'wb') as f:
+            f.write(b'x' * 100)
+
+    monkeypatch.setattr('subtitles.tools.subsync_reference.subprocess.run', fake_ffmpeg)
+    cache = ReferenceSignalCache(str(tmp_path / 'cache'), max_bytes=250)
+    paths = []
+    for index in range(3):
+        video = tmp_path / f'Movie{index}.mkv'
+        video.write_bytes(b'video')
+        paths.append(cache.audio(str(video), None, 'ffmpeg'))
+        os.utime(paths[-1], (index, index))
+
+    assert not os.path.exists(paths[0])
+    assert os.path.exists(paths[1]) and os.path.exists(paths[2])
+
+
+def test_external_engines_use_cached_reference_audio_for_video_references(monkeypatch, tmp_path):
+    from subtitles.tools import subsyncer as subsyncer_module
+
+    video = tmp_path / 'Movie.mkv'
+    video.write_bytes(b'video')
+    subtitle = tmp_path / 'Movie.en.srt'
+    _write(subtitle, 'original')
+    reference_subtitle = tmp_path / 'Movie.de.srt'
+    _write(reference_subtitle, 'reference')
+
+    class FakeCache:
+        def audio(self, video_path, stream, ffmpeg):
+            return f'{video_path}.flac'
+
+    monkeypatch.setattr(subsyncer_module, '_get_reference_cache', lambda: FakeCache())
+    syncer = subsyncer_module.SubSyncer()
+    syncer.srtin = str(subtitle)
+    syncer.video_path = syncer.reference = str(video)
+    assert syncer._engine_reference(str(video)) == f'{video}.flac'
+
+    syncer.reference = str(reference_subtitle)
+    assert syncer._engine_reference(str(video)) == str(reference_subtitle)
+
+
 def test_successful_sync_without_history_does_not_log_error(monkeypatch, tmp_path, caplog):
     from subtitles.tools import subsyncer as subsyncer_module
     from subtitles.tools.subsync_engines import RESULT_SUCCESS, SyncEngineResult, SyncRunResult
@@ -412,6 +530,9 @@ def test_successful_sync_without_history_does_not_log_error(monkeypatch, tmp_pat
     _write(subtitle, 'original')
 
     class FakeRunner:
+        def __init__(self, max_parallel_engines=1):
+            self.max_parallel_engines = max_parallel_engines
+
         def run(self, srt_path, output_mode, enabled_engines, execute_engine, force_sync=False):
             result = SyncRunResult(source_path=srt_path, output_mode=output_mode)
             result.results = [
@@ -695,6 +816,46 @@ def test_subsyncer_reports_engine_progress(monkeypatch, tmp_path):
     ]
 
 
+@pytest.mark.parametrize('output_mode, expected', [('keep_all', 2), ('overwrite', 8)])
+def test_parallel_engines_share_the_autosubsync_budget(monkeypatch, tmp_path, output_mode, expected):
+    from app.config import settings
+    from subtitles.tools.subsyncer import SubSyncer
+
+    subtitle = tmp_path / 'Movie.hu.srt'
+    _write(subtitle, 'original')
+    seen = []
+
+    def fake_engine(self, output_path, **kwargs):
+        seen.append(self.autosubsync_parallelism)
+        _write(output_path, 'synced')
+        return {}
+
+    monkeypatch.setattr(settings.subsync, 'parallel_engines', 3)
+    monkeypatch.setattr(settings.subsync, 'autosubsync_parallelism', 8)
+    monkeypatch.setattr(SubSyncer, '_run_ffsubsync_engine', fake_engine)
+    monkeypatch.setattr(SubSyncer, '_run_external_engine',
+                        lambda self, engine, output_path, video_path: fake_engine(self, output_path))
+
+    result = SubSyncer().sync(
+        video_path=str(tmp_path / 'Movie.mkv'),
+        srt_path=str(subtitle),
+        srt_lang='hu',
+        hi=False,
+        forced=False,
+        max_offset_seconds='60',
+        no_fix_framerate=True,
+        gss=True,
+        force_sync=True,
+        output_mode=output_mode,
+        enabled_engines=['ffsubsync', 'autosubsync', 'alass'],
+        write_history=False,
+    )
+
+    # three engines side by side get 8 // 3 workers each; alone, the whole budget
+    assert result.success
+    assert set(seen) == {expected}
+
+
 @pytest.mark.parametrize(
     'filename',
     ['Movie.en.ffsubsync.srt', 'Movie.en.autosubsync.srt', 'Movie.en.alass.srt'],
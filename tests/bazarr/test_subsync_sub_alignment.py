@@ -0,0 +1,130 @@
+# coding=utf-8
+
+import random
+
+import pysubs2
+
+from subtitles.tools.subsync_sub_alignment import (
+    MIN_CONFIDENCE,
+    align_events,
+    sync_to_subtitle_reference,
+)
+
+
+def _track(seed, count=120):
+    """Irregular cue timeline, like real dialogue."""
+    rng = random.Random(seed)
+    subs = pysubs2.SSAFile()
+    t = 5000
+    for i in range(count):
+        t += rng.randint(300, 4000)
+        duration = rng.randint(800, 3500)
+        subs.append(pysubs2.SSAEvent(start=t, end=t + duration, text=f'line {i}'))
+        t += duration
+    return subs
+
+
+def _resegment(subs, shift_ms=0, scale=1.0):
+    """Same dialogue in another language: cues split differently and
+    trimmed a little, then shifted/scaled."""
+    out = pysubs2.SSAFile()
+    for i, event in enumerate(subs.events):
+        start, end = event.start + 60, event.end - 40
+        if i % 3 == 0 and end - start > 1200:
+            middle = (start + end) // 2
+            parts = [(start, middle - 50), (middle + 50, end)]
+        else:
+            parts = [(start, end)]
+        for a, b in parts:
+            out.append(pysubs2.SSAEvent(start=int(a * scale) + shift_ms, end=int(b * scale) + shift_ms, text='x'))
+    return out
+
+
+def test_recovers_offset_between_differently_segmented_tracks():
+    reference = _track(1)
+    subtitle = _resegment(reference, shift_ms=-2350)
+
+    alignment = align_events(reference.events, subtitle.events, max_offset_ms=60000)
+
+    assert abs(alignment.offset_ms - 2350) <= 20
+    assert alignment.scale == 1.0
+    assert alignment.confidence >= MIN_CONFIDENCE
+
+
+def test_recovers_framerate_drift():
+    reference = _track(2)
+    subtitle = _resegment(reference, scale=23.976 / 25)
+
+    alignment = align_events(reference.events, subtitle.events, max_offset_ms=60000)
+
+    assert abs(alignment.scale - 25 / 23.976) < 1e-6
+    assert abs(alignment.offset_ms) <= 20
+
+
+def test_short_tracks_only_score_real_lags():
+    # Both tracks together are shorter than the max offset: lags past them
+    # must not wrap around the circular correlation.
+    rng = random.Random(3)
+    reference = pysubs2.SSAFile()
+    t = 500
+    for i in range(12):
+        duration = rng.randint(400, 900)
+        reference.append(pysubs2.SSAEvent(start=t, end=t + duration, text=f'line {i}'))
+        t += duration + rng.randint(150, 600)
+    subtitle = pysubs2.SSAFile()
+    for event in reference.events:
+        subtitle.append(pysubs2.SSAEvent(start=event.start + 3000, end=event.end + 3000, text='x'))
+    reference.shift(ms=5500)
+
+    alignment = align_events(reference.events, subtitle.events, max_offset_ms=60000, fix_framerate=False)
+
+    assert abs(alignment.offset_ms - 2500) <= 20
+    assert alignment.confidence >= MIN_CONFIDENCE
+
+
+def test_unrelated_tracks_fall_back(tmp_path):
+    reference = _track(3)
+    subtitle_path = tmp_path / 'Movie.en.srt'
+    _track(4).save(str(subtitle_path))
+    output = tmp_path / 'Movie.en.synced.srt'
+
+    assert sync_to_subtitle_reference(reference.to_string('srt'), str(subtitle_path), output, '60') is None
+    assert not output.exists()
+
+
+def test_writes_shifted_output(tmp_path):
+    reference = _track(5)
+    subtitle_path = tmp_path / 'Movie.en.srt'
+    _resegment(reference, shift_ms=4000).save(str(subtitle_path))
+    output = tmp_path / 'Movie.en.synced.srt'
+
+    result = sync_to_subtitle_reference(reference.to_string('srt'), str(subtitle_path), output, '60')
+
+    assert abs(result['offset_seconds'] + 4.0) <= 0.02
+    synced = pysubs2.load(str(output))
+    assert abs(synced.events[0].start - (reference.events[0].start + 60)) <= 20
+
+
+def test_subsyncer_skips_ffsubsync_for_confident_subtitle_reference(monkeypatch, tmp_path):
+    from subtitles.tools.subsyncer import SubSyncer
+
+    reference = _track(6)
+    reference_path = tmp_path / 'Movie.de.srt'
+    reference.save(str(reference_path))
+    subtitle_path = tmp_path / 'Movie.en.srt'
+    _resegment(reference, shift_ms=1500).save(str(subtitle_path))
+    output = tmp_path / 'Movie.en.ffsubsync.srt'
+
+    def no_ffsubsync(*args, **kwargs):
+        raise AssertionError('ffsubsync should not run')
+
+    monkeypatch.setattr(SubSyncer, '_build_ffsubsync_args', no_ffsubsync)
+    syncer = SubSyncer()
+    syncer.video_path = str(tmp_path / 'Movie.mkv')
+    syncer.reference = str(reference_path)
+    syncer.srtin = str(subtitle_path)
+
+    result = syncer._run_ffsubsync_engine(output, '60', True, False)
+
+    assert abs(result['offset_seconds'] + 1.5) <= 0.02
+    assert output.is_file()
@@ -0,0 +1,71 @@
+# coding=utf-8
+
+import pysubs2
+
+from subtitles.tools.translate.core import translation_memory
+from subtitles.tools.translate.core.translation_memory import TranslationMemory, normalize_source
+
+
+def test_normalize_source_collapses_whitespace_but_keeps_line_breaks():
+    assert normalize_source('  Hello   world \r\n  again\t ') == 'Hello world\nagain'
+    assert normalize_source('Hello world') != normalize_source('Hello\nworld')
+    assert normalize_source(' \n ') == ''
+
+
+def test_memory_is_keyed_by_languages_and_engine(tmp_path):
+    memory = TranslationMemory(str(tmp_path / 'tm.db'), 1024 * 1024)
+    memory.put_many([('Good morning', 'Guten Morgen')], 'en', 'ger', 'gemini:flash')
+
+    assert memory.get_many(['x', ' Good  morning '], 'en', 'ger', 'gemini:flash') == {1: 'Guten Morgen'}
+    assert memory.get_many(['Good morning'], 'en', 'fre', 'gemini:flash') == {}
+    assert memory.get_many(['Good morning'], 'en', 'ger', 'google_translate') == {}
+
+    memory.close()
+    reopened = TranslationMemory(str(tmp_path / 'tm.db'), 1024 * 1024)
+    assert reopened.get_many(['Good morning'], 'en', 'ger', 'gemini:flash') == {0: 'Guten Morgen'}
+
+
+def test_memory_evicts_least_recently_used_entries(tmp_path):
+    memory = TranslationMemory(str(tmp_path / 'tm.db'), 100)
+    memory.put_many([('a' * 20, 'b' * 20)], 'en', 'ger', 'e')
+    memory.put_many([('c' * 20, 'd' * 20)], 'en', 'ger', 'e')
+    # Touch the first entry so the second one is the oldest
+    assert memory.get_many(['a' * 20], 'en', 'ger', 'e')
+    memory.put_many([('e' * 20, 'f' * 20)], 'en', 'ger', 'e')
+
+    assert memory.stats()['bytes'] <= 100
+    assert memory.get_many(['a' * 20, 'c' * 20, 'e' * 20], 'en', 'ger', 'e') == {0: 'b' * 20, 2: 'f' * 20}
+
+
+def test_google_translator_only_sends_misses(mocker, tmp_path):
+    from subtitles.tools.translate.services import google_translator
+
+    memory = TranslationMemory(str(tmp_path / 'tm.db'), 1024 * 1024)
+    memory.put_many([('Hello', 'Hallo')], 'en', 'ger', 'google_translate')
+    mocker.patch.object(translation_memory, 'get_translation_memory', return_value=memory)
+    mocker.patch.object(google_translator, 'jobs_queue')
+    mocker.patch.object(google_translator, 'add_translator_info')
+    mocker.patch.object(google_translator, 'create_process_result')
+    mocker.patch.object(google_translator, 'history_log')
+    mocker.patch.object(google_translator, 'language_from_alpha2', return_value='English')
+    mocker.patch.object(google_translator, 'language_from_alpha3', return_value='German')
+
+    source = tmp_path / 'Show.en.srt'
+    subs = pysubs2.SSAFile()
+    for start, text in ((0, 'Hello'), (2000, 'Goodbye'), (4000, 'Hello')):
+        subs.append(pysubs2.SSAEvent(start=start, end=start + 1000, text=text))
+    subs.save(str(source))
+    dest = tmp_path / 'Show.de.srt'
+
+    service = google_translator.GoogleTranslatorService(
+        source_srt_file=str(source), dest_srt_file=str(dest), lang_obj=mocker.Mock(alpha2='de'), to_lang='ger',
+        from_lang='en', media_type='episode', video_path='/tmp/Show.mkv', orig_to_lang='de', forced=False,
+        hi=False, sonarr_series_id=1, sonarr_episode_id=1, radarr_id=None)
+    sent = []
+    mocker.patch.object(service, '_translate_text', side_effect=lambda text, job_id: sent.append(text) or 'Tschüss')
+
+    service.translate(job_id=1)
+
+    assert sent == ['Goodbye']
+    assert [e.text for e in pysubs2.load(str(dest))] == ['Hallo', 'Tschüss', 'Hallo']
+    assert memory.get_many(['Goodbye'], 'en', 'ger', 'google_translate') == {0: 'Tschüss'}
@@ -40,3 +40,60 @@ def test_concurrent_identical_queries_coalesce(monkeypatch):
     assert not errors, f"unexpected errors: {errors}"
     assert call_count["n"] == 1, f"expected 1 fanout, got {call_count['n']}"
     C.invalidate_all()
+
+
+def test_follower_gives_up_after_its_own_wall(monkeypatch):
+    """A follower waits on the in-flight fanout for at most its own wall
+    timeout and then degrades to an empty envelope; the leader still gets
+    (and caches) the full result."""
+    monkeypatch.setattr("compat.auth.settings.compat_endpoint.file_id_secret", "f" * 32)
+    monkeypatch.setattr("compat.service._wall_timeout", lambda timeout_seconds=None: 0.2)
+    C.invalidate_all()
+    started = threading.Event()
+
+    def slow_fanout(*args, **kwargs):
+        started.set()
+        time.sleep(0.6)
+        return {MagicMock(): []}
+
+    with patch("compat.service._get_compat_pool") as gp, \
+         patch("compat.service.list_all_subtitles_parallel", side_effect=slow_fanout) as fan:
+        gp.return_value.providers = ["p"]
+        gp.return_value.discarded_providers = set()
+        leader_result = {}
+
+        def lead():
+            leader_result["r"] = service.search("tt1", 1, 1, [Language("eng")], "episode")
+
+        t = threading.Thread(target=lead)
+        t.start()
+        assert started.wait(5)
+        t0 = time.monotonic()
+        follower = service.search("tt1", 1, 1, [Language("eng")], "episode")
+        waited = time.monotonic() - t0
+        t.join()
+
+    assert follower["data"] == [] and follower["total_count"] == 0
+    assert waited < 0.5
+    assert fan.call_count == 1
+    assert "data" in leader_result["r"]
+    assert C.inflight_count() == 0
+    C.invalidate_all()
+
+
+def test_fresh_hit_skips_single_flight(monkeypatch):
+    """A cached, unexpired envelope is returned without touching the
+    in-flight table."""
+    monkeypatch.setattr("compat.auth.settings.compat_endpoint.file_id_secret", "f" * 32)
+    C.invalidate_all()
+
+    with patch("compat.service._get_compat_pool") as gp, \
+         patch("compat.service.list_all_subtitles_parallel", return_value={MagicMock(): []}) as fan:
+        gp.return_value.providers = ["p"]
+        gp.return_value.discarded_providers = set()
+        first = service.search("tt1", 1, 1, [Language("eng")], "episode")
+        with patch("compat.service.C.coalesce", side_effect=AssertionError("coalesced a cache hit")):
+            assert service.search("tt1", 1, 1, [Language("eng")], "episode") == first
+
+    assert fan.call_count == 1
+    C.invalidate_all()
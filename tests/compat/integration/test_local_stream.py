@@ -27,3 +27,30 @@ def test_stream_local_file_missing_raises_filenotfound(tmp_path):
     stream_token = auth.mint_file_stream_token(file_id)
     with pytest.raises(FileNotFoundError):
         service.serve_subtitle_content(stream_token)
+
+
+def test_stream_route_sets_etag_and_honors_if_none_match(tmp_path):
+    from compat import auth
+    from compat.routes import compat_bp
+    from flask import Flask
+    sub = tmp_path / "movie.en.srt"
+    sub.write_text("1\n00:00:00,000 --> 00:00:01,000\nHi\n")
+    file_id = auth.mint_local_file_id(
+        path=str(sub), lang="en", modifier=None, fmt="srt",
+        media_type="movie", media_id=99, media_dir=str(tmp_path),
+    )
+    token = auth.mint_file_stream_token(file_id)
+    app = Flask(__name__)
+    app.register_blueprint(compat_bp, url_prefix="/api/v1")
+    client = app.test_client()
+
+    r = client.get(f"/api/v1/download/stream/{token}")
+    assert r.status_code == 200
+    assert r.data == sub.read_bytes()
+    assert r.headers["Content-Length"] == str(len(r.data))
+    etag = r.headers["ETag"]
+
+    r = client.get(f"/api/v1/download/stream/{token}",
+                   headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.data == b""
@@ -1,3 +1,7 @@
+import time
+
+import pytest
+
 from compat import cache as C
 from subzero.language import Language
 
@@ -49,3 +53,90 @@ def test_region_get_or_create_coalesces():
     C.compat_region.get_or_create("coalesce_test", creator, expiration_time=60)
     assert call_count["n"] == 1
     C.compat_region.invalidate(hard=True)
+
+
+
+def test_stale_envelope_served_while_refreshing_in_background():
+    """Within the max-stale window an expired envelope is returned at once
+    and exactly one background refresh replaces it."""
+    import threading
+    C.invalidate_all()
+    release = threading.Event()
+    calls = {"n": 0}
+
+    def creator():
+        calls["n"] += 1
+        if calls["n"] > 1:
+            release.wait(5)
+        return {"gen": calls["n"]}
+
+    assert C.get_or_create("swr_test", creator, 0.2, max_stale=600) == {"gen": 1}
+    time.sleep(0.3)
+    # Both callers get the stale envelope; only one refresh is started.
+    assert C.get_or_create("swr_test", creator, 0.2, max_stale=600) == {"gen": 1}
+    assert C.get_or_create("swr_test", creator, 0.2, max_stale=600) == {"gen": 1}
+    release.set()
+    for _ in range(50):
+        if C.compat_region.get("swr_test", ignore_expiration=True) == {"gen": 2}:
+            break
+        time.sleep(0.02)
+    assert C.compat_region.get("swr_test", ignore_expiration=True) == {"gen": 2}
+    assert calls["n"] == 2
+    C.invalidate_all()
+
+
+def test_envelope_past_max_stale_is_rebuilt_inline():
+    C.invalidate_all()
+    calls = {"n": 0}
+
+    def creator():
+        calls["n"] += 1
+        return {"gen": calls["n"]}
+
+    C.get_or_create("swr_bound", creator, 0.2, max_stale=1)
+    time.sleep(1.3)
+    assert C.get_or_create("swr_bound", creator, 0.2, max_stale=1) == {"gen": 2}
+    C.invalidate_all()
+
+
+def test_expired_envelope_rebuilt_inline_without_stale_window():
+    """max_stale=0 (the default, SWR disabled) keeps the old contract: the
+    caller that finds an expired envelope gets a fresh one."""
+    C.invalidate_all()
+    calls = {"n": 0}
+
+    def creator():
+        calls["n"] += 1
+        return {"gen": calls["n"]}
+
+    C.get_or_create("swr_off", creator, 0.2)
+    time.sleep(0.3)
+    assert C.get_or_create("swr_off", creator, 0.2) == {"gen": 2}
+    C.invalidate_all()
+
+
+def test_coalesce_shares_one_call_and_propagates_errors():
+    import concurrent.futures
+    import threading
+    calls = {"n": 0}
+    gate = threading.Event()
+
+    def work():
+        calls["n"] += 1
+        gate.wait(5)
+        return "value"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as ex:
+        futs = [ex.submit(C.coalesce, "flight", work, 5) for _ in range(4)]
+        time.sleep(0.2)
+        gate.set()
+        assert [f.result() for f in futs] == ["value"] * 4
+    assert calls["n"] == 1
+    assert C.inflight_count() == 0
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        C.coalesce("flight", boom, 5)
+    assert C.inflight_count() == 0
@@ -32,6 +32,7 @@ def capture_exclude(monkeypatch):
                              lambda *a, **k: types.SimpleNamespace(name="/no/such/file.mkv"))
         health = MagicMock()
         health.currently_discarded.return_value = set()
+        health.plan_fanout.return_value = ({}, set())
         monkeypatch.setattr("subliminal_patch.provider_health.get_tracker",
                             lambda: health)
         from app.config import settings
@@ -232,3 +232,37 @@ def test_empty_videos_returns_empty_result():
     )
     assert dict(results) == {}
     pool.list_subtitles_provider.assert_not_called()
+
+
+def test_provider_deadlines_return_before_wall_once_only_stragglers_left():
+    """Once every running provider is past its own deadline the fanout
+    returns without waiting out the wall, and stragglers are reported as
+    cut off rather than abandoned."""
+    from subliminal_patch.core_persistent import list_all_subtitles_parallel
+
+    pool = MagicMock()
+    pool.providers = ["fast", "straggler"]
+    pool.discarded_providers = set()
+    fast_sub = MagicMock(provider_name="fast", language=MagicMock())
+
+    def list_fn(provider, video, languages):
+        if provider == "straggler":
+            time.sleep(3)
+            return []
+        return [fast_sub]
+
+    pool.list_subtitles_provider.side_effect = list_fn
+    outcomes = {}
+
+    video = MagicMock()
+    t0 = time.time()
+    results = list_all_subtitles_parallel(
+        [video], set(), pool,
+        per_provider_timeout=1, wall_timeout=5,
+        on_result=lambda n, o, l: outcomes.__setitem__(n, o),  # noqa: E741
+        provider_deadlines={"fast": 0.5, "straggler": 0.5},
+    )
+    elapsed = time.time() - t0
+    assert elapsed < 1.5, f"deadline not honored: elapsed={elapsed:.2f}s"
+    assert results[video] == [fast_sub]
+    assert outcomes == {"fast": "ok", "straggler": "cutoff"}
@@ -139,3 +139,51 @@ def test_serve_local_back_compat_payload_uses_media_dir_fallback(tmp_path):
     }
     blob, ctype = serve_local(payload)
     assert b"Hi" in blob
+
+
+def test_serve_local_streams_clean_utf8_from_disk_and_caches(tmp_path, monkeypatch):
+    from compat import local_subs
+    local_subs._conversion_cache.clear()
+    monkeypatch.setattr(local_subs, "_STREAM_CHUNK", 8)
+    sub = tmp_path / "movie.en.srt"
+    text = "1\n00:00:00,000 --> 00:00:01,000\nHéllo\n".encode("utf-8")
+    sub.write_bytes(text)
+    payload = {
+        "kind": "local", "path": str(sub), "lang": "en", "modifier": None,
+        "fmt": "srt", "media_type": "movie", "media_id": 1,
+        "media_dir": str(tmp_path),
+    }
+    body, _ = local_subs.serve_local(payload, stream=True)
+    chunks = list(body)
+    assert len(chunks) > 1 and all(len(c) <= 8 for c in chunks)
+    assert b"".join(chunks) == text
+    assert body.length == len(text)
+
+    calls = []
+    monkeypatch.setattr(local_subs, "_scan_clean_utf8",
+                        lambda real: calls.append(real))
+    again, _ = local_subs.serve_local(payload, stream=True)
+    assert again.etag == body.etag and again.read() == text
+    assert calls == []  # served from the conversion cache
+
+
+def test_serve_local_reencodes_bom_and_reconverts_after_edit(tmp_path):
+    import os
+    from compat import local_subs
+    local_subs._conversion_cache.clear()
+    sub = tmp_path / "movie.en.srt"
+    sub.write_bytes(b"\xef\xbb\xbf1\n00:00:00,000 --> 00:00:01,000\nHi\n")
+    payload = {
+        "kind": "local", "path": str(sub), "lang": "en", "modifier": None,
+        "fmt": "srt", "media_type": "movie", "media_id": 1,
+        "media_dir": str(tmp_path),
+    }
+    body, _ = local_subs.serve_local(payload, stream=True)
+    assert body.read().startswith(b"1\n")
+
+    sub.write_bytes(b"1\n00:00:00,000 --> 00:00:01,000\nBye\n")
+    st = os.stat(sub)
+    os.utime(sub, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    edited, _ = local_subs.serve_local(payload, stream=True)
+    assert edited.etag != body.etag
+    assert b"Bye" in edited.read()
@@ -52,6 +52,17 @@ def test_abandoned_counts_same_as_exception():
     assert t.is_discarded("slow_provider")
 
 
+def test_soft_deadline_cutoffs_do_not_discard():
+    """A provider left behind at its own deadline, inside the wall, is slow
+    rather than broken: it adapts the latency stats but is never discarded."""
+    from subliminal_patch.provider_health import get_tracker, FAILURES_TO_DISCARD
+    t = get_tracker()
+    for _ in range(FAILURES_TO_DISCARD + 2):
+        t.record("sluggish_ok", "cutoff", 4000)
+    assert not t.is_discarded("sluggish_ok")
+    assert t.latency_percentile("sluggish_ok", 0.95) == 4000
+
+
 def test_timeout_and_abandoned_mix():
     from subliminal_patch.provider_health import get_tracker, FAILURES_TO_DISCARD
     t = get_tracker()
@@ -170,3 +181,53 @@ def test_currently_discarded_snapshot():
 
     active = t.currently_discarded()
     assert active == {"a", "b"}
+
+
+def test_latency_percentiles_need_min_samples():
+    from subliminal_patch.provider_health import get_tracker, LATENCY_MIN_SAMPLES
+    t = get_tracker()
+    for _ in range(LATENCY_MIN_SAMPLES - 1):
+        t.record("p", "ok", 300)
+    assert t.latency_percentile("p", 0.5) is None
+    t.record("p", "ok", 300)
+    # Rounded up to the enclosing bucket bound.
+    assert t.latency_percentile("p", 0.5) == 500
+    # Quick exceptions say nothing about latency and are not sampled.
+    t.record("p", "exception", 1)
+    assert t.snapshot()["p"]["latency_samples"] == LATENCY_MIN_SAMPLES
+
+
+def test_plan_fanout_sizes_deadlines_and_skips_slow_median():
+    from subliminal_patch.provider_health import (
+        get_tracker, DEADLINE_FLOOR_SECONDS,
+    )
+    t = get_tracker()
+    for _ in range(10):
+        t.record("fast", "ok", 80)
+        t.record("medium", "ok", 2800)
+        t.record("sluggish", "abandoned", 12000)
+
+    deadlines, skipped = t.plan_fanout(["fast", "medium", "sluggish", "new"], 8)
+    assert skipped == {"sluggish"}
+    assert deadlines["fast"] == DEADLINE_FLOOR_SECONDS
+    assert deadlines["medium"] == pytest.approx(4.5)  # 3000ms bucket * 1.5
+    assert deadlines["new"] == 8  # no history: whole wall
+
+    # A caller with a longer budget still gets the slow provider.
+    _, skipped = t.plan_fanout(["sluggish"], 20)
+    assert skipped == set()
+
+
+def test_latency_history_decays_so_skipped_provider_is_retried(monkeypatch):
+    from subliminal_patch import provider_health
+    from subliminal_patch.provider_health import get_tracker
+    now = [1_000_000.0]
+    monkeypatch.setattr(provider_health.time, "monotonic", lambda: now[0])
+    t = get_tracker()
+    for _ in range(8):
+        t.record("p", "abandoned", 30000)
+    assert t.plan_fanout(["p"], 8)[1] == {"p"}
+
+    now[0] += provider_health.LATENCY_HALF_LIFE_SECONDS * 2
+    assert t.latency_percentile("p", 0.5) is None
+    assert t.plan_fanout(["p"], 8)[1] == set()
@@ -59,3 +59,59 @@ def test_inspect_on_unknown_key_returns_full_limit():
     remaining, reset = R.inspect("new", 10, 60)
     assert remaining == 10
     assert reset > int(time.time())
+
+
+def test_refill_is_smooth_not_window_aligned(monkeypatch):
+    """A drained bucket gets tokens back proportionally to elapsed time
+    instead of all at once at a window boundary."""
+    R.reset()
+    real_time = time.time
+    t0 = real_time()
+    monkeypatch.setattr(R.time, "time", lambda: t0)
+    for _ in range(4):
+        R.try_consume("u", 4, 60)
+    allowed, _, retry_at = R.try_consume("u", 4, 60)
+    assert allowed is False
+    # One token per 15s: the next token is due ~15s out, not at window end.
+    assert retry_at - int(t0) <= 16
+    monkeypatch.setattr(R.time, "time", lambda: t0 + 31)
+    remaining, _ = R.inspect("u", 4, 60)
+    assert remaining == 2
+
+
+def test_prune_evicts_only_refilled_buckets(monkeypatch):
+    R.reset()
+    real_time = time.time
+    t0 = real_time()
+    monkeypatch.setattr(R.time, "time", lambda: t0)
+    R.try_consume("idle", 2, 60)
+    R.try_consume("busy", 2, 600)
+    assert R.stats()["active_keys"] == 2
+    monkeypatch.setattr(R.time, "time", lambda: t0 + 61)
+    assert R.prune() == 1
+    stats = R.stats()
+    assert stats["active_keys"] == 1
+    assert stats["evicted_total"] == 1
+    # An evicted key starts over with a full bucket.
+    allowed, remaining, _ = R.try_consume("idle", 2, 60)
+    assert allowed is True and remaining == 1
+
+
+def test_stats_counts_rejections():
+    R.reset()
+    R.try_consume("u", 1, 60)
+    R.try_consume("u", 1, 60)
+    R.try_consume("u", 1, 60)
+    assert R.stats()["rejected_total"] == 2
+
+
+def test_concurrent_consumers_never_overshoot_limit():
+    import concurrent.futures
+    R.reset()
+
+    def consume(_):
+        return R.try_consume("shared", 50, 3600)[0]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as ex:
+        allowed = sum(ex.map(consume, range(200)))
+    assert allowed == 50
@@ -16,3 +16,24 @@ def test_guessit_rejects_null_bytes():
 def test_guessit_caps_length():
     with pytest.raises(ValueError):
         service.guessit_filename("x" * 2000)
+
+
+@pytest.mark.parametrize("max_stale, cache_ttl, fid_ttl, stream_ttl, expected", [
+    (3000, 1800, 3600, 300, 1500),  # stale envelopes keep a stream token's worth of file_id life
+    (3000, 1800, 1800, 300, 0),     # no headroom left: never serve stale
+    (1200, 600, 3600, 60, 1200),    # cache_max_stale_seconds still caps it
+])
+def test_max_stale_leaves_file_id_headroom(monkeypatch, max_stale, cache_ttl, fid_ttl, stream_ttl, expected):
+    seen = {}
+    endpoint = service.settings.compat_endpoint
+    monkeypatch.setattr(endpoint, "stale_while_revalidate", True)
+    monkeypatch.setattr(endpoint, "cache_max_stale_seconds", max_stale)
+    monkeypatch.setattr(endpoint, "cache_ttl_seconds", cache_ttl)
+    monkeypatch.setattr(endpoint, "file_id_ttl_seconds", fid_ttl)
+    monkeypatch.setattr(endpoint, "stream_token_ttl_seconds", stream_ttl)
+    monkeypatch.setattr(service, "get_providers_sorted", lambda: [])
+    monkeypatch.setattr(service.C, "get_or_create",
+                        lambda key, creator, expiration_time, max_stale: seen.update(max_stale=max_stale) or {})
+
+    service.search("tt1", 1, 1, [], "episode")
+    assert seen["max_stale"] == expected
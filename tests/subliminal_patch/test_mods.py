@@ -14,3 +14,29 @@ def test_apply_mods_remove_hi(languages, test_file):
         sub.content = f.read()
 
     assert sub.get_modified_content(debug=True)
+
+
+def test_mod_pipeline_is_shared_and_matches_unfused(languages, test_file, monkeypatch):
+    from subzero.modification import pipeline
+
+    with open(test_file, "rb") as f:
+        content = f.read()
+    mods = ["remove_HI", "OCR_fixes", "common"]
+
+    def modded():
+        sub = Subtitle(languages["en"], mods=list(mods))
+        sub.content = content
+        return sub.get_modified_content()
+
+    pipeline.clear_pipelines()
+    fused = modded()
+    assert len(pipeline._pipelines) == 1
+    cached = next(iter(pipeline._pipelines.values()))
+    assert modded() == fused
+    assert next(iter(pipeline._pipelines.values())) is cached
+
+    # single processor runs never get a gate, i.e. the plain per-processor walk
+    monkeypatch.setattr(pipeline, "MAX_FUSED_RUN", 1)
+    pipeline.clear_pipelines()
+    assert modded() == fused
+    pipeline.clear_pipelines()